@@ -0,0 +1,313 @@
+#!/usr/bin/python3
+"""
+Benchmarks for the blackjackgame package, results are written as JSON so two runs can be
+compared
+
+    ./benchmarks/run.py --out before.json
+    ./benchmarks/run.py --out after.json --baseline before.json
+
+module argparse allows the benchmarks to be picked from the terminal
+
+module json allows the results to be saved and read back
+
+module os, sys and tempfile allow the package to be imported and the stores to be made in
+a throwaway directory
+
+module platform and time allow the runs to be labelled and timed
+
+module pickle allows the cost of handing a shoe to a worker the old way to be measured
+
+module random allows the store benchmarks to look up names in a random order
+
+module statistics and subprocess allow a fresh interpreter to be started many times and the
+median of its timings to be taken
+
+module tracemalloc allows the peak memory of every benchmark to be measured
+"""
+
+import argparse
+import json
+import os
+import pickle
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from blackjackgame.deck import Shoe, shuffled_codes  # noqa: E402
+from blackjackgame.engine import Engine  # noqa: E402
+from blackjackgame.player import Player  # noqa: E402
+from blackjackgame.ring import ShoeRing  # noqa: E402
+from blackjackgame.rules import DEFAULT_RULES, compile_rules  # noqa: E402
+from blackjackgame.store import BalanceStore  # noqa: E402
+
+# A variant table on the same shoe, the Engine should play it as fast as the default rules
+VARIANT = {"dealer": "H17", "blackjack_pays": "3:2", "splits": True}
+
+# Run by a fresh interpreter, prints how long the import and the first hand took in ms
+FIRST_HAND = """
+import time
+start = time.perf_counter()
+import blackjackgame
+imported = time.perf_counter()
+blackjackgame.Engine([blackjackgame.Player("Bench", 10000)]).play_round()
+played = time.perf_counter()
+print((imported - start) * 1000, (played - start) * 1000)
+"""
+
+
+def timed(work, seconds):
+    """
+    calls work until the given number of seconds has passed and returns how many
+    operations per second it did, work returns how many operations one call did
+    """
+
+    operations = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < seconds:
+        operations += work()
+        elapsed = time.perf_counter() - start
+    return operations / elapsed
+
+
+def peak_memory(work):
+    """
+    calls work once with tracemalloc running and returns the peak in KiB
+    """
+
+    tracemalloc.start()
+    try:
+        work()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def bench_hands(seconds, rules=DEFAULT_RULES):
+    """
+    full headless rounds with one seat, hands per second
+    """
+
+    engine = Engine([Player("Bench", 10 ** 15)], rules=rules)
+
+    def work():
+        for _ in range(100):
+            engine.play_round()
+        return 100
+
+    return {"hands_per_sec": timed(work, seconds), "peak_kib": peak_memory(work)}
+
+
+def bench_draws(seconds):
+    """
+    Player.draw_card from a Shoe, draws per second
+    """
+
+    shoe = Shoe()
+    player = Player("Bench", 0)
+
+    def work():
+        shoe.cursor = 0
+        for _ in range(40):
+            for _ in range(10):
+                player.draw_card(shoe)
+            player.empty_hand()
+        return 400
+
+    return {"draws_per_sec": timed(work, seconds), "peak_kib": peak_memory(work)}
+
+
+def bench_reshuffles(seconds):
+    """
+    Shoe.shuffle of an 8 deck shoe that has been dealt to its cut card, reshuffles per
+    second
+    """
+
+    shoe = Shoe(rng=random.Random(0))
+
+    def work():
+        for _ in range(10):
+            shoe.cursor = shoe.cut_card_location + 1
+            shoe.shuffle()
+        return 10
+
+    return {"reshuffles_per_sec": timed(work, seconds), "peak_kib": peak_memory(work)}
+
+
+def bench_handoffs(seconds):
+    """
+    an 8 deck shoe handed over through a ShoeRing, written to a lane, read in place and
+    released, against the same shoe's codes pickled and unpickled the way a pool hands them
+    to a worker, shoes per second
+    """
+
+    codes, cut_card_location = shuffled_codes(8, random.Random(0))
+    ring = ShoeRing(1)
+
+    def pickled():
+        for _ in range(10):
+            pickle.loads(pickle.dumps((codes, cut_card_location)))
+        return 10
+
+    def shared():
+        for index in range(10):
+            ring.put(0, index, codes, cut_card_location)
+            ring.get(0)
+            ring.release(0)
+        return 10
+
+    try:
+        return {"ring_shoes_per_sec": timed(shared, seconds),
+                "pickled_shoes_per_sec": timed(pickled, seconds),
+                "peak_kib": peak_memory(shared)}
+    finally:
+        ring.close()
+        ring.unlink()
+
+
+def bench_evaluations(seconds):
+    """
+    Player.check_value on a three card hand, evaluations per second
+    """
+
+    shoe = Shoe()
+    player = Player("Bench", 0)
+    for _ in range(3):
+        player.draw_card(shoe)
+    check_value = player.check_value
+
+    def work():
+        for _ in range(1000):
+            check_value()
+        return 1000
+
+    return {"evaluations_per_sec": timed(work, seconds), "peak_kib": peak_memory(work)}
+
+
+def bench_store(players, lookups):
+    """
+    BalanceStore with the given number of players saved, microseconds per lookup and per
+    save of one player
+    """
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = BalanceStore(os.path.join(directory, "balances.db"))
+        names = [f"player{number}" for number in range(players)]
+        batch = 10000
+        for start in range(0, players, batch):
+            store.put_many(Player(name, 10000) for name in names[start:start + batch])
+        picks = random.Random(0).choices(names, k=lookups)
+
+        def read():
+            for name in picks:
+                store.get(name)
+
+        def write():
+            for name in picks:
+                store.put(name, 9000)
+
+        start = time.perf_counter()
+        read()
+        read_us = (time.perf_counter() - start) / lookups * 1e6
+        start = time.perf_counter()
+        write()
+        write_us = (time.perf_counter() - start) / lookups * 1e6
+        peak = peak_memory(read)
+        store.close()
+    return {"read_us": read_us, "write_us": write_us, "peak_kib": peak}
+
+
+def bench_cold_start(runs):
+    """
+    a fresh interpreter that imports the package and plays a first hand, median of the
+    given number of runs, milliseconds to import and to the end of the first hand inside
+    the interpreter, and of the whole process next to one that does nothing
+    """
+
+    def run(script):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=True,
+                             capture_output=True, text=True).stdout
+        return (time.perf_counter() - start) * 1000, out
+
+    timings = []
+    for _ in range(runs):
+        process_ms, out = run(FIRST_HAND)
+        import_ms, first_hand_ms = (float(part) for part in out.split())
+        timings.append((import_ms, first_hand_ms, process_ms, run("pass")[0]))
+    import_ms, first_hand_ms, process_ms, interpreter_ms = (statistics.median(column)
+                                                            for column in zip(*timings))
+    return {"import_ms": import_ms, "first_hand_ms": first_hand_ms,
+            "process_ms": process_ms, "interpreter_ms": interpreter_ms}
+
+
+def compare(results, baseline):
+    """
+    prints how every number changed from a baseline run, above 1.0 is more of that number
+    """
+
+    for name, numbers in results["benchmarks"].items():
+        before = baseline.get("benchmarks", {}).get(name)
+        if before is None:
+            continue
+        for key, value in numbers.items():
+            if before.get(key):
+                print(f"{name}.{key}: {value / before[key]:.3f}x")
+
+
+def main():
+    """
+    runs the benchmarks and writes the results
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmark the blackjackgame package")
+    parser.add_argument("--seconds", type=float, default=2.0,
+                        help="how long every throughput benchmark runs")
+    parser.add_argument("--players", default="1000,100000,1000000",
+                        help="store sizes to benchmark, comma separated")
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--starts", type=int, default=20,
+                        help="how many fresh interpreters the cold start is timed over")
+    parser.add_argument("--out", default="-", help="JSON file to write, - for stdout")
+    parser.add_argument("--baseline", help="JSON file of an earlier run to compare against")
+    args = parser.parse_args()
+
+    benchmarks = {
+        "hands": bench_hands(args.seconds),
+        "hands_variant": bench_hands(args.seconds, compile_rules(VARIANT)),
+        "draws": bench_draws(args.seconds),
+        "reshuffles": bench_reshuffles(args.seconds),
+        "handoffs": bench_handoffs(args.seconds),
+        "evaluations": bench_evaluations(args.seconds),
+        "cold_start": bench_cold_start(args.starts),
+    }
+    for players in (int(size) for size in args.players.split(",") if size):
+        benchmarks[f"store_{players}"] = bench_store(players, args.lookups)
+
+    results = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "benchmarks": benchmarks,
+    }
+    text = json.dumps(results, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w", encoding="utf-8") as out:
+            out.write(text + "\n")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as before:
+            compare(results, json.load(before))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,52 @@
 #@JerichoMontec
 
 """
+module argparse allows for reading a rule set file, a seed and a script from the command line
+
+module os allows a replayed session to keep no hand history
+
+module random allows the game to be shuffled by a seeded generator, so a recorded session
+can be replayed
+
 module sys allows for exiting
 
-module blackjackgame.__init__ has all the classes and functions for blackjack
+module blackjackgame has all the classes and functions for blackjack, only the ones the
+game needs are loaded
 """
 
+import argparse
+import os
+import random
 import sys
-from blackjackgame.__init__ import *
+from blackjackgame import Game, DEFAULT_RULES, load_rules, BalanceStore, HandLog, Player, \
+    TerminalRenderer, RecordingPrompter, load_script, KEYBOARD
 
 if __name__ == "__main__":
-    game = Game()
+    parser = argparse.ArgumentParser(description="Play terminal Blackjack")
+    parser.add_argument("rules", nargs="?", help="JSON or TOML rule set to play")
+    parser.add_argument("--seed", type=int, help="shuffle with a seeded generator")
+    parser.add_argument("--script", help="answer from a script instead of the keyboard, "
+                        "a replayed script starts from the balances it gives and does not "
+                        "pause")
+    parser.add_argument("--record", help="write every answer and the seed to a script")
+    args = parser.parse_args()
+    rules = load_rules(args.rules) if args.rules else DEFAULT_RULES
+    prompter = KEYBOARD
+    store = None
+    history = None
+    renderer = TerminalRenderer()
+    seed = args.seed
+    if args.script:
+        prompter = load_script(args.script, echo=True)
+        seed = seed if seed is not None else prompter.seed
+        store = BalanceStore(":memory:")  # Players without a balance in the script are new
+        store.put_many([Player(name, balance) for name, balance in prompter.balances.items()])
+        history = HandLog(os.devnull)
+        renderer = TerminalRenderer(0)
+    if args.record:
+        seed = seed if seed is not None else random.randrange(2 ** 32)
+        prompter = RecordingPrompter(prompter, args.record, seed)
+    rng = random.Random(seed) if seed is not None else None
+    game = Game(store, renderer, history, rules, prompter=prompter, rng=rng)
     RETURN_VALUE = game.run()
     sys.exit(RETURN_VALUE)
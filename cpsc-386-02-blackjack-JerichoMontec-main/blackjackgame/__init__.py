@@ -1,14 +1,95 @@
 """
-module deck allows use for Deck class which is used for blackjack
+module deck allows use for Deck class which is used for blackjack and the Shoe class
+which deals the cards at the table
 
 module player allows use for Player class which creates players for blackjack
 
+module hand allows use for Hand class which holds the cards and bet of one hand at a seat
+
 module game allows use for Game class which runs blackjack
 
+module engine allows use for Engine class which plays blackjack without any prompts and
+the Decider class which makes the choices for it
+
+module store allows use for BalanceStore class which saves balances by name
+
+module batch allows use for ShoeBatch class which shuffles many shoes at once for
+simulations
+
+module ring allows use for ShoeRing class which hands shuffled shoes to worker processes in
+shared memory
+
+module history allows use for HandLog and HandReader classes which write and read back the
+hand history of every round
+
+module registry allows use for PlayerRegistry class which keeps the Players seen last in
+memory in front of the BalanceStore
+
+module prompts allows use for Prompter classes which answer the questions of the game from
+the keyboard, a script or a recording, and load_script which reads a recorded session
+
+module ledger allows use for Ledger class which records every bet and saves balances
+behind the table
+
+module metrics allows use for Metrics classes which time the phases of a table, or do
+nothing when it is not being measured
+
+module shuffler allows use for Shuffler class which shuffles the next shoes on a thread
+before a table reaches its cut card
+
+module rules allows use for load_rules and compile_rules which turn a rule set into Rules,
+and DEFAULT_RULES which are the rules of this table
+
+module render allows use for Renderer classes which decide where the messages of a table go
+and how long it pauses after them
+
 module dictionary allows use for dictionary Dict which maps values
+
+module importlib allows the modules to be imported the first time one of their names is
+used, so importing the package only loads what a program asks for
 """
-from .deck import Deck
-from .player import Player
-from .game import Game
-from .dictionary import Dict
-__all__ = ["Deck", "Player", "Game", "Dict"]
+from importlib import import_module
+
+# Which module every exported name lives in, nothing is imported until it is used
+_MODULES = {
+    "Deck": "deck", "Shoe": "deck",
+    "Player": "player",
+    "Hand": "hand",
+    "Game": "game",
+    "Engine": "engine", "Decider": "engine",
+    "ShoeBatch": "batch",
+    "ShoeRing": "ring",
+    "BalanceStore": "store",
+    "PlayerRegistry": "registry",
+    "HandLog": "history", "HandReader": "history",
+    "Ledger": "ledger",
+    "Metrics": "metrics", "Recorder": "metrics",
+    "Shuffler": "shuffler",
+    "Rules": "rules", "DEFAULT_RULES": "rules", "compile_rules": "rules", "load_rules": "rules",
+    "Prompter": "prompts", "ScriptedPrompter": "prompts", "RecordingPrompter": "prompts",
+    "TimedPrompter": "prompts", "load_script": "prompts", "KEYBOARD": "prompts",
+    "Renderer": "render", "TerminalRenderer": "render", "BufferedRenderer": "render",
+    "Dict": "dictionary",
+}
+__all__ = ["Deck", "Shoe", "Player", "Hand", "Game", "Engine", "Decider", "ShoeBatch", "ShoeRing",
+           "Shuffler", "BalanceStore", "PlayerRegistry", "HandLog", "HandReader", "Ledger",
+           "Metrics", "Recorder", "Renderer", "TerminalRenderer", "BufferedRenderer", "Rules",
+           "DEFAULT_RULES", "compile_rules", "load_rules", "Prompter", "ScriptedPrompter",
+           "RecordingPrompter", "TimedPrompter", "load_script", "KEYBOARD", "Dict"]
+
+
+def __getattr__(name):
+    """
+    imports the module of an exported name the first time it is used and keeps the name,
+    so it is only looked up once
+    """
+
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module("." + _MODULES[name], __package__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,194 @@
+"""
+Many shoes shuffled into one buffer, one row per shoe, so a simulation reads its cards
+without building a Shoe's list for every shoe and deals the first cards of every shoe with
+one strided slice per column
+
+Only dealing is done a column at a time. Every row is shuffled on its own by
+shuffled_codes, the same Fisher-Yates shuffle a Shoe and the ShoeRing writers use, with a
+generator of its own. Shoe i of a run is then the same shoe however the run is split into
+batches and whichever path deals it. The standard library has no way to permute every row
+of the buffer in one pass, and shuffling a row by sorting random keys instead is barely
+faster and would change every seeded shoe.
+
+module array allows all the shoes of a batch to be stored in one buffer of one byte codes
+
+module random allows every shoe in a batch to have its own seeded generator
+
+module deck allows for use of shuffled_codes which shuffles and cuts a shoe the same way the
+table does, and the Shoe class which deals from one row of the batch
+"""
+
+from array import array
+from random import Random
+from .deck import Shoe, shuffled_codes, CUT_CARD
+
+
+class ShoeBatch:
+    """
+    A class used to represent many shuffled and cut shoes stored as one two dimensional
+    buffer, row i holds the codes of shoe i in the order they are dealt
+
+    Attributes
+    ----------
+    count : int
+        how many shoes are in the batch
+
+    decks : int
+        how many decks make up every shoe
+
+    cut_card : tuple
+        the lowest and highest cut card location of every shoe
+
+    seed : int
+        the seed of the batch, shoe i is shuffled by Random(stream_seed(seed, i))
+
+    start : int
+        the index in the run of the first shoe of the batch
+
+    stride : int
+        how many codes make up one row, every deck plus the random cut card
+
+    codes : array
+        the codes of every shoe, row after row
+
+    cut_card_locations : array
+        the cut card location of every shoe
+
+    Methods
+    -------
+    stream_seed(seed, index)
+        returns the seed of the generator for one shoe of a batch
+
+    reshuffle_rng(seed, index)
+        returns the generator one shoe reshuffles its discards with
+
+    row(index)
+        returns a view of the codes of one shoe without copying them
+
+    shoe(index)
+        returns a Shoe that deals from one row of the batch
+
+    deal(seats)
+        deals the first two cards of every seat and the Dealer in every shoe
+    """
+
+    def __init__(self, count, decks=8, seed=0, start=0, cut_card=CUT_CARD):
+        """
+        Parameters
+        ----------
+        count : int
+            how many shoes to shuffle
+
+        decks : int
+            how many decks make up every shoe (default is 8)
+
+        seed : int
+            the seed of the batch (default is 0)
+
+        start : int
+            the index of the first shoe in the batch, so a run can be split into batches
+            that shuffle the same shoes as one big batch (default is 0)
+
+        cut_card : tuple
+            the lowest and highest cut card location (default is CUT_CARD)
+        """
+
+        self.count = count
+        self.decks = decks
+        self.cut_card = cut_card
+        self.seed = seed
+        self.start = start
+        self.stride = 52 * decks + 1
+        self.codes = array("B")
+        self.cut_card_locations = array("H")
+        for index in range(start, start + count):
+            codes, cut_card_location = shuffled_codes(decks,
+                                                      Random(self.stream_seed(seed, index)),
+                                                      cut_card)
+            self.codes += codes
+            self.cut_card_locations.append(cut_card_location)
+
+    @staticmethod
+    def stream_seed(seed, index):
+        """
+        returns the seed of the generator for one shoe, every shoe of every batch seed gets
+        a different stream
+
+        Parameters
+        ----------
+        seed : int
+            the seed of the batch
+
+        index : int
+            which shoe of the batch
+        """
+
+        return (seed << 32) | index
+
+    @staticmethod
+    def reshuffle_rng(seed, index):
+        """
+        returns the generator one shoe of a run shuffles its discards with when a round
+        runs it out, a stream of its own so the run plays the same wherever its shoes are
+        dealt from
+
+        Parameters
+        ----------
+        seed : int
+            the seed of the run
+
+        index : int
+            which shoe of the run
+        """
+
+        return Random(f"reshuffle {seed} {index}")
+
+    def row(self, index):
+        """
+        returns a memoryview of the codes of one shoe, nothing is copied
+
+        Parameters
+        ----------
+        index : int
+            which shoe of the batch
+        """
+
+        return memoryview(self.codes)[index * self.stride:(index + 1) * self.stride]
+
+    def shoe(self, index):
+        """
+        returns a Shoe that deals from one row of the batch without copying it
+
+        Parameters
+        ----------
+        index : int
+            which shoe of the batch
+        """
+
+        return Shoe(self.decks, self.reshuffle_rng(self.seed, self.start + index),
+                    self.row(index), self.cut_card_locations[index], self.cut_card)
+
+    def deal(self, seats):
+        """
+        deals the first two cards to every seat and the Dealer in every shoe of the batch,
+        the same way Engine.deal does, one strided slice per column of the buffer
+
+        Parameters
+        ----------
+        seats : int
+            how many Players sit at every table
+
+        Returns
+        -------
+        list
+            one pair of arrays for every seat and one for the Dealer last, the first array
+            holds the first card of that seat in every shoe and the second array the second
+        """
+
+        stride = self.stride
+        hands = []
+        for seat in range(seats + 1):
+            first = self.codes[seat::stride]
+            second = self.codes[seat + seats + 1::stride]
+            hands.append((first, second))
+        return hands
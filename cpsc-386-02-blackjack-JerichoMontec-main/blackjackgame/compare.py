@@ -0,0 +1,342 @@
+"""
+Strategy comparison with common random numbers, every strategy plays exactly the same shoes
+so the luck of the cards cancels out of the difference between them and far fewer shoes are
+needed to tell two strategies apart
+
+Every shoe is shuffled once into a ShoeBatch and every strategy deals from the same row of
+it, so the cards are read in one pass and never copied. The strategies play a round each
+and then every one of them burns the cards the others used and it did not, so every round
+of every strategy starts on the same card and the same first two cards are dealt to all of
+them. Without that, the first hit one strategy takes and another does not would deal them
+different cards for the rest of the shoe. When the shoe of any strategy runs out in the
+middle of a round its discards are shuffled back in and the strategies no longer hold the
+same cards, so the shoe ends for every strategy with that round.
+
+A shoe is the unit that is paired. Its rounds run until the cut card and start on the same
+cards for every strategy, so every strategy plays as many rounds out of it. The difference
+of their expected values per hand is a ratio of sums over the shoes, its confidence
+interval is taken with the delta method.
+
+module argparse allows the comparison to be run from the terminal
+
+module multiprocessing allows the chunks to be played on every core
+
+module os allows for use of cpu_count to pick the number of processes
+
+module array allows the result of every shoe to be kept in one buffer per strategy
+
+module collections allows for use of namedtuples which hold a paired difference
+
+module statistics allows for use of NormalDist which turns a confidence into a z score
+
+module batch allows for use of ShoeBatch which shuffles the shoes once for every strategy
+
+module engine allows for use of DealerMimic which plays like the Dealer
+
+module player allows for use of Player class which sits at every strategy's table
+
+module rules allows the strategies to play a variant rule set
+
+module simulate allows for use of Stats which sums up the hands of every strategy, and the
+TalliedEngine which plays the rounds and counts every Hand
+
+module strategy allows for use of BasicStrategy which can be compared by name
+"""
+
+import argparse
+import multiprocessing
+import os
+from array import array
+from collections import namedtuple
+from statistics import NormalDist
+from .batch import ShoeBatch
+from .engine import DealerMimic
+from .player import Player
+from .rules import DEFAULT_RULES, load_rules
+from .simulate import Stats, TalliedEngine, BANKROLL
+from .strategy import BasicStrategy
+
+# Strategies that can be picked by name from the terminal
+STRATEGIES = {
+    "mimic": DealerMimic,
+    "basic": BasicStrategy,
+    "counting": lambda: BasicStrategy(counting=True),
+}
+
+Difference = namedtuple("Difference", ["name", "baseline", "difference", "low", "high",
+                                       "unpaired_half_width"])
+
+
+class Comparison:
+    """
+    A class used to represent the results of strategies that played the same shoes, the
+    results of every shoe are kept so the strategies can be paired shoe by shoe
+
+    Attributes
+    ----------
+    names : list
+        the name of every strategy, the first one is the baseline
+
+    stats : list
+        the Stats of every strategy
+
+    nets : list
+        one array per strategy, how many units it won in every shoe
+
+    hands : list
+        one array per strategy, how many hands it played in every shoe
+
+    Methods
+    -------
+    merge(other)
+        adds the shoes of another Comparison of the same strategies
+
+    ev(index)
+        returns the expected value of a hand of one strategy
+
+    difference(index, baseline, confidence)
+        returns the paired difference of two strategies' expected values
+
+    as_dict(confidence)
+        returns the results as a dictionary
+    """
+
+    def __init__(self, names):
+        """
+        Parameters
+        ----------
+        names : list
+            the name of every strategy, in the order they play
+        """
+
+        self.names = list(names)
+        self.stats = [Stats() for _ in self.names]
+        self.nets = [array("q") for _ in self.names]
+        self.hands = [array("I") for _ in self.names]
+
+    def merge(self, other):
+        """
+        adds the shoes of another Comparison after the ones of this one and returns it
+        """
+
+        for index, _ in enumerate(self.names):
+            self.stats[index].merge(other.stats[index])
+            self.nets[index] += other.nets[index]
+            self.hands[index] += other.hands[index]
+        return self
+
+    def ev(self, index):
+        """
+        returns the expected value of a hand of one strategy in units
+
+        Parameters
+        ----------
+        index : int
+            which strategy
+        """
+
+        return self.stats[index].mean()
+
+    def _influence(self, index):
+        """
+        returns what every shoe adds to the error of the expected value of one strategy,
+        (net - ev * hands) / average hands, so the error of a ratio can be taken shoe by shoe
+        """
+
+        hands = self.hands[index]
+        average = sum(hands) / len(hands)
+        ev = self.ev(index)
+        return [(net - ev * count) / average for net, count in zip(self.nets[index], hands)]
+
+    def difference(self, index, baseline=0, confidence=0.95):
+        """
+        returns how much better one strategy's expected value is than the baseline's, and
+        its confidence interval when every shoe is paired, the half width the interval would
+        have if the strategies had played different shoes is returned as well
+
+        Parameters
+        ----------
+        index : int
+            which strategy
+
+        baseline : int
+            which strategy it is compared with (default is 0, the first)
+
+        confidence : float
+            how sure the interval is (default is 0.95)
+
+        Returns
+        -------
+        Difference
+            the names, the difference, its interval and the unpaired half width
+        """
+
+        shoes = len(self.nets[index])
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        difference = self.ev(index) - self.ev(baseline)
+        if shoes < 2:
+            return Difference(self.names[index], self.names[baseline], difference,
+                              difference, difference, 0.0)
+        ours = self._influence(index)
+        theirs = self._influence(baseline)
+        paired = _variance([mine - other for mine, other in zip(ours, theirs)])
+        half_width = z * (paired / shoes) ** 0.5
+        unpaired = z * ((_variance(ours) + _variance(theirs)) / shoes) ** 0.5
+        return Difference(self.names[index], self.names[baseline], difference,
+                          difference - half_width, difference + half_width, unpaired)
+
+    def as_dict(self, confidence=0.95):
+        """
+        returns the Stats of every strategy and the difference of every strategy from the
+        baseline as a dictionary
+        """
+
+        return {
+            "shoes": len(self.nets[0]),
+            "strategies": {name: stats.as_dict() for name, stats in zip(self.names, self.stats)},
+            "differences": [self.difference(index, confidence=confidence)._asdict()
+                            for index in range(1, len(self.names))],
+        }
+
+
+def _variance(values):
+    """
+    returns the sample variance of a list of numbers
+    """
+
+    mean = sum(values) / len(values)
+    return sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+
+
+def play_chunk(task):
+    """
+    shuffles the shoes of one chunk once and plays every strategy through each of them
+    round by round, after every round the strategies that used fewer cards burn the rest
+    so they all start the next round on the same card, a shoe ends for every strategy after
+    a round in which any of them ran out of cards, runs inside the worker processes
+
+    Parameters
+    ----------
+    task : tuple
+        (seed, first shoe, number of shoes, seats, names, deciders, rules)
+    """
+
+    seed, start, count, seats, names, deciders, rules = task
+    comparison = Comparison(names)
+    tables = []
+    for strategy, decider in enumerate(deciders):
+        players = [Player(f"Seat {seat + 1}", BANKROLL) for seat in range(seats)]
+        tables.append((TalliedEngine(players, decider, rules, comparison.stats[strategy]),
+                       players))
+    batch = ShoeBatch(count, rules.decks, seed, start, rules.cut_card)
+    for index in range(count):
+        rows = []
+        for engine, _ in tables:
+            engine.deck = batch.shoe(index)
+            rows.append(engine.deck.codes)
+        before = [(engine.stats.net, engine.stats.hands) for engine, _ in tables]
+        shoe = tables[0][0].deck
+        while not shoe.needs_shuffle():
+            for engine, players in tables:
+                engine.play_round()
+                for player in players:
+                    player.balance = BANKROLL
+            if any(engine.deck.codes is not codes for (engine, _), codes in zip(tables, rows)):
+                break  # A shoe ran out and shuffled its discards back in
+            cursor = max(engine.deck.cursor for engine, _ in tables)
+            for engine, _ in tables:
+                deck = engine.deck
+                while deck.cursor < cursor:  # Burn the cards the others used
+                    deck.draw_code()
+        for strategy, (engine, _) in enumerate(tables):
+            net, hands = before[strategy]
+            comparison.nets[strategy].append(engine.stats.net - net)
+            comparison.hands[strategy].append(engine.stats.hands - hands)
+    return comparison
+
+
+def compare(deciders, shoes, names=None, seats=1, seed=0, workers=None, chunk=64,
+            rules=DEFAULT_RULES):
+    """
+    plays every strategy through the same shoes on a pool of processes and returns the
+    merged Comparison, the shoes are in the same order however many processes play them
+
+    Parameters
+    ----------
+    deciders : list
+        the Decider of every strategy, the first one is the baseline, they must be
+        picklable
+
+    shoes : int
+        how many shoes every strategy plays, each one until its cut card
+
+    names : list
+        the name of every strategy (default is the class name of every Decider)
+
+    seats : int
+        how many Players sit at every table (default is 1)
+
+    seed : int
+        the seed of the run (default is 0)
+
+    workers : int
+        how many processes to use, 1 plays in this process (default is every core)
+
+    chunk : int
+        how many shoes a process plays at a time (default is 64)
+
+    rules : Rules
+        the rules of the table (default is DEFAULT_RULES)
+    """
+
+    if names is None:
+        names = [type(decider).__name__ for decider in deciders]
+    workers = workers if workers is not None else os.cpu_count() or 1
+    tasks = [(seed, start, min(chunk, shoes - start), seats, names, deciders, rules)
+             for start in range(0, shoes, chunk)]
+    total = Comparison(names)
+    if workers == 1:
+        for task in tasks:
+            total.merge(play_chunk(task))
+        return total
+    with multiprocessing.Pool(workers) as pool:
+        for comparison in pool.imap(play_chunk, tasks):
+            total.merge(comparison)
+    return total
+
+
+def main():
+    """
+    runs a comparison from the terminal and prints every strategy and its difference from
+    the first one
+    """
+
+    parser = argparse.ArgumentParser(description="Compare strategies on the same shoes")
+    parser.add_argument("--strategies", default="mimic,basic",
+                        help=f"comma separated, the first is the baseline, any of "
+                             f"{', '.join(STRATEGIES)}")
+    parser.add_argument("--shoes", type=int, default=1000)
+    parser.add_argument("--seats", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--rules", help="JSON or TOML rule set to play")
+    args = parser.parse_args()
+    names = [name.strip() for name in args.strategies.split(",") if name.strip()]
+    unknown = [name for name in names if name not in STRATEGIES]
+    if unknown or len(names) < 2:
+        parser.error(f"pick at least two of {', '.join(STRATEGIES)}")
+    rules = load_rules(args.rules) if args.rules else DEFAULT_RULES
+    comparison = compare([STRATEGIES[name]() for name in names], args.shoes, names,
+                         args.seats, args.seed, args.workers, rules=rules)
+    for name, stats in zip(names, comparison.stats):
+        print(f"{name}: {stats.hands} hands, ev {stats.mean():+.5f}")
+    for index in range(1, len(names)):
+        difference = comparison.difference(index, confidence=args.confidence)
+        print(f"{difference.name} - {difference.baseline}: {difference.difference:+.5f} "
+              f"[{difference.low:+.5f}, {difference.high:+.5f}], unpaired would be "
+              f"+/-{difference.unpaired_half_width:.5f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,19 @@
 """
 module collections allows namedtuple to be used for Card class
 
-module random allows to get a random value to put the cut card location, allows to get a
-random integer for variation
+module random allows for use of Random which gives every Deck and Shoe its own seedable
+generator for the shuffle, the cut card location and the random card
 
-module player imports Player class
+module array allows the Shoe to store its cards as one byte codes, and the tables indexed
+by card code
+
+module dictionary allows use for Dict which maps ranks to values and suits to symbols
 """
 
 from collections import namedtuple
-from random import randint, random
+from random import Random
+from array import array
+from .dictionary import Dict
 
 class Deck:
     """
@@ -26,7 +31,8 @@ class Deck:
         represents the 13 types/values in a deck of cards
 
     cards : list
-        a list containing the namedtuples Card
+        a list containing the namedtuples Card, the top card is the last one so a draw
+        never moves the rest of the cards
 
     discards : list
         a list containing cards that have been used during the runtime
@@ -34,52 +40,473 @@ class Deck:
     cut_card_location : int
         an int representing a random number within the closer end of the entire stack of cards to
         show when the deck should be reshuffled
+
+    rng : Random
+        the generator used to shuffle the deck and place the cut card
     
+    by_code : tuple
+        every Card in the order of its code, rank index * 4 + suit index
+
+    template : tuple
+        every Card in the order a new Deck holds them, top card last, a Deck copies it
+        instead of building its own Cards
+
+    codes : dict
+        maps every Card to its code
+
+    rank_counts : list
+        how many cards of every rank are left in the cards list, in the order of ranks
+
+    running_count : int
+        the Hi-Lo count of every card drawn since the last shuffle
+
     Methods
     -------
+    draw()
+        takes the top card off the deck and adds it to the discards
+
+    draw_code()
+        same as draw but returns the code of the card
+
     deck_shuffle()
-        adds cards in discard list into the cards list and shuffles them
+        adds cards in discard list back into the cards list, shuffles and cuts them
         when the cut_card_location is reached
 
+    snapshot()
+        returns the Count of the cards left and of the cards drawn
+
     discard_hands(person)
-        takes a Person class and takes the cards in currentHand, adds them
-        to the discard list and clears their hand
+        takes a Person class and clears their hand, their cards are already in the
+        discard list
     """
     Card = namedtuple("Card", ["rank", "suit"])
     suits = "Clubs Hearts Spades Diamonds".split()  # ['Clubs', 'Hearts', 'Spades', Diamonds']
     ranks = ["Ace"] + [str(x) for x in range(2, 11)] + "J Q K".split()
 
-    def __init__(self):
+    def __init__(self, rng=None):
         """
         Parameters
         ----------
-        Values are always the same so they are made during initialization
+        rng : Random
+            the generator used to shuffle the deck (default is a new unseeded Random), the
+            cards are always the same so they are made during initialization
         """
-        self.cards = []
+        self.cards = list(Deck.template)
         self.discards = []
-        for suit in self.suits:
-            for rank in self.ranks:
-                self.cards.append(self.Card(rank, suit))
-        self.cut_card_location = randint(335, 355)
+        self.rng = rng if rng is not None else Random()
+        self.cut_card_location = self.rng.randint(*CUT_CARD)
+        self.rank_counts = [len(self.suits)] * len(self.ranks)
+        self.running_count = 0
+
+    def draw(self):
+        """
+        takes the top card off the deck, adds it to the discards and returns it
+        """
+
+        card = self.cards.pop()
+        self.discards.append(card)
+        code = Deck.codes[card]
+        self.rank_counts[code >> 2] -= 1
+        self.running_count += CODE_HI_LO[code]
+        return card
+
+    def draw_code(self):
+        """
+        takes the top card off the deck, adds it to the discards and returns its code
+        """
+
+        return Deck.codes[self.draw()]
 
     def deck_shuffle(self):
         """
-        Combines the cards list and discards list and shuffles them
+        Moves the discards back into the cards list, shuffles it, cuts it in half and
+        places a new cut card, the same list is kept so nothing holding it goes stale
+
+        Returns
+        -------
+        list
+            the cards list, shuffled
         """
-        self.cards = self.cards + self.discards
-        random_value = random()
-        self.cards.shuffle(random_value)
-        return self.cards
+        cards = self.cards
+        cards.extend(self.discards)
+        self.discards.clear()
+        self.rng.shuffle(cards)
+        half = len(cards) // 2
+        cards[:] = cards[half:] + cards[:half]
+        self.cut_card_location = self.rng.randint(*CUT_CARD)
+        self.rank_counts = count_ranks(Deck.codes[card] for card in cards)
+        self.running_count = 0
+        return cards
+
+    def snapshot(self):
+        """
+        returns the Count of the cards left in the deck and of the cards drawn
+        """
+
+        return Count(tuple(self.rank_counts), len(self.cards), self.running_count,
+                     true_count(self.running_count, len(self.cards)))
 
     def discard_hands(self, person):
         """
-        Takes a person's cards and adds them to the discards list and
-        clears the person's hand
+        Clears the person's hand, draw already added their cards to the discards list so
+        they are not added again
 
         Parameters
         ----------
         player : Person
             Any Person class
         """
-        self.discards = self.discards + person.current_hand
-        person.current_hand.clear()
+        person.empty_hand()
+
+
+Deck.by_code = tuple(Deck.Card(rank, suit) for rank in Deck.ranks for suit in Deck.suits)
+Deck.codes = {card: code for code, card in enumerate(Deck.by_code)}
+Deck.template = tuple(Deck.by_code[rank * 4 + suit]
+                      for suit in reversed(range(len(Deck.suits)))
+                      for rank in reversed(range(len(Deck.ranks))))
+
+# Tables indexed by card code, so a card is only turned back into text when it is printed
+CODE_VALUES = array("B", (Dict[card.rank] for card in Deck.by_code))
+CODE_RANKS = tuple(card.rank for card in Deck.by_code)
+CODE_GLYPHS = tuple(Dict[card.suit] for card in Deck.by_code)
+CODE_HI_LO = array("b", (1 if 2 <= value <= 6 else -1 if value in (1, 10) else 0
+                         for value in CODE_VALUES))
+
+# The cut card of the 8 deck shoe is placed between the 335th and the 355th card
+CUT_CARD = (335, 355)
+
+# The codes of one deck, a shoe is built by copying the codes of all its decks at once
+DECK_CODES = bytes(range(52))
+_SHOE_CODES = {}
+
+# Translation table from a card code to its rank index, so a shoe can be counted at once
+_RANK_BYTES = bytes(code >> 2 for code in range(52)) + bytes(256 - 52)
+
+# What is left in a deck or shoe, rank counts in the order of Deck.ranks
+Count = namedtuple("Count", ["rank_counts", "cards_left", "running_count", "true_count"])
+
+
+def count_ranks(codes):
+    """
+    returns how many cards of every rank a run of codes holds, in the order of Deck.ranks
+    """
+
+    ranks = bytes(codes).translate(_RANK_BYTES)
+    return [ranks.count(rank) for rank in range(len(Deck.ranks))]
+
+
+def true_count(running_count, cards_left):
+    """
+    returns the running count divided by the number of decks left, never less than half a
+    deck so the last few cards do not blow it up
+
+    Parameters
+    ----------
+    running_count : int
+        the Hi-Lo count of the cards drawn
+
+    cards_left : int
+        how many cards have not been drawn
+    """
+
+    return running_count / (max(cards_left, 26) / 52)
+
+
+def encode(rank, suit):
+    """
+    returns the one byte code of a card, rank index * 4 + suit index
+    """
+
+    return Deck.ranks.index(rank) * 4 + Deck.suits.index(suit)
+
+
+def decode(code):
+    """
+    returns the Card of a code
+    """
+
+    return Deck.by_code[code]
+
+
+def show(code):
+    """
+    returns a card code as text, its rank followed by its suit symbol
+    """
+
+    return CODE_RANKS[code] + CODE_GLYPHS[code]
+
+
+def shoe_codes(decks):
+    """
+    returns the codes of every card in a shoe of the given number of decks in order, made
+    once for every number of decks and kept, the bytes can not be changed so every shoe
+    can copy them
+    """
+
+    codes = _SHOE_CODES.get(decks)
+    if codes is None:
+        codes = _SHOE_CODES[decks] = DECK_CODES * decks
+    return codes
+
+
+def shuffled_codes(decks, rng, cut_card=CUT_CARD):
+    """
+    builds the codes for a shoe of the given number of decks, shuffles them, cuts them in
+    half and places a random card at the cut card location
+
+    Parameters
+    ----------
+    decks : int
+        how many decks make up the shoe
+
+    rng : Random
+        the generator used for the shuffle, the cut card and the random card
+
+    cut_card : tuple
+        the lowest and highest cut card location (default is CUT_CARD)
+
+    Returns
+    -------
+    tuple
+        the array of codes and the cut card location
+    """
+
+    codes = array("B", shoe_codes(decks))
+    return codes, shuffle_codes(codes, rng, cut_card)
+
+
+def shuffle_codes(codes, rng, cut_card=CUT_CARD):
+    """
+    shuffles the codes of a shoe in place, cuts them in half and places a random card at a
+    new cut card location
+
+    Parameters
+    ----------
+    codes : array
+        the code of every card in the shoe, without a random card
+
+    rng : Random
+        the generator used for the shuffle, the cut card and the random card
+
+    cut_card : tuple
+        the lowest and highest cut card location (default is CUT_CARD)
+
+    Returns
+    -------
+    int
+        the cut card location
+    """
+
+    rng.shuffle(codes)
+    half = len(codes) // 2
+    codes[:] = codes[half:] + codes[:half]
+    cut_card_location = rng.randint(*cut_card)
+    codes.insert(cut_card_location, rng.randint(0, 51))
+    return cut_card_location
+
+
+class Shoe:
+    """
+    A class used to represent the shoe the dealer deals from, the cards are stored as
+    one byte codes (rank index * 4 + suit index) and dealt by moving a cursor so a draw
+    never moves the rest of the cards
+
+    Attributes
+    ----------
+    decks : int
+        how many decks make up the shoe
+
+    rng : Random
+        the generator used to shuffle the shoe
+
+    cut_card : tuple
+        the lowest and highest cut card location
+
+    codes : array
+        the code of every card in the shoe, in the order they are dealt
+
+    cursor : int
+        position of the next card to deal, every card before it has been discarded
+
+    cut_card_location : int
+        when the cursor passes it the shoe needs to be shuffled
+
+    rank_counts : list
+        how many cards of every rank are left from the cursor on, kept up to date on every
+        draw, in the order of Deck.ranks
+
+    running_count : int
+        the Hi-Lo count of every card before the cursor, kept up to date on every draw
+
+    round_start : int
+        the cursor when the round being played was dealt, the cards from here to the
+        cursor are on the table and the ones before it are discards
+
+    Methods
+    -------
+    shuffle()
+        puts every card back, shuffles them, cuts the shoe in half and places a random
+        card at the cut card location
+
+    reshuffle_discards()
+        shuffles the discards back in when the shoe runs out in the middle of a round
+
+    load(codes, cut_card_location)
+        puts cards that were shuffled somewhere else in the shoe
+
+    draw()
+        returns the card at the cursor and moves the cursor forward
+
+    draw_code()
+        returns the code of the card at the cursor and moves the cursor forward
+
+    needs_shuffle()
+        returns True when the cut card has been reached
+
+    snapshot()
+        returns the Count of the cards left and of the cards drawn
+
+    discard_hands(person)
+        clears the person's hand, their cards are already behind the cursor
+    """
+
+    def __init__(self, decks=8, rng=None, codes=None, cut_card_location=0, cut_card=CUT_CARD):
+        """
+        Parameters
+        ----------
+        decks : int
+            how many decks make up the shoe (default is 8)
+
+        rng : Random
+            the generator used to shuffle the shoe (default is a new unseeded Random)
+
+        codes : array
+            cards that were already shuffled, the shoe is shuffled here when not given
+
+        cut_card_location : int
+            the cut card location of the given codes
+
+        cut_card : tuple
+            the lowest and highest cut card location (default is CUT_CARD)
+        """
+
+        self.decks = decks
+        self.rng = rng if rng is not None else Random()
+        self.cut_card = cut_card
+        if codes is None:
+            codes, cut_card_location = shuffled_codes(decks, self.rng, cut_card)
+        self.load(codes, cut_card_location)
+
+    def shuffle(self):
+        """
+        puts every card back, shuffles them, cuts the shoe in half and places a random
+        card at the cut card location, the discards are behind the cursor so they are
+        shuffled back in place once the last random card is taken out, a Shoe dealing from
+        a view of a ShoeBatch or a ShoeRing copies its cards out first and leaves the view
+        as it was
+        """
+
+        codes = self.codes
+        if not isinstance(codes, array):
+            codes = array("B", codes)
+        del codes[self.cut_card_location]
+        self.load(codes, shuffle_codes(codes, self.rng, self.cut_card))
+
+    def load(self, codes, cut_card_location):
+        """
+        puts cards that were already shuffled in the shoe, with the cursor at the first one
+
+        Parameters
+        ----------
+        codes : array
+            the code of every card, the way shuffled_codes returns them
+
+        cut_card_location : int
+            the cut card location of the codes
+        """
+
+        self.codes = codes
+        self.cut_card_location = cut_card_location
+        self.cursor = 0
+        self.rank_counts = count_ranks(codes)
+        self.running_count = 0
+        self.round_start = 0
+
+    def draw(self):
+        """
+        returns the Card at the cursor and moves the cursor forward
+        """
+
+        return Deck.by_code[self.draw_code()]
+
+    def draw_code(self):
+        """
+        returns the code of the card at the cursor and moves the cursor forward, the rank
+        counts and the running count are updated for it, the discards are shuffled back in
+        when the last card has been dealt
+        """
+
+        try:
+            code = self.codes[self.cursor]
+        except IndexError:
+            self.reshuffle_discards()
+            code = self.codes[self.cursor]
+        self.cursor += 1
+        self.rank_counts[code >> 2] -= 1
+        self.running_count += CODE_HI_LO[code]
+        return code
+
+    def reshuffle_discards(self):
+        """
+        shuffles the discards behind the cards on the table when the shoe runs out in the
+        middle of a round, so the round can be finished, the cut card has been passed so the
+        whole shoe is shuffled once the round is over
+        """
+
+        codes = array("B", self.codes)
+        start = self.round_start
+        cut_card_location = self.cut_card_location
+        if cut_card_location < start:  # The random card stays out of the discards
+            codes.insert(start - 1, codes.pop(cut_card_location))
+            cut_card_location = start = start - 1
+        if start == 0:
+            raise RuntimeError(f"the shoe ran out in the middle of a round with all "
+                               f"{len(codes)} cards on the table")
+        discards = codes[:start]
+        self.rng.shuffle(discards)
+        table = codes[start:]
+        self.codes = table + discards
+        self.cut_card_location = cut_card_location - start
+        self.cursor = len(table)
+        self.round_start = 0
+        self.rank_counts = count_ranks(discards)
+        self.running_count = sum(CODE_HI_LO[code] for code in table)
+
+    def needs_shuffle(self):
+        """
+        returns True when more cards have been dealt than the cut card location
+        """
+
+        return self.cut_card_location < self.cursor
+
+    def snapshot(self):
+        """
+        returns the Count of the cards left from the cursor on and of the cards drawn
+        """
+
+        cards_left = len(self.codes) - self.cursor
+        return Count(tuple(self.rank_counts), cards_left, self.running_count,
+                     true_count(self.running_count, cards_left))
+
+    def discard_hands(self, person):
+        """
+        clears the person's hand, their cards are already counted as discards since they
+        are behind the cursor
+
+        Parameters
+        ----------
+        person : Player
+            Any Player class
+        """
+
+        person.empty_hand()
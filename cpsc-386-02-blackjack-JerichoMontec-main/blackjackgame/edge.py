@@ -0,0 +1,279 @@
+"""
+The exact house edge of this table, every first two cards of the Player against every up card
+of the Dealer played the best way they can be, worked out for an infinite deck and for a
+full shoe instead of simulated
+
+The table is the one Engine plays on the default rules: the Dealer stands on every 17 and
+never peeks, a blackjack pays 1:1 like every other win so a natural is an ordinary 21, a
+hand of 21 stands, the Player can double down on any two cards and there are no splits. The
+balance is taken to never run out, so rebuy never gives a donation.
+
+Every hand is played the best way for the cards left in the shoe, so the full shoe gives the
+edge against composition dependent play off the top of the shoe. Every up card is one task
+and the tasks run on a pool of processes, every process keeps its own caches of
+subproblems. The Dealer's subproblems are kept from one up card to the next, an up card of 2
+with a 3 in the Player's hand leaves the Dealer the same shoe as an up card of 3 with a 2.
+
+module argparse allows the house edge to be worked out from the terminal
+
+module multiprocessing allows the up cards to be worked out on every core
+
+module os allows for use of cpu_count to pick the number of processes
+
+module time allows the work to be timed
+
+module collections allows for use of namedtuples which hold the results
+
+module functools allows for use of lru_cache which remembers the subproblems of an infinite
+deck
+
+module hand allows for use of the hand states and their tables
+
+module engine allows for use of DEALER_STANDS, the total the Dealer draws to
+
+module probability allows for use of hand_ev which plays a hand exactly for the cards left,
+and the counts of a deck and a shoe
+
+module rules allows the rules of a table to be checked before its edge is worked out
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+from functools import lru_cache
+from .engine import DEALER_STANDS
+from .hand import NEXT, TOTAL, BUST, EMPTY
+from .probability import DECK_COUNTS, full_shoe, remove, hand_ev, clear_cache, \
+    _stand as stand_against
+from .rules import DEFAULT_RULES
+
+# The chance of every value of an infinite deck, Ace first
+INFINITE = tuple(count / sum(DECK_COUNTS) for count in DECK_COUNTS)
+
+# The up cards whose tasks take longest go to the pool first
+TASK_ORDER = (2, 3, 1, 4, 5, 6, 7, 8, 9, 10)
+
+UpCard = namedtuple("UpCard", ["up_value", "chance", "ev", "seconds"])
+Edge = namedtuple("Edge", ["decks", "ev", "house_edge", "up_cards", "seconds"])
+
+
+@lru_cache(maxsize=None)
+def _dealer_infinite(state):
+    """
+    returns the probability of every final Dealer hand, 17 to 21 and bust, for a Dealer
+    hand in the given state drawing from an infinite deck
+    """
+
+    result = [0.0] * 6
+    if TOTAL[state] >= DEALER_STANDS:
+        result[TOTAL[state] - 17] = 1.0
+        return tuple(result)
+    for index, chance in enumerate(INFINITE):
+        after = _dealer_infinite(NEXT[state * 11 + index + 1])
+        for outcome in range(6):
+            result[outcome] += chance * after[outcome]
+    return tuple(result)
+
+
+def _stand_infinite(state, up_state):
+    """
+    returns the expected value of standing with a hand in the given state
+    """
+
+    if state == BUST:
+        return -1.0
+    return stand_against(TOTAL[state], _dealer_infinite(up_state))
+
+
+@lru_cache(maxsize=None)
+def _hit_infinite(state, up_state):
+    """
+    returns the expected value of taking one card and then playing the best of hitting
+    and standing
+    """
+
+    value = 0.0
+    for index, chance in enumerate(INFINITE):
+        after = NEXT[state * 11 + index + 1]
+        if after == BUST:
+            value -= chance
+        elif TOTAL[after] == 21:
+            value += chance * _stand_infinite(after, up_state)
+        else:
+            value += chance * max(_stand_infinite(after, up_state),
+                                  _hit_infinite(after, up_state))
+    return value
+
+
+def infinite_hand_ev(values, up_value):
+    """
+    returns the expected value in bets of standing, hitting and doubling down with a hand
+    against the Dealer's up card when every card is drawn from an infinite deck
+
+    Parameters
+    ----------
+    values : list
+        the values of the Player's cards, 1 for an Ace
+
+    up_value : int
+        the value of the Dealer's up card, 1 for an Ace
+
+    Returns
+    -------
+    dict
+        the expected value of "stand", "hit" and "double"
+    """
+
+    state = EMPTY
+    for value in values:
+        state = NEXT[state * 11 + value]
+    up_state = NEXT[EMPTY * 11 + up_value]
+    double = sum(chance * _stand_infinite(NEXT[state * 11 + index + 1], up_state)
+                 for index, chance in enumerate(INFINITE))
+    return {
+        "stand": _stand_infinite(state, up_state),
+        "hit": _hit_infinite(state, up_state),
+        "double": 2 * double,
+    }
+
+
+def best_ev(values, evs):
+    """
+    returns the expected value of the best play of a first two cards, a hand of 21 stands
+    without being asked the way Engine.turn plays it
+
+    Parameters
+    ----------
+    values : list
+        the values of the Player's two cards
+
+    evs : dict
+        the expected value of "stand", "hit" and "double"
+    """
+
+    state = EMPTY
+    for value in values:
+        state = NEXT[state * 11 + value]
+    if TOTAL[state] == 21:
+        return evs["stand"]
+    return max(evs.values())
+
+
+def up_card_ev(task):
+    """
+    returns the expected value of a hand against one up card, every first two cards of
+    the Player weighed by its chance and played the best way, runs inside the worker
+    processes
+
+    Parameters
+    ----------
+    task : tuple
+        (up card value, decks), decks is None for an infinite deck
+
+    Returns
+    -------
+    UpCard
+        the up card, the chance of it, the expected value of a hand against it and how
+        long it took
+    """
+
+    up_value, decks = task
+    start = time.perf_counter()
+    ev = 0.0
+    if decks is None:
+        chance = INFINITE[up_value - 1]
+        for first in range(1, 11):
+            for second in range(first, 11):
+                pair = INFINITE[first - 1] * INFINITE[second - 1] * (1 if first == second else 2)
+                values = [first, second]
+                ev += pair * best_ev(values, infinite_hand_ev(values, up_value))
+        return UpCard(up_value, chance, ev, time.perf_counter() - start)
+
+    shoe = full_shoe(decks)
+    chance = shoe[up_value - 1] / sum(shoe)
+    counts = remove(shoe, up_value)
+    left = sum(counts)
+    pairs = left * (left - 1)
+    for first in range(1, 11):
+        for second in range(first, 11):
+            if first == second:
+                pair = counts[first - 1] * (counts[first - 1] - 1) / pairs
+            else:
+                pair = 2 * counts[first - 1] * counts[second - 1] / pairs
+            if pair == 0:
+                continue
+            values = [first, second]
+            evs = hand_ev(values, up_value, remove(counts, first, second))
+            ev += pair * best_ev(values, evs)
+    clear_cache(dealer=False)  # Only the Dealer's subproblems are asked again for another
+    return UpCard(up_value, chance, ev, time.perf_counter() - start)
+
+
+def house_edge(decks=8, workers=None, rules=DEFAULT_RULES):
+    """
+    works out the exact expected value of a hand at the table and the house edge, one up
+    card per task on a pool of processes
+
+    Parameters
+    ----------
+    decks : int
+        how many decks make up the shoe, at most 16, None for an infinite deck (default
+        is 8)
+
+    workers : int
+        how many processes to use, 1 works in this process (default is every core)
+
+    rules : Rules
+        the rules of the table, only the rules described above can be worked out (default
+        is DEFAULT_RULES)
+
+    Returns
+    -------
+    Edge
+        the decks, the expected value of a hand in bets, the house edge, the UpCard of
+        every up card and how long it took
+    """
+
+    if rules.dealer_hits_soft_17 or rules.splits or rules.blackjack_pays != (1, 1):
+        raise ValueError("the exact house edge is only worked out for S17, 1:1 blackjacks "
+                         "and no splits")
+    if decks is not None and not 1 <= decks <= 16:
+        raise ValueError(f"decks must be from 1 to 16 or None, not {decks!r}")
+    workers = workers if workers is not None else os.cpu_count() or 1
+    start = time.perf_counter()
+    tasks = [(up_value, decks) for up_value in TASK_ORDER]
+    if workers == 1:
+        up_cards = [up_card_ev(task) for task in tasks]
+    else:
+        with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+            up_cards = list(pool.imap_unordered(up_card_ev, tasks))
+    up_cards.sort()
+    ev = sum(up_card.chance * up_card.ev for up_card in up_cards)
+    return Edge(decks, ev, -ev, up_cards, time.perf_counter() - start)
+
+
+def main():
+    """
+    works out the house edge from the terminal and prints it with the expected value of a
+    hand against every up card
+    """
+
+    parser = argparse.ArgumentParser(description="Work out the exact house edge of the table")
+    parser.add_argument("--decks", type=int, default=DEFAULT_RULES.decks)
+    parser.add_argument("--infinite", action="store_true",
+                        help="draw every card from an infinite deck instead of a full shoe")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    edge = house_edge(None if args.infinite else args.decks, args.workers)
+    shoe = "an infinite deck" if edge.decks is None else f"{edge.decks} decks"
+    print(f"{shoe}: ev {edge.ev:+.5f} per hand, house edge {edge.house_edge:.4%}, "
+          f"{edge.seconds:.2f} s")
+    for up_card in edge.up_cards:
+        print(f"up {up_card.up_value:>2}: chance {up_card.chance:.5f}, ev {up_card.ev:+.5f}, "
+              f"{up_card.seconds:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
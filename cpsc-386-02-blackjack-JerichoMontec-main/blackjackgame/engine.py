@@ -0,0 +1,694 @@
+"""
+module random allows for use of Random which shuffles the Engine's shoe
+
+module deck allows for use of the Shoe class that cards are dealt from, and CODE_VALUES
+which maps a card code to its value
+
+module hand allows for use of the NEXT table which deals a card into a Hand
+
+module history allows for use of SeatHand which every hand of a round is recorded as, and
+the decision bytes of the hand history
+
+module player allows for use of Player and Dealer classes which sit at the table
+
+module metrics allows for use of the Metrics that are turned off by default, and time the
+phases of a round when they are not
+
+module render allows for use of the silent Renderer which headless tables use
+
+module rules allows for use of the default Rules of this table
+"""
+
+from random import Random
+from .deck import Shoe, CODE_VALUES
+from .hand import NEXT
+from .history import SeatHand, DOUBLE_DOWN, HIT as HIT_BYTE, STAND as STAND_BYTE, \
+    SPLIT as SPLIT_BYTE
+from .metrics import OFF
+from .player import Dealer
+from .render import SILENT
+from .rules import DEFAULT_RULES
+
+WIN = 1
+PUSH = 0
+LOSE = -1
+
+# The Dealer draws until the hand is at least this much
+DEALER_STANDS = 17
+
+# Questions a turn asks
+DOUBLE = "double"
+HIT = "hit"
+SPLIT = "split"
+
+# The methods of the Engine that are timed when it has Metrics, and the phase they are
+# timed as
+PHASES = (("new_shoe", "shuffle"), ("deal", "deal"), ("play_hand", "play_hand"),
+          ("play_dealer", "dealer"), ("settle", "settle"), ("discard_hands", "persist"))
+
+
+def outcome(value, dealer_value):
+    """
+    returns WIN, PUSH or LOSE for a hand against the Dealer's hand
+
+    Parameters
+    ----------
+    value : int
+        the best total of the Player's hand
+
+    dealer_value : int
+        the best total of the Dealer's hand
+    """
+
+    if value < 22:
+        if dealer_value > 21 or dealer_value < value:
+            return WIN
+        if value == dealer_value:
+            return PUSH
+    return LOSE
+
+
+class Decider:
+    """
+    A class used to represent whoever makes the decisions for a seat at the table,
+    the Engine asks it every time a Player has a choice to make
+
+    Methods
+    -------
+    new_round(shoe)
+        called before the cards of a round are dealt
+
+    split(player, dealer)
+        returns True when the Player wants to split a pair
+
+    double_down(player, dealer)
+        returns True when the Player wants to double down
+
+    hit(player, dealer)
+        returns True when the Player wants another card
+    """
+
+    def new_round(self, shoe):
+        """
+        called before the cards of a round are dealt, does nothing by default
+
+        Parameters
+        ----------
+        shoe : Shoe
+            the Shoe the round is dealt from
+        """
+
+    def split(self, player, dealer):
+        """
+        returns True when the Player wants to split a pair, never by default
+
+        Parameters
+        ----------
+        player : Player
+            the Player whose turn it is, player.hand is the pair
+
+        dealer : Dealer
+            the Dealer, only the first card is face up
+        """
+
+        return False
+
+    def double_down(self, player, dealer):
+        """
+        returns True when the Player wants to double down, never by default
+
+        Parameters
+        ----------
+        player : Player
+            the Player whose turn it is
+
+        dealer : Dealer
+            the Dealer, only the first card is face up
+        """
+
+        return False
+
+    def hit(self, player, dealer):
+        """
+        returns True when the Player wants another card, never by default
+
+        Parameters
+        ----------
+        player : Player
+            the Player whose turn it is
+
+        dealer : Dealer
+            the Dealer, only the first card is face up
+        """
+
+        return False
+
+
+class DealerMimic(Decider):
+    """
+    A Decider that plays like the Dealer does, hits below 17 and never doubles down
+    """
+
+    def hit(self, player, dealer):
+        """
+        hits while the Player's hand is below 17
+        """
+
+        return player.check_value() < DEALER_STANDS
+
+
+class TimedDecider(Decider):
+    """
+    A Decider that asks another one and times every answer as the "decide" phase
+
+    Attributes
+    ----------
+    decider : Decider
+        the Decider that answers
+    """
+
+    def __init__(self, decider, metrics):
+        """
+        Parameters
+        ----------
+        decider : Decider
+            the Decider that answers
+
+        metrics : Metrics
+            where the answers are timed
+        """
+
+        self.decider = decider
+        self.new_round = decider.new_round
+        self.split = metrics.instrument("decide", decider.split)
+        self.double_down = metrics.instrument("decide", decider.double_down)
+        self.hit = metrics.instrument("decide", decider.hit)
+
+
+class Engine:
+    """
+    A class used to represent the rules of the table without any prompts, every choice
+    is asked from a Decider so the same rules run for the terminal and for simulations
+
+    Attributes
+    ----------
+    deck : Shoe
+        the shoe that cards are dealt from
+
+    seats : list
+        the Players sitting at the table, in the order they play
+
+    dealer : Dealer
+        the Dealer, always plays last
+
+    decider : Decider
+        answers the double down and hit questions for every Player
+
+    renderer : Renderer
+        where the messages of the table go, given to every Player as well
+
+    rules : Rules
+        the compiled rules of the table, the ones read while a hand is played are copied
+        onto the Engine
+
+    decks : int
+        how many decks make up the shoe
+
+    splits : bool
+        True when a Player may split a pair into two Hands
+
+    dealer_hits : bytes
+        1 for every hand state the Dealer draws on
+
+    naturals : bool
+        True when a blackjack pays more than other wins and beats every other 21
+
+    blackjack_pays : tuple
+        what a blackjack pays, (3, 2) for 3:2
+
+    history : HandLog
+        where every round is recorded, None to keep no history
+
+    ledger : Ledger
+        where every bet and settlement is recorded and saved behind the table, None to
+        keep no ledger
+
+    metrics : Metrics
+        where the phases of every round are timed, OFF to time nothing
+
+    rng : Random
+        the generator the shoe is shuffled with
+
+    shuffler : Shuffler
+        shuffles the next shoes on a thread ahead of time, None to shuffle at the cut card
+
+    shoe_number : int
+        how many shoes have been built, the current one included
+
+    round_number : int
+        how many rounds have been dealt
+
+    Methods
+    -------
+    announce(message, delay)
+        shows a message through the renderer
+
+    instrument(metrics)
+        times every phase of a round, every draw and every decision
+
+    new_shoe()
+        shuffles the discards back into the shoe, cuts it and places the cut card
+
+    needs_shuffle()
+        returns True when the cut card has been reached
+
+    deal()
+        deals two cards to every Player and the Dealer
+
+    turn(player)
+        a generator of the turn of the Hand being played, yields every question the Player
+        has to answer
+
+    play_hand(player)
+        plays the turn of every Hand of one Player, asking the Decider for every choice
+
+    play_dealer()
+        reveals the Dealer's hidden card and draws until the rules say to stand
+
+    settle_round()
+        settles every seat in one pass and returns their results
+
+    judge(hand, dealer_value, dealer_natural)
+        returns the result of one Hand and how much it wins or loses
+
+    settle(player)
+        pays out or collects the bet of every Hand of a Player and returns WIN, PUSH or LOSE
+
+    record_round()
+        writes the round at the table to the hand history
+
+    discard_hands()
+        records and closes the round and moves every hand at the table into the discards
+
+    play_round(bet, hands)
+        bets, deals, plays and settles one round for every seat
+    """
+
+    def __init__(self, seats, decider=None, renderer=SILENT, rules=DEFAULT_RULES,
+                 history=None, ledger=None, metrics=OFF, rng=None, shuffler=None):
+        """
+        Parameters
+        ----------
+        seats : list
+            the Players sitting at the table
+
+        decider : Decider
+            answers the double down and hit questions (default is DealerMimic)
+
+        renderer : Renderer
+            where the messages of the table go (default is SILENT)
+
+        rules : Rules
+            the rules of the table (default is DEFAULT_RULES)
+
+        history : HandLog
+            where every round is recorded (default is None, no history)
+
+        ledger : Ledger
+            where every bet and settlement is recorded (default is None, no ledger)
+
+        metrics : Metrics
+            where the phases of every round are timed (default is OFF, nothing is timed
+            and no method is wrapped)
+
+        rng : Random
+            the generator the shoe is shuffled with (default is a new unseeded Random)
+
+        shuffler : Shuffler
+            where shuffled shoes are taken from instead (default is None), it has to
+            shuffle the decks and cut card of the rules
+        """
+
+        self.seats = seats
+        self.dealer = Dealer("Dealer", 100000000000000000000)
+        self.decider = decider if decider is not None else DealerMimic()
+        self.rules = rules
+        self.decks = rules.decks
+        self.splits = rules.splits
+        self.dealer_hits = rules.dealer_hits
+        self.naturals = rules.blackjack_pays != (1, 1)
+        self.blackjack_pays = rules.blackjack_pays
+        self.renderer = renderer
+        for person in self.seats + [self.dealer]:
+            person.renderer = renderer
+        self.deck = None
+        self.history = history
+        self.ledger = ledger
+        self.metrics = OFF
+        self.rng = rng if rng is not None else Random()
+        self.shuffler = shuffler
+        if shuffler is not None and (shuffler.decks, shuffler.cut_card) != (
+                rules.decks, rules.cut_card):
+            raise ValueError("the shuffler does not shuffle the shoe of these rules")
+        self.shoe_number = 0
+        self.round_number = 0
+        if metrics.enabled:
+            self.instrument(metrics)
+
+    def announce(self, message, delay=1.000):
+        """
+        shows a message through the renderer
+        """
+
+        self.renderer.show(message, delay)
+
+    def instrument(self, metrics):
+        """
+        times the phases of every round from now on, the methods in PHASES are replaced on
+        this Engine by timed ones, the Decider is wrapped so its answers are timed and every
+        new shoe times its draws
+
+        Parameters
+        ----------
+        metrics : Metrics
+            where the phases are timed
+        """
+
+        self.metrics = metrics
+        for _, (method, phase) in enumerate(PHASES):
+            setattr(self, method, metrics.instrument(phase, getattr(self, method)))
+        self.decider = TimedDecider(self.decider, metrics)
+        if self.deck is not None:
+            self.deck.draw_code = metrics.instrument("draw", self.deck.draw_code)
+
+    def new_shoe(self):
+        """
+        shuffles the discards back into the shoe, cuts it in half and places a random card
+        at the cut card location, the shoe is only built the first time, when there is a
+        Shuffler the next shoe it has ready is taken instead
+        """
+
+        codes = cut_card_location = None
+        if self.shuffler is not None:
+            codes, cut_card_location = self.shuffler.next()
+        if self.deck is None:
+            self.deck = Shoe(self.decks, self.rng, codes, cut_card_location,
+                             self.rules.cut_card)
+            if self.metrics.enabled:
+                self.deck.draw_code = self.metrics.instrument("draw", self.deck.draw_code)
+        elif codes is None:
+            self.deck.shuffle()
+        else:
+            self.deck.load(codes, cut_card_location)
+        self.shoe_number += 1
+
+    def needs_shuffle(self):
+        """
+        returns True when there is no shoe yet or the cut card has been reached
+        """
+
+        return self.deck is None or self.deck.needs_shuffle()
+
+    def deal(self):
+        """
+        deals one card at a time to every Hand starting with the first Player and ending on
+        the Dealer, twice, and hides the Dealer's second card
+        """
+
+        self.dealer.is_hidden = True
+        self.round_number += 1
+        self.decider.new_round(self.deck)
+        table = self.seats + [self.dealer]
+        self.deck.round_start = self.deck.cursor
+        draw_code = self.deck.draw_code
+        for _ in range(2):  # First Set, then Second Set
+            for person in table:
+                for hand in person.hands:
+                    code = draw_code()
+                    hand.cards.append(code)
+                    hand.state = NEXT[hand.state * 11 + CODE_VALUES[code]]
+
+    def turn(self, player):
+        """
+        a generator that plays the turn of the Hand being played, offering a split when the
+        table allows it, then a double down and then hits until the Player stands, busts or
+        reaches 21, it yields SPLIT, DOUBLE or HIT every time the Player has a choice and is
+        sent back True or False, so the same turn can be answered right away or over a
+        network, every answer that changes the Hand is added to its decisions as it is made
+
+        Parameters
+        ----------
+        player : Player
+            the Player whose turn it is, player.hand is the Hand being played
+        """
+
+        player.start_turn()
+        hand = player.hand
+        if len(hand.cards) == 1:  # Second half of a split pair
+            player.draw_card(self.deck)
+        self.dealer.print_cards()
+        player.print_cards()
+
+        while self.splits and hand.can_split() and hand.bet <= player.balance:
+            if not (yield SPLIT):
+                break
+            player.split()
+            if not hand.decisions:
+                hand.decisions.append(SPLIT_BYTE)
+            player.hands[player.hands.index(hand) + 1].decisions.append(SPLIT_BYTE)
+            player.draw_card(self.deck)
+            player.print_cards()
+
+        if player.check_value() == 21:  # Blackjack off the first two cards
+            self.announce("Blackjack!")
+            player.end_turn()
+            return
+
+        if (yield DOUBLE):
+            player.double_down()
+            if player.doubled_down:
+                hand.decisions.append(DOUBLE_DOWN)
+                player.draw_card(self.deck)
+                player.print_cards()
+                value = player.check_value()
+                if value == 21:
+                    self.announce("Blackjack!")
+                if value > 21:
+                    self.announce("Busted!")
+                    player.end_turn()
+                    return
+                self.announce("This is your final hand.")
+                self.announce(f"You have ${player.balance} remaining\n")
+                player.end_turn()
+                return
+            self.announce("Not enough funds")
+
+        while player.is_turn:  # Hit
+            if not (yield HIT):  # No hit, stand
+                hand.decisions.append(STAND_BYTE)
+                player.stand()
+                self.announce("This is your final hand.\n")
+                return
+            hand.decisions.append(HIT_BYTE)
+            player.draw_card(self.deck)
+            value = player.check_value()
+            if value == 21:
+                self.announce("Blackjack!")
+            player.print_cards()
+            if value >= 21:
+                if value > 21:
+                    self.announce("Busted!\n")
+                player.end_turn()
+
+    def play_hand(self, player):
+        """
+        plays the turn of every Hand of a Player, asking the Decider every question the
+        turns yield, a Hand split off is played right after the one it came from
+
+        Parameters
+        ----------
+        player : Player
+            the Player whose turn it is
+        """
+
+        decider = self.decider
+        dealer = self.dealer
+        for hand in player.hands:
+            player.hand = hand
+            turn = self.turn(player)
+            try:
+                question = next(turn)
+                while True:
+                    if question == HIT:
+                        question = turn.send(decider.hit(player, dealer))
+                    elif question == DOUBLE:
+                        question = turn.send(decider.double_down(player, dealer))
+                    else:
+                        question = turn.send(decider.split(player, dealer))
+            except StopIteration:
+                pass
+        player.hand = player.hands[0]
+
+    def play_dealer(self):
+        """
+        reveals the Dealer's hidden card and draws until the hand is 17 or greater, a soft 17
+        is drawn on as well when the rules say the Dealer hits it
+        """
+
+        dealer = self.dealer
+        dealer.start_turn()
+        dealer.is_hidden = False
+        hits = self.dealer_hits
+        while hits[dealer.hand.state]:
+            dealer.draw_card(self.deck)
+        dealer.print_cards()
+        if dealer.check_value() == 21:
+            self.announce("Dealer got Blackjack!")
+        dealer.end_turn()
+
+    def settle(self, player):
+        """
+        compares every Hand of a Player against the Dealer's hand in one pass and pays out,
+        pushes or collects its bet, a Player left with nothing is given a donation once
+        every Hand is settled
+
+        Parameters
+        ----------
+        player : Player
+            the Player being settled
+
+        Returns
+        -------
+        int
+            WIN, PUSH or LOSE for the seat as a whole, the same as the result of its Hand
+            when the Player holds only one
+        """
+
+        dealer = self.dealer
+        dealer_value = dealer.check_value()
+        dealer_natural = dealer_value == 21 and len(dealer.hand.cards) == 2
+        ledger = self.ledger
+        net = 0
+        for hand in player.hands:
+            player.hand = hand
+            result, winnings = self.judge(hand, dealer_value, dealer_natural)
+            if result == WIN:
+                player.win_hand(winnings)
+            elif result == PUSH:
+                player.tie_hand()
+            else:
+                player.lose_hand()
+            if ledger is not None:
+                ledger.record(self.round_number, player.name, hand.bet, result, winnings)
+            net += winnings
+        player.hand = player.hands[0]
+        donation = player.rebuy()
+        if donation and ledger is not None:
+            ledger.donate(self.round_number, player.name, donation)
+        if net > 0:
+            return WIN
+        if net < 0:
+            return LOSE
+        return PUSH
+
+    def settle_round(self):
+        """
+        settles every seat against the Dealer in one pass
+
+        Returns
+        -------
+        list
+            WIN, PUSH or LOSE for every seat, in seat order
+        """
+
+        return [self.settle(player) for player in self.seats]
+
+    def judge(self, hand, dealer_value, dealer_natural):
+        """
+        returns WIN, PUSH or LOSE for one Hand and how much it wins, negative when it loses,
+        a natural only counts for more than 21 when the rules pay more for it
+
+        Parameters
+        ----------
+        hand : Hand
+            the Hand being settled
+
+        dealer_value : int
+            the best total of the Dealer's hand
+
+        dealer_natural : bool
+            True when the Dealer's hand is a natural
+        """
+
+        result = outcome(hand.value(), dealer_value)
+        if self.naturals:
+            natural = len(hand.cards) == 2 and not hand.is_split and hand.value() == 21
+            if natural and not dealer_natural:
+                numerator, denominator = self.blackjack_pays
+                return WIN, hand.bet * numerator // denominator
+            if dealer_natural and not natural:
+                return LOSE, -hand.bet
+        return result, result * hand.bet
+
+    def record_round(self):
+        """
+        writes the hands, decisions, bets and outcomes of the round at the table to the
+        hand history
+        """
+
+        dealer = self.dealer
+        dealer_value = dealer.check_value()
+        dealer_natural = dealer_value == 21 and len(dealer.hand.cards) == 2
+        seats = [SeatHand(player.name, hand.bet,
+                          self.judge(hand, dealer_value, dealer_natural)[0],
+                          bytes(hand.cards), bytes(hand.decisions))
+                 for player in self.seats for hand in player.hands]
+        self.history.record(self.shoe_number, self.round_number,
+                            bytes(self.dealer.current_hand), seats)
+
+    def discard_hands(self):
+        """
+        records the round when there is a hand history, hands the round to the ledger when
+        there is one and moves every hand at the table into the discards
+        """
+
+        if self.history is not None:
+            self.record_round()
+        if self.ledger is not None:
+            self.ledger.end_round(self.seats)
+        for person in self.seats + [self.dealer]:
+            self.deck.discard_hands(person)
+
+    def play_round(self, bet=1, hands=1):
+        """
+        plays one whole round without any prompts, every seat bets the same amount on the
+        same number of spots
+
+        Parameters
+        ----------
+        bet : int
+            how much every Player bets on every spot (default is 1)
+
+        hands : int
+            how many spots every Player plays (default is 1)
+
+        Returns
+        -------
+        list
+            WIN, PUSH or LOSE for every seat, in seat order
+        """
+
+        if self.needs_shuffle():
+            self.new_shoe()
+        for player in self.seats:
+            player.hand.doubled_down = False
+            player.add_bet(min(bet, player.balance))
+            for _ in range(1, hands):
+                player.add_hand(bet)
+        self.deal()
+        for player in self.seats:
+            self.play_hand(player)
+        self.play_dealer()
+        outcomes = self.settle_round()
+        self.discard_hands()
+        return outcomes
@@ -1,20 +1,92 @@
 """
-module deck allows for use of the Deck class used in runtime
+module history allows for use of the HandLog which records every round played
 
-module player allows for use of Player and Dealer classes which make up the queue
+module ledger allows for use of the Ledger which saves every balance behind the table
 
-module random allows for use of shuffle which allows the Deck to be shuffled when needed
+module engine allows for use of the Engine which holds the rules of the table and the
+Decider interface which the terminal answers
 
-module time allows for terminal output to be delayed to make it easier to read
+module metrics allows for use of the Metrics that are turned off by default
 
-import sys used to exit code
+module prompts allows the questions of the game to be answered by the keyboard, a script or
+a bot, and names the kind of every question
+
+module render allows for use of the terminal Renderer which prints and paces the game
+
+module rules allows for use of the default Rules of the table
+
+module registry allows for use of the PlayerRegistry which holds the Players seen last in
+front of the BalanceStore
+
+module store allows for use of the BalanceStore which saves every Player's balance
 """
 
-from random import shuffle, randint
-from time import sleep
-import pickle
-from .deck import Deck
-from .player import Player, Dealer
+from .engine import Engine, Decider
+from .history import HandLog
+from .ledger import Ledger
+from .metrics import OFF
+from .prompts import KEYBOARD, PLAYERS, NAME, BET, SAME_BET, SPLIT, DOUBLE, HIT, AGAIN
+from .registry import PlayerRegistry
+from .store import BalanceStore
+from .render import TERMINAL
+from .rules import DEFAULT_RULES
+
+PICKLE_FILE = "blackjackgame/player_balances.pkl"
+STORE_FILE = "blackjackgame/player_balances.db"
+HISTORY_FILE = "blackjackgame/hand_history.bin"
+
+
+class TerminalDecider(Decider):
+    """
+    A Decider that asks the person sitting at the terminal, through the game's Prompter
+
+    Attributes
+    ----------
+    prompter : Prompter
+        who answers the questions
+
+    Methods
+    -------
+    split(player, dealer)
+        asks the Player if they would like to split, only at tables that allow it
+
+    double_down(player, dealer)
+        asks the Player if they would like to double down
+
+    hit(player, dealer)
+        asks the Player if they would like to hit
+    """
+
+    def __init__(self, prompter=KEYBOARD):
+        """
+        Parameters
+        ----------
+        prompter : Prompter
+            who answers the questions (default is the keyboard)
+        """
+
+        self.prompter = prompter
+
+    def split(self, player, dealer):
+        """
+        asks the Player if they would like to split their pair
+        """
+
+        return self.prompter.ask(SPLIT, "Would you like to split? (y/n) ").lower() == "y"
+
+    def double_down(self, player, dealer):
+        """
+        asks the Player if they would like to double down
+        """
+
+        return self.prompter.ask(DOUBLE, "Would you like to double down? (y/n) ").lower() == "y"
+
+    def hit(self, player, dealer):
+        """
+        asks the Player if they would like to hit
+        """
+
+        return self.prompter.ask(HIT, "Would you like to hit? (y/n) ").lower() != "n"
 
 
 class Game:
@@ -23,109 +95,227 @@ class Game:
 
     Attributes
     ----------
-    new_deck : Deck
-        an entire deck of cards
-
     queue : list
-        list of Players which gets iterated on during runtime
+        list of Players which gets iterated on during runtime, the Dealer is not in it
+
+    engine : Engine
+        plays the rounds for the queue, the Dealer sits at engine.dealer
+
+    renderer : Renderer
+        where the messages of the game go (default is the terminal)
+
+    store : BalanceStore
+        where the balances are saved, opened the first time it is needed
+
+    registry : PlayerRegistry
+        holds the Players in front of the store, so a Player returning to a game in the same
+        process is found in memory, opened the first time it is needed
+
+    history : HandLog
+        where every round is recorded, opened when the game starts
+
+    ledger : Ledger
+        records every bet and saves the balances every few rounds, opened when the game
+        starts
+
+    metrics : Metrics
+        where the phases of the game are timed, the Engine times the phases of a round and
+        the game times taking bets and saving balances
+
+    prompter : Prompter
+        who answers every question the game asks
 
     Methods
     -------
-    duplicate_deck(deck, n)
-        takes a Deck object and an int
-        creates n - 1 duplications of the Deck and combines them
-
     add_queue(person)
         takes a Person object and appends them into the queue
 
+    open_store()
+        opens the BalanceStore and moves over the old pickle file once
+
+    open_registry()
+        opens the PlayerRegistry over the BalanceStore
+
+    close_registry()
+        writes back every balance the PlayerRegistry holds
+
+    open_history()
+        opens the HandLog and gives it to the Engine
+
+    close_history()
+        writes out and closes the HandLog
+
+    open_ledger()
+        opens the Ledger and gives it to the Engine
+
+    close_ledger()
+        commits and closes the Ledger
+
     add_to_file(player_list)
-        takes a list of Person objects and adds their information to 
-        blackjackgame.player_balances.pkl
+        takes a list of Person objects and gives them back to the registry, which saves
+        their balance
 
     check_file(person)
-        takes a person's name and checks to see if they have a past balance
+        takes a person's name and returns their Player, with their past balance if they
+        have one
+
+    take_bet(player)
+        asks a Player for a bet until it is valid
 
     run()
         runs the game BlackJack
     """
 
-    def __init__(self):
+    def __init__(self, store=None, renderer=TERMINAL, history=None, rules=DEFAULT_RULES,
+                 metrics=OFF, registry=None, prompter=KEYBOARD, rng=None):
         """
         Parameters
         ----------
-        No Parameters
+        store : BalanceStore
+            where the balances are saved (default is blackjackgame/player_balances.db)
+
+        renderer : Renderer
+            where the messages of the game go (default is the terminal)
+
+        history : HandLog
+            where every round is recorded (default is blackjackgame/hand_history.bin)
+
+        rules : Rules
+            the rules of the table (default is DEFAULT_RULES)
+
+        metrics : Metrics
+            where the phases of the game are timed (default is OFF, nothing is timed)
+
+        registry : PlayerRegistry
+            holds the Players in front of the store, games in one process can share it
+            (default is a new one over the store)
+
+        prompter : Prompter
+            who answers every question (default is the keyboard)
+
+        rng : Random
+            the generator the shoe is shuffled with, a seeded one deals the same cards every
+            time (default is a new unseeded Random)
         """
-        self.new_deck = Deck()
         self.queue = []
+        self.store = store
+        self.registry = registry
+        self.renderer = renderer
+        self.history = history
+        self.ledger = None
+        self.metrics = metrics
+        self.prompter = prompter
+        self.engine = Engine(self.queue, TerminalDecider(prompter), renderer, rules, history,
+                             metrics=metrics, rng=rng)
+        if metrics.enabled:
+            self.take_bet = metrics.instrument("bet", self.take_bet)
+            self.add_to_file = metrics.instrument("save", self.add_to_file)
 
-    def duplicate_deck(self, deck, repeat):
+    def add_queue(self, person):
         """
-        takes a Deck, copies it n - 1 times and combines them all together
+        takes a Person and adds them to the end of the queue
         """
 
-        copy_deck = Deck()
-        for _ in range(repeat - 1):
-            deck.cards += copy_deck.cards
+        self.queue.append(person)
 
-    def add_queue(self, person):
+    def open_store(self):
         """
-        takes a Person and adds them to the end of the queue
+        opens the BalanceStore the first time it is needed and moves over the balances from
+        blackjackgame/player_balances.pkl
         """
 
-        self.queue.append(person)
+        if self.store is None:
+            self.store = BalanceStore(STORE_FILE)
+            self.store.migrate(PICKLE_FILE)
+        return self.store
+
+    def open_registry(self):
+        """
+        opens the PlayerRegistry over the BalanceStore the first time it is needed
+        """
+
+        if self.registry is None:
+            self.registry = PlayerRegistry(self.open_store())
+        return self.registry
+
+    def close_registry(self):
+        """
+        writes back the balance of every Player the registry holds that changed
+        """
+
+        if self.registry is not None:
+            self.registry.flush()
+
+    def open_history(self):
+        """
+        opens the HandLog the first time it is needed, rounds are appended to
+        blackjackgame/hand_history.bin
+        """
+
+        if self.history is None:
+            self.history = HandLog(HISTORY_FILE)
+        self.engine.history = self.history
+        return self.history
+
+    def close_history(self):
+        """
+        writes out every buffered round and closes the HandLog
+        """
+
+        if self.history is not None:
+            self.history.close()
+
+    def open_ledger(self):
+        """
+        opens a Ledger on the BalanceStore so balances are saved while the game is played,
+        a store kept in memory has nothing to save to
+        """
+
+        path = self.open_store().path
+        if self.ledger is None and path != ":memory:":
+            self.ledger = Ledger(path, metrics=self.metrics)
+            self.engine.ledger = self.ledger
+        return self.ledger
+
+    def close_ledger(self):
+        """
+        commits every round and closes the Ledger
+        """
+
+        if self.ledger is not None:
+            self.ledger.close()
 
     def add_to_file(self, player_list):
         """
-        takes everyone and adds their information to blackjackgame.player_balances.pkl,
-        """
-
-        try:
-            with open("blackjackgame/player_balances.pkl", "rb") as client_info:
-                new_clients = []
-                found = False
-                for _, info in enumerate(pickle.load(client_info)):
-                    for _, player in enumerate(player_list):
-                        if info.name == player.name:
-                            new_clients.append(player)
-                            found = True
-                    if found is False:
-                        new_clients.append(info)
-                for _, player in enumerate(player_list):
-                    if player not in new_clients:
-                        new_clients.append(player)
-            client_info.close()
-
-            with open("blackjackgame/player_balances.pkl", "wb") as write_info:
-                pickle.dump(new_clients, write_info)
-            write_info.close()
-
-        except EOFError:
-            with open("blackjackgame/player_balances.pkl", "wb") as write_info:
-                pickle.dump(player_list, write_info)
-                write_info.close()
+        takes everyone leaving and gives them back to the PlayerRegistry, their balance is
+        saved when the registry lets them go or when the game ends
+        """
+
+        self.open_registry().leave(player_list)
 
     def check_file(self, player):
         """
-        checks to see if player has a past balance
-        """
-
-        try:
-            with open("blackjackgame/player_balances.pkl", "rb") as client_info:
-                found = False
-                for _, info in enumerate(pickle.load(client_info)):
-                    if player == info.name:
-                        found = True
-                        print("Looks like you have a balance here.")
-                        sleep(1.000)
-                        print(f"You have {info.balance}\n")
-                        sleep(1.000)
-                        new_player = Player(info.name, info.balance)
-            client_info.close()
-            if found:
-                return new_player
-            return -1
-        except EOFError:
-            return Player(player, 10000)
+        returns the Player of a name from the PlayerRegistry, a name without a past balance
+        starts with 10000
+        """
+
+        person, found = self.open_registry().join(player)
+        if found:
+            self.renderer.show("Looks like you have a balance here.")
+            self.renderer.show(f"You have {person.balance}\n")
+        self.prompter.joined(person, found)
+        return person
+
+    def take_bet(self, player):
+        """
+        asks a Player how much they would like to bet until the bet is valid
+        """
+
+        player.is_turn = True
+        while player.is_turn:
+            bet = int(self.prompter.ask(BET, f"{player.name}, how much would you like to bet?"
+                                        "(Bet 0 to leave) "))
+            player.add_bet(bet)
 
     def run(self):
         """
@@ -133,190 +323,94 @@ class Game:
         'n' to wanting to play again
         """
 
-        print("Welcome to terminal Blackjack!")
-        sleep(1.000)
-        player_amount = int(input("How many players at the table? "))
-
-        # Deck duplicate and shuffle
-        self.duplicate_deck(self.new_deck, 8)
-        shuffle(self.new_deck.cards)
-
-        # Cut Cards
-        length = len(self.new_deck.cards)
-        self.new_deck.cards = self.new_deck.cards[length // 2:] + self.new_deck.cards[:length // 2]
+        engine = self.engine
+        self.renderer.show("Welcome to terminal Blackjack!")
+        ask = self.prompter.ask
+        player_amount = int(ask(PLAYERS, "How many players at the table? "))
 
-        # Place random card in cut card location
-        random_card = Deck()
-        self.new_deck.cards.insert(self.new_deck.cut_card_location,
-                                   random_card.cards[randint(0, 51)])
+        # Shuffle, cut and place the cut card
+        engine.new_shoe()
+        self.open_history()
+        self.open_ledger()
 
-        # Adds players into the queue and checking if they have a balance already
+        # Adds players into the queue and checking if they have a balance already, a name
+        # that is already sitting somewhere is asked for again
         for player in range(player_amount):
-            name = input(f"What is player {player + 1}'s name? ")
+            name = ask(NAME, f"What is player {player + 1}'s name? ")
+            while self.open_registry().is_seated(name):
+                self.renderer.show(f"{name} is already playing, please pick another name.")
+                name = ask(NAME, f"What is player {player + 1}'s name? ")
             person = self.check_file(name)
-            if person == -1:
-                self.queue.append(Player(name, 10000))
-            else:
-                self.queue.append(person)
-
-        self.add_queue(Dealer("Dealer", 100000000000000000000))
+            person.renderer = self.renderer
+            self.add_queue(person)
 
         # Gets bets from all players
         for player in self.queue:
-            player.is_turn = True
-            if player.is_dealer is True:
-                player.end_turn()
-                continue
-            while player.is_turn:
-                bet = int(input(f"{player.name}, how much would you like to bet?"
-                                "(Bet 0 to leave) "))
-                player.add_bet(bet)
+            self.take_bet(player)
 
         play_again = " "
-        while len(self.queue) > 1:
+        while self.queue:
             # Use same bet as last round
             if play_again == "y":
-                print("\n")
-                self.queue[-1].is_hidden = True  # Hide the dealer's cards when starting over
+                self.renderer.show("\n", 0)
 
                 # Shuffle deck if it reaches cut card location
-                if self.new_deck.cut_card_location < len(self.new_deck.discards):
-                    self.new_deck = self.new_deck.deck_shuffle()
+                if engine.needs_shuffle():
+                    engine.new_shoe()
 
                 for player in self.queue:
                     player.start_turn()
-                    if player.is_dealer:
-                        player.end_turn()
-                        continue
                     if player.doubled_down:
                         player.doubled_down = False
-                        player.current_bet = player.current_bet / 2
-                    bet_option = input(f"{player.name}, would you like to use the"
-                                       f"same bet as the previous round? (${player.current_bet})" 
-                                       "(y/n) ").lower()
-                    if bet_option == "n":
-                        while player.is_turn:
-                            new_bet = int(input(f"{player.name}, how much would you like to bet?"
-                                                "(Bet 0 to leave) "))
-                            print("\n")
-                            player.is_turn = player.add_bet(new_bet)
+                        player.current_bet = player.current_bet // 2
+                    bet_option = ask(SAME_BET, f"{player.name}, would you like to use the"
+                                     f"same bet as the previous round? (${player.current_bet})"
+                                     "(y/n) ").lower()
+                    if bet_option != "n":
+                        player.add_bet(player.current_bet)
+                    if player.is_turn:
+                        self.take_bet(player)
+                        self.renderer.show("\n", 0)
             elif play_again == "n":
-                print("Leaving table...")
-                sleep(1.000)
+                self.renderer.show("Leaving table...")
                 for player in self.queue:
-                    if player.is_dealer:
-                        continue
-                    print(f"Goodbye {player.name}, your total balance is {player.balance} ")
-                    sleep(1.000)
-                self.add_to_file(self.queue[0:-1])
+                    self.renderer.show(f"Goodbye {player.name}, your total balance is "
+                                       f"{player.balance} ")
+                self.close_ledger()
+                self.add_to_file(self.queue)
+                self.close_registry()
+                self.close_history()
                 return -1
 
             # Takes players out of the queue if they do not have any bet
-            for player in self.queue:
-                if player.current_bet == 0 and player.is_dealer is False:
-                    print(f"Goodbye {player.name}, your total balance is {player.balance}\n")
-                    sleep(1.000)
+            for player in list(self.queue):
+                if player.current_bet == 0:
+                    self.renderer.show(f"Goodbye {player.name}, your total balance is "
+                                       f"{player.balance}\n")
                     self.queue.remove(player)
-                    self.add_to_file(player)
-                if len(self.queue) < 2:
-                    return -1
-
-            # Deal the cards
-            for player in self.queue:  # First Set
-                player.draw_card(self.new_deck)
-
-            for player in self.queue:  # Second Set
-                player.draw_card(self.new_deck)
+                    self.add_to_file([player])
+            if not self.queue:
+                self.close_ledger()
+                self.close_registry()
+                self.close_history()
+                return -1
 
-            # Display Cards and prompt actions
+            # Deal the cards, play every turn and the dealer last
+            engine.deal()
             for player in self.queue:
-                player.start_turn()
-
-                if player.is_dealer is False:  # Display Dealer cards
-                    self.queue[-1].print_cards()
-
-                while player.is_turn:
-                    if player.is_dealer:  # Reveals dealer's final cards
-                        player.is_hidden = False
-                        while player.check_value() < 17:
-                            player.draw_card(self.new_deck)
-                        player.print_cards()
-                        if player.check_value() == 21:
-                            print("Dealer got Blackjack!")
-                            sleep(1.000)
-                        player.end_turn()
-                        continue
-
-                    player.print_cards()
-
-                    if player.check_value() == 21:  # Blackjack off the first two cards
-                        print("Blackjack!")
-                        sleep(1.000)
-                        player.end_turn()
-                        continue
-
-                    if player.check_value() < 21:  # Double Down
-                        option = input("Would you like to double down? (y/n) ").lower()
-                    if option == "y":
-                        player.double_down()
-                        if player.doubled_down:
-                            player.draw_card(self.new_deck)
-                            player.print_cards()
-                            if player.check_value() == 21:
-                                print("Blackjack!")
-                                sleep(1.000)
-                            if player.check_value() > 21:
-                                print("Busted!")
-                                sleep(1.000)
-                                player.end_turn()
-                                continue
-                            print("This is your final hand.")
-                            sleep(1.000)
-                            print(f"You have ${player.balance} remaining\n")
-                            sleep(1.000)
-                            player.end_turn()
-                            continue
-                        print("Not enough funds")
-                        sleep(1.000)
-
-                    while player.is_turn:  # Hit
-                        option = input("Would you like to hit? (y/n) ").lower()
-                        if option == "n":  # No hit, stand
-                            player.stand()
-                            print("This is your final hand.\n")
-                            sleep(1.000)
-                            player.end_turn()
-                            continue
-                        player.draw_card(self.new_deck)
-                        if player.check_value() == 21:
-                            print("Blackjack!")
-                            sleep(1.000)
-                        player.print_cards()
-                        if player.check_value() > 21:
-                            print("Busted!\n")
-                            sleep(1.000)
-                            player.end_turn()
-
-            # Check Values
+                engine.play_hand(player)
+            engine.play_dealer()
+
+            # Check Values, every seat is settled at once
+            engine.settle_round()
             for player in self.queue:
-                if player.is_dealer:
-                    continue
-                if player.check_value() < 22:
-                    if (self.queue[-1].check_value() > 21
-                        or self.queue[-1].check_value() < player.check_value()):
-                        player.win_hand()
-                    elif player.check_value() == self.queue[-1].check_value():
-                        player.tie_hand()
-                    else:
-                        player.lose_hand()
-                else:
-                    player.lose_hand()
-                print(f"{player.name} has ${player.balance} remaining.\n")
-                sleep(1.000)
+                self.renderer.show(f"{player.name} has ${player.balance} remaining.\n")
 
             # Discard hands
-            for person in self.queue:
-                self.new_deck.discard_hands(person)
+            engine.discard_hands()
 
-            # Prompt play again
-            play_again = input("Would you like to go again? (y/n) ").lower()
+            # Prompt play again until the answer is y or n
+            play_again = ask(AGAIN, "Would you like to go again? (y/n) ").lower()
+            while play_again not in ("y", "n"):
+                play_again = ask(AGAIN, "Please answer y or n. Would you like to go again? "
+                                 "(y/n) ").lower()
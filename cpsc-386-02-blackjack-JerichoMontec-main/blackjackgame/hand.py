@@ -0,0 +1,262 @@
+"""
+Lookup tables for the value of a hand, a hand is kept as one small integer state instead of
+being added up again every time it is checked
+
+A state stands for the pair (hard total, holds an ace) where the hard total counts every ace
+as 1, state = hard total * 2 + holds an ace, and BUST is the state every hand over 21 ends
+up in. Drawing a card is one lookup, NEXT[state * 11 + value of the card].
+
+module array allows the tables to be stored as one byte per entry
+
+module itertools and operator allow a whole batch of hands to be moved through the tables
+without a python loop per hand
+
+module deck allows for use of CODE_VALUES which maps a card code to its value
+"""
+
+from array import array
+from itertools import repeat
+from operator import add, mul
+from .deck import CODE_VALUES
+
+EMPTY = 0
+BUST = 44
+STATES = BUST + 1
+
+
+def _total(state):
+    """
+    returns the best total of a state, an ace counts as 11 when that does not bust the hand
+    """
+
+    if state == BUST:
+        return 22
+    hard, ace = divmod(state, 2)
+    if ace and hard <= 11:
+        return hard + 10
+    return hard
+
+
+def _next(state, value):
+    """
+    returns the state after a card of the given value is added to a hand in the given state
+    """
+
+    if state == BUST:
+        return BUST
+    hard, ace = divmod(state, 2)
+    hard = hard + value
+    if hard > 21:
+        return BUST
+    return hard * 2 + (ace or value == 1)
+
+
+NEXT = array("B", (_next(state, value) for state in range(STATES) for value in range(11)))
+TOTAL = array("B", (_total(state) for state in range(STATES)))
+SOFT = array("B", (int(state != BUST and state % 2 == 1 and state // 2 <= 11)
+                   for state in range(STATES)))
+
+# Translation tables so bytes.translate can look up a whole batch at once
+_CODE_VALUE_BYTES = bytes(CODE_VALUES) + bytes(256 - len(CODE_VALUES))
+_TOTAL_BYTES = bytes(TOTAL) + bytes(256 - STATES)
+
+
+def draw(state, code):
+    """
+    returns the state of a hand after the card with the given code is added
+
+    Parameters
+    ----------
+    state : int
+        the state of the hand
+
+    code : int
+        the code of the card, rank index * 4 + suit index
+    """
+
+    return NEXT[state * 11 + CODE_VALUES[code]]
+
+
+def is_blackjack(state, cards):
+    """
+    returns True when a hand of the given number of cards is a natural 21
+
+    Parameters
+    ----------
+    state : int
+        the state of the hand
+
+    cards : int
+        how many cards are in the hand
+    """
+
+    return cards == 2 and TOTAL[state] == 21
+
+
+def advance(states, codes):
+    """
+    adds one card to every hand of a batch, the loops run inside map and translate
+
+    Parameters
+    ----------
+    states : array
+        the state of every hand
+
+    codes : array
+        the code of the card every hand draws
+
+    Returns
+    -------
+    array
+        the new state of every hand
+    """
+
+    values = bytes(codes).translate(_CODE_VALUE_BYTES)
+    index = map(add, map(mul, states, repeat(11)), values)
+    return array("B", map(NEXT.__getitem__, index))
+
+
+def totals(states):
+    """
+    returns the best total of every hand of a batch as bytes
+
+    Parameters
+    ----------
+    states : array
+        the state of every hand
+    """
+
+    return bytes(states).translate(_TOTAL_BYTES)
+
+
+class Hand:
+    """
+    A class used to represent one hand at a seat with its own bet, a Player holds one or
+    more of them, the cards are kept in a buffer that is cleared and reused every round
+
+    Attributes
+    ----------
+    cards : bytearray
+        the code of every card in the hand
+
+    state : int
+        the state of the hand
+
+    bet : int
+        how much is bet on the hand
+
+    doubled_down : bool
+        True when the bet of the hand has been doubled
+
+    is_split : bool
+        True when the hand is one half of a split pair
+
+    decisions : bytearray
+        the hand history byte of every decision made on the hand, in the order they were
+        made
+
+    Methods
+    -------
+    add(code)
+        adds a card to the hand
+
+    value()
+        returns the best total of the hand
+
+    can_split()
+        returns True when the hand is a pair
+
+    split(other)
+        moves the second card of a pair into another Hand with the same bet
+
+    clear()
+        empties the hand, the bet is kept for the next round
+    """
+
+    __slots__ = ("cards", "state", "bet", "doubled_down", "is_split", "decisions")
+
+    def __init__(self, bet=0):
+        """
+        Parameters
+        ----------
+        bet : int
+            how much is bet on the hand (default is 0)
+        """
+
+        self.cards = bytearray()
+        self.state = EMPTY
+        self.bet = bet
+        self.doubled_down = False
+        self.is_split = False
+        self.decisions = bytearray()
+
+    def __setstate__(self, state):
+        """
+        restores a pickled Hand, one pickled before decisions were kept starts with none
+
+        Parameters
+        ----------
+        state : tuple
+            the pickled dictionary, if any, and the value of every slot
+        """
+
+        self.decisions = bytearray()
+        for key, value in state[1].items():
+            setattr(self, key, value)
+
+    def add(self, code):
+        """
+        adds the card with the given code to the hand
+        """
+
+        self.cards.append(code)
+        self.state = NEXT[self.state * 11 + CODE_VALUES[code]]
+
+    def value(self):
+        """
+        returns the best total of the hand, 22 when it is bust
+        """
+
+        return TOTAL[self.state]
+
+    def can_split(self):
+        """
+        returns True when the hand is two cards of the same value
+        """
+
+        cards = self.cards
+        return len(cards) == 2 and CODE_VALUES[cards[0]] == CODE_VALUES[cards[1]]
+
+    def split(self, other=None):
+        """
+        moves the second card into another Hand with the same bet and returns it, both
+        hands are left with one card
+
+        Parameters
+        ----------
+        other : Hand
+            an empty Hand to reuse (default is a new Hand)
+        """
+
+        code = self.cards.pop()
+        self.state = NEXT[EMPTY * 11 + CODE_VALUES[self.cards[0]]]
+        self.is_split = True
+        if other is None:
+            other = Hand()
+        other.clear()
+        other.bet = self.bet
+        other.doubled_down = False
+        other.is_split = True
+        other.add(code)
+        return other
+
+    def clear(self):
+        """
+        empties the hand for the next round, the bet and doubled_down are kept so the same
+        bet can be placed again
+        """
+
+        self.cards.clear()
+        self.decisions.clear()
+        self.state = EMPTY
+        self.is_split = False
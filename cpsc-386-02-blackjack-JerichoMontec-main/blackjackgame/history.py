@@ -0,0 +1,328 @@
+"""
+A hand history, every round played is appended to a binary log so it can be audited or
+replayed later
+
+The log starts with MAGIC followed by one record per round. A record is its length as four
+bytes and then the round,
+
+    shoe number, round number, number of seats, number of Dealer cards   (RECORD)
+    the Dealer's card codes
+    for every seat,
+        bet, outcome, name length, number of cards, number of decisions  (SEAT)
+        the name, the card codes and the decisions
+
+Every number is little endian, a card is its one byte code and a decision is one byte,
+b"D" for a double down, b"H" for a hit and b"S" for a stand. A hand that is one half of a
+split pair starts with b"P", and every hand of a seat is its own seat entry. A name is cut
+to the whole characters that fit in 255 bytes.
+
+module mmap allows the log to be read without loading the whole file
+
+module struct allows the numbers of a record to be packed into bytes
+
+module time allows the log to be flushed every so many seconds
+
+module collections allows for use of namedtuples which hold a round that has been read
+back
+"""
+
+import mmap
+import struct
+from collections import namedtuple
+from time import monotonic
+
+MAGIC = b"BJHH\x01"
+LENGTH = struct.Struct("<I")
+RECORD = struct.Struct("<IIBB")
+SEAT = struct.Struct("<qbBBB")
+
+DOUBLE_DOWN = ord("D")
+HIT = ord("H")
+STAND = ord("S")
+SPLIT = ord("P")
+
+Hand = namedtuple("Hand", ["shoe", "round", "dealer", "seats"])
+SeatHand = namedtuple("SeatHand", ["name", "bet", "outcome", "cards", "decisions"])
+
+
+def encode(shoe, number, dealer, seats):
+    """
+    returns the bytes of one record, without its length
+
+    Parameters
+    ----------
+    shoe : int
+        which shoe the round was dealt from
+
+    number : int
+        which round of the table it was
+
+    dealer : bytes
+        the Dealer's card codes
+
+    seats : list
+        a SeatHand for every seat, in the order they played
+    """
+
+    body = bytearray(RECORD.pack(shoe, number, len(seats), len(dealer)))
+    body += dealer
+    for _, seat in enumerate(seats):
+        name = seat.name.encode()[:255].decode(errors="ignore").encode()
+        body += SEAT.pack(seat.bet, seat.outcome, len(name), len(seat.cards),
+                          len(seat.decisions))
+        body += name
+        body += seat.cards
+        body += seat.decisions
+    return body
+
+
+def decode(body):
+    """
+    returns the Hand of the bytes of one record
+
+    Parameters
+    ----------
+    body : bytes
+        the record, without its length
+    """
+
+    shoe, number, count, dealer_cards = RECORD.unpack_from(body, 0)
+    offset = RECORD.size
+    dealer = bytes(body[offset:offset + dealer_cards])
+    offset += dealer_cards
+    seats = []
+    for _ in range(count):
+        bet, outcome, name_length, cards, decisions = SEAT.unpack_from(body, offset)
+        offset += SEAT.size
+        name = bytes(body[offset:offset + name_length]).decode(errors="replace")
+        offset += name_length
+        hand = bytes(body[offset:offset + cards])
+        offset += cards
+        choices = bytes(body[offset:offset + decisions])
+        offset += decisions
+        seats.append(SeatHand(name, bet, outcome, hand, choices))
+    return Hand(shoe, number, dealer, seats)
+
+
+class HandLog:
+    """
+    A class used to represent the hand history being written, records are kept in a buffer
+    and appended to the file every so many rounds or seconds
+
+    Attributes
+    ----------
+    path : string
+        where the log is saved
+
+    flush_rounds : int
+        how many rounds are buffered before they are written
+
+    flush_seconds : float
+        how long a round can stay buffered before it is written
+
+    buffer : bytearray
+        the records not written yet
+
+    Methods
+    -------
+    record(shoe, number, dealer, seats)
+        adds one round to the log
+
+    flush()
+        writes every buffered record to the file
+
+    close()
+        flushes and closes the file
+    """
+
+    def __init__(self, path, flush_rounds=256, flush_seconds=1.0):
+        """
+        Parameters
+        ----------
+        path : string
+            where the log is saved, new rounds are appended when it already exists
+
+        flush_rounds : int
+            how many rounds are buffered before they are written (default is 256)
+
+        flush_seconds : float
+            how long a round can stay buffered (default is 1.0)
+        """
+
+        self.path = path
+        self.flush_rounds = flush_rounds
+        self.flush_seconds = flush_seconds
+        self.buffer = bytearray()
+        self.rounds = 0
+        self.flushed_at = monotonic()
+        self.file = open(path, "ab")  # pylint: disable=consider-using-with
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+
+    def record(self, shoe, number, dealer, seats):
+        """
+        adds one round to the buffer and flushes it when it is full or old enough
+
+        Parameters
+        ----------
+        shoe : int
+            which shoe the round was dealt from
+
+        number : int
+            which round of the table it was
+
+        dealer : bytes
+            the Dealer's card codes
+
+        seats : list
+            a SeatHand for every seat, in the order they played
+        """
+
+        body = encode(shoe, number, dealer, seats)
+        self.buffer += LENGTH.pack(len(body))
+        self.buffer += body
+        self.rounds += 1
+        if (self.rounds >= self.flush_rounds
+                or monotonic() - self.flushed_at >= self.flush_seconds):
+            self.flush()
+
+    def flush(self):
+        """
+        writes every buffered record to the file
+        """
+
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+        self.file.flush()
+        self.rounds = 0
+        self.flushed_at = monotonic()
+
+    def close(self):
+        """
+        flushes the buffer and closes the file
+        """
+
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+class HandReader:
+    """
+    A class used to represent a hand history being read, the file is memory mapped so only
+    the records that are looked at are paged in
+
+    Attributes
+    ----------
+    path : string
+        where the log is saved
+
+    map : mmap
+        the file mapped into memory, None when it holds no records
+
+    Methods
+    -------
+    spans()
+        yields where every record starts and how long it is
+
+    records()
+        yields the bytes of every record without decoding it
+
+    hands(shoe, name)
+        yields every Hand, or only the ones of one shoe or one Player
+
+    close()
+        unmaps the file
+    """
+
+    def __init__(self, path):
+        """
+        Parameters
+        ----------
+        path : string
+            where the log is saved
+        """
+
+        self.path = path
+        with open(path, "rb") as log:
+            log.seek(0, 2)
+            if log.tell() <= len(MAGIC):
+                self.map = None
+            else:
+                self.map = mmap.mmap(log.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map is not None and self.map[:len(MAGIC)] != MAGIC:
+            self.map.close()
+            raise ValueError(f"{path} is not a hand history")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __iter__(self):
+        return self.hands()
+
+    def spans(self):
+        """
+        yields the offset and length of every whole record in the order they were played,
+        a record cut short by a crash is left out
+        """
+
+        if self.map is None:
+            return
+        data = self.map
+        end = len(data)
+        offset = len(MAGIC)
+        while offset + LENGTH.size <= end:
+            length = LENGTH.unpack_from(data, offset)[0]
+            offset += LENGTH.size
+            if offset + length > end:
+                return
+            yield offset, length
+            offset += length
+
+    def records(self):
+        """
+        yields the bytes of every whole record without decoding them
+        """
+
+        data = self.map
+        for offset, length in self.spans():
+            yield data[offset:offset + length]
+
+    def hands(self, shoe=None, name=None):
+        """
+        yields every Hand in the order they were played, the records that can not match are
+        skipped before they are copied or decoded
+
+        Parameters
+        ----------
+        shoe : int
+            only the rounds of this shoe (default is every shoe)
+
+        name : string
+            only the rounds this Player sat in (default is every Player)
+        """
+
+        data = self.map
+        needle = name.encode() if name is not None else None
+        for offset, length in self.spans():
+            if shoe is not None and RECORD.unpack_from(data, offset)[0] != shoe:
+                continue
+            if needle is not None and data.find(needle, offset, offset + length) < 0:
+                continue
+            hand = decode(data[offset:offset + length])
+            if needle is not None and all(seat.name != name for seat in hand.seats):
+                continue
+            yield hand
+
+    def close(self):
+        """
+        unmaps the file
+        """
+
+        if self.map is not None:
+            self.map.close()
+            self.map = None
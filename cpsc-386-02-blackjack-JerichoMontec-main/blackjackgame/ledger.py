@@ -0,0 +1,263 @@
+"""
+A ledger of every bet and its settlement, kept in memory while the table plays and written
+behind it to the BalanceStore, many rounds in one transaction
+
+Every settled hand is one entry (round, name, kind, bet, paid), kind is "win", "push" or
+"loss" and paid is what the hand gave back, the bet and its winnings for a win, the bet for
+a push and 0 for a loss. A Player that lost everything and was given money by rebuy has one
+"donation" entry with a bet of 0 once every hand of the round is settled. paid minus bet of
+every entry of a name adds up to how much its balance moved.
+
+Closed rounds are kept in a list the writer thread takes all at once, it commits once
+flush_rounds rounds are waiting or every flush_seconds, so saving never waits on the disk
+and the table does not wake the writer for every round. A batch whose commit fails is kept
+and tried again on the next wake-up ahead of the rounds closed since, nothing is counted as
+committed until it is.
+
+module sqlite3 allows the writer to catch a failed commit
+
+module threading allows the rounds to be written without holding up the table
+
+module metrics allows for use of the Metrics that are turned off by default, and time every
+commit when they are not
+
+module engine allows for use of WIN and PUSH which name the results being recorded
+
+module store allows the writer to open its own connection to the BalanceStore
+"""
+
+import sqlite3
+from threading import Thread, Lock, Event, Condition
+from .engine import WIN, PUSH
+from .metrics import OFF
+from .store import BalanceStore
+
+
+class Ledger:
+    """
+    A class used to represent the ledger of a table, entries are kept in memory and every
+    closed round is written behind by a thread
+
+    Attributes
+    ----------
+    path : string
+        where the BalanceStore is saved
+
+    flush_rounds : int
+        how many closed rounds wake the writer before its timer does
+
+    flush_seconds : float
+        how often the writer commits whatever rounds are waiting
+
+    entries : list
+        the entries of the round being played
+
+    rounds : int
+        how many rounds have been closed
+
+    committed : int
+        how many rounds the writer has committed
+
+    commits : int
+        how many transactions the writer has committed
+
+    error : Exception
+        the error of the last commit that failed, None once a commit after it worked
+
+    failures : int
+        how many commits have failed
+
+    metrics : Metrics
+        where every commit is timed and the entries written are counted
+
+    Methods
+    -------
+    record(number, name, bet, result, winnings)
+        adds the settlement of one hand
+
+    donate(number, name, donation)
+        adds the donation a Player was given after the round was settled
+
+    end_round(players)
+        closes the round, its entries and the balances they left wait for the writer
+
+    flush()
+        waits until every closed round has been committed or a commit fails
+
+    close()
+        commits everything and stops the writer
+    """
+
+    def __init__(self, path, flush_rounds=64, flush_seconds=0.25, metrics=OFF):
+        """
+        Parameters
+        ----------
+        path : string
+            where the BalanceStore is saved, the writer opens its own connection to it
+
+        flush_rounds : int
+            how many closed rounds wake the writer (default is 64)
+
+        flush_seconds : float
+            how often the writer commits (default is 0.25)
+
+        metrics : Metrics
+            where every commit is timed (default is OFF, nothing is timed)
+        """
+
+        self.path = path
+        self.flush_rounds = flush_rounds
+        self.flush_seconds = flush_seconds
+        self.entries = []
+        self.rounds = 0
+        self.committed = 0
+        self.commits = 0
+        self.error = None
+        self.failures = 0
+        self.metrics = metrics
+        self.lock = Lock()
+        self.wake = Event()
+        self.done = Condition()
+        self.waiting = []
+        self.balances = {}
+        self.waiting_rounds = 0
+        self.stopping = False
+        self.thread = Thread(target=self._write, name="ledger", daemon=True)
+        self.thread.start()
+
+    def record(self, number, name, bet, result, winnings):
+        """
+        adds the settlement of one hand to the round being played
+
+        Parameters
+        ----------
+        number : int
+            which round of the table it is
+
+        name : string
+            the Player's name
+
+        bet : int
+            the bet of the hand
+
+        result : int
+            WIN, PUSH or LOSE
+
+        winnings : int
+            how much the hand won on top of its bet, negative when it lost
+        """
+
+        if result == WIN:
+            self.entries.append((number, name, "win", bet, bet + winnings))
+        elif result == PUSH:
+            self.entries.append((number, name, "push", bet, bet))
+        else:
+            self.entries.append((number, name, "loss", bet, 0))
+
+    def donate(self, number, name, donation):
+        """
+        adds the donation a Player was given after every hand of the round was settled
+
+        Parameters
+        ----------
+        number : int
+            which round of the table it is
+
+        name : string
+            the Player's name
+
+        donation : int
+            how much the Player was given after losing everything
+        """
+
+        self.entries.append((number, name, "donation", 0, donation))
+
+    def end_round(self, players):
+        """
+        closes the round, its entries and the balance of every Player wait for the writer,
+        it is only woken once enough rounds are waiting
+
+        Parameters
+        ----------
+        players : list
+            the Players at the table
+        """
+
+        with self.lock:
+            self.waiting += self.entries
+            for player in players:
+                self.balances[player.name] = player.balance
+            self.waiting_rounds += 1
+            full = self.waiting_rounds >= self.flush_rounds
+        self.entries = []
+        self.rounds += 1
+        if full:
+            self.wake.set()
+
+    def flush(self):
+        """
+        waits until every closed round has been committed, raises the error of a commit
+        that failed while it waited, the rounds stay waiting and are tried again
+        """
+
+        rounds = self.rounds
+        failures = self.failures
+        self.wake.set()
+        with self.done:
+            self.done.wait_for(lambda: self.committed >= rounds or self.failures > failures
+                               or not self.thread.is_alive())
+            if self.committed < rounds and self.error is not None:
+                raise self.error
+
+    def close(self):
+        """
+        commits every closed round and stops the writer, raises the error of the last
+        commit when it failed, its rounds are not saved
+        """
+
+        if self.thread.is_alive():
+            self.stopping = True
+            self.wake.set()
+            self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def _write(self):
+        """
+        runs in the writer thread, takes every waiting round at once and commits them in one
+        transaction, when enough rounds are waiting or the timer runs out
+        """
+
+        store = BalanceStore(self.path)
+        commit = self.metrics.instrument("ledger_commit", store.commit)
+        stopping = False
+        while not stopping:
+            self.wake.wait(self.flush_seconds)
+            self.wake.clear()
+            with self.lock:
+                entries, self.waiting = self.waiting, []
+                balances, self.balances = self.balances, {}
+                rounds, self.waiting_rounds = self.waiting_rounds, 0
+                stopping = self.stopping
+            if not rounds:
+                continue
+            try:
+                commit(entries, balances.items())
+            except sqlite3.Error as error:
+                with self.lock:  # Goes back ahead of the rounds closed since
+                    self.waiting = entries + self.waiting
+                    balances.update(self.balances)
+                    self.balances = balances
+                    self.waiting_rounds += rounds
+                with self.done:
+                    self.error = error
+                    self.failures += 1
+                    self.done.notify_all()
+                continue
+            self.commits += 1
+            self.metrics.count("ledger_entries", len(entries))
+            with self.done:
+                self.error = None
+                self.committed += rounds
+                self.done.notify_all()
+        store.close()
@@ -0,0 +1,336 @@
+"""
+A load generator for the terminal game, it plays many Games at once on threads with a bot
+answering every question, and reports how long the game took to get to every kind of
+question
+
+Every table plays the real Game.run with the same PlayerRegistry and BalanceStore, so the
+questions are timed through the same path a person at the terminal takes. Table i is shuffled
+by Random(ShoeBatch.stream_seed(seed, i)) and its bot answers from its own seeded generator,
+so a run deals the same cards and gives the same answers every time. The timings are not the
+same from run to run, the tables share one interpreter and take turns on it.
+
+module argparse allows the load generator to be run from the terminal
+
+module os allows the tables to keep no hand history
+
+module threading allows every table to be played on its own thread, started all at once
+
+module time allows the whole run to be timed
+
+module array allows the timings of every kind of question to be kept in one buffer
+
+module random allows for use of Random which shuffles every table and makes every bot's
+choices
+
+module batch allows for use of ShoeBatch.stream_seed which gives every table its own seed
+
+module game allows for use of the Game which every table plays
+
+module history allows for use of HandLog which is pointed at nowhere
+
+module metrics allows for use of Metrics which the timings are kept in, and Recorder which
+times the phases of the tables when asked to
+
+module prompts allows for use of TimedPrompter which times every question, RecordingPrompter
+which writes a table's session as a script, and the kinds of questions
+
+module registry allows for use of the PlayerRegistry every table shares
+
+module render allows for use of the silent Renderer, nothing is printed
+
+module store allows for use of the BalanceStore kept in memory
+"""
+
+import argparse
+import os
+import threading
+import time
+from array import array
+from random import Random
+from .batch import ShoeBatch
+from .game import Game
+from .history import HandLog
+from .metrics import Metrics, OFF, Recorder
+from .prompts import Prompter, TimedPrompter, RecordingPrompter, PLAYERS, NAME, BET, \
+    SAME_BET, SPLIT, DOUBLE, HIT, AGAIN
+from .registry import PlayerRegistry
+from .render import SILENT
+from .store import BalanceStore
+
+
+class Bot(Prompter):
+    """
+    A Prompter that answers like a careless player, at random from its own generator
+
+    Attributes
+    ----------
+    rng : Random
+        the generator every answer is picked with
+
+    names : list
+        the name of every Player at its table
+
+    rounds : int
+        how many rounds it plays before it leaves
+
+    played : int
+        how many rounds it has played
+
+    named : int
+        how many names it has given
+    """
+
+    def __init__(self, rng, names, rounds):
+        """
+        Parameters
+        ----------
+        rng : Random
+            the generator every answer is picked with
+
+        names : list
+            the name of every Player at its table
+
+        rounds : int
+            how many rounds it plays before it leaves
+        """
+
+        self.rng = rng
+        self.names = names
+        self.rounds = rounds
+        self.played = 0
+        self.named = 0
+
+    def ask(self, kind, text):
+        """
+        returns an answer that fits the kind of question
+        """
+
+        rng = self.rng
+        if kind == PLAYERS:
+            return str(len(self.names))
+        if kind == NAME:
+            self.named += 1
+            return self.names[self.named - 1]
+        if kind == BET:
+            return str(rng.randint(1, 100))
+        if kind == SAME_BET:
+            return "y" if rng.random() < 0.8 else "n"
+        if kind in (SPLIT, DOUBLE):
+            return "y" if rng.random() < 0.1 else "n"
+        if kind == HIT:
+            return "y" if rng.random() < 0.4 else "n"
+        if kind == AGAIN:
+            self.played += 1
+            return "y" if self.played < self.rounds else "n"
+        raise ValueError(f"the bot does not know how to answer {kind}")
+
+
+class Samples(Metrics):
+    """
+    Metrics that keep every timing instead of counting them in buckets, so exact
+    percentiles can be taken, nothing is instrumented
+
+    Attributes
+    ----------
+    timings : dict
+        maps a name to an array of every timing in nanoseconds
+
+    Methods
+    -------
+    merge(other)
+        adds the timings of other Samples
+
+    percentile(name, fraction)
+        returns the timing the given fraction of timings are at or under
+    """
+
+    enabled = True
+
+    def __init__(self):
+        """
+        Parameters
+        ----------
+        No Parameters
+        """
+
+        self.timings = {}
+
+    def observe(self, name, nanoseconds):
+        """
+        keeps one timing
+        """
+
+        timings = self.timings.get(name)
+        if timings is None:
+            timings = self.timings[name] = array("q")
+        timings.append(nanoseconds)
+
+    def merge(self, other):
+        """
+        adds the timings of other Samples and returns these
+        """
+
+        for name, timings in other.timings.items():
+            self.timings.setdefault(name, array("q")).extend(timings)
+        return self
+
+    def percentile(self, name, fraction):
+        """
+        returns the timing in nanoseconds that the given fraction of the timings of a name
+        are at or under
+
+        Parameters
+        ----------
+        name : string
+            which timings
+
+        fraction : float
+            from 0 to 1, 0.5 is the median
+        """
+
+        timings = sorted(self.timings[name])
+        return timings[min(len(timings) - 1, int(fraction * len(timings)))]
+
+
+def play_table(index, players, rounds, seed, store, registry, metrics=OFF, record=None):
+    """
+    plays one table with a bot until it leaves and returns the timings of its questions
+
+    Parameters
+    ----------
+    index : int
+        which table, it picks the table's seed and its Players' names
+
+    players : int
+        how many Players sit at the table
+
+    rounds : int
+        how many rounds the table plays
+
+    seed : int
+        the seed of the run
+
+    store : BalanceStore
+        where the balances are saved
+
+    registry : PlayerRegistry
+        shared by every table
+
+    metrics : Metrics
+        where the phases of the game are timed (default is OFF)
+
+    record : string
+        where the table's session is written as a script, None to write nothing
+    """
+
+    names = [f"t{index}p{seat + 1}" for seat in range(players)]
+    prompter = Bot(Random(f"bot {seed} {index}"), names, rounds)
+    if record is not None:
+        prompter = RecordingPrompter(prompter, record, ShoeBatch.stream_seed(seed, index))
+    samples = Samples()
+    game = Game(store, SILENT, HandLog(os.devnull), metrics=metrics, registry=registry,
+                prompter=TimedPrompter(prompter, samples),
+                rng=Random(ShoeBatch.stream_seed(seed, index)))
+    try:
+        game.run()
+    finally:
+        if record is not None:
+            prompter.close()
+    return samples
+
+
+def run(tables, players=2, rounds=20, seed=0, metrics=OFF, record=None):
+    """
+    plays every table on its own thread at once and returns the merged timings, the
+    registry's counters and how long the run took
+
+    Parameters
+    ----------
+    tables : int
+        how many tables play at once
+
+    players : int
+        how many Players sit at every table (default is 2)
+
+    rounds : int
+        how many rounds every table plays (default is 20)
+
+    seed : int
+        the seed of the run (default is 0)
+
+    metrics : Metrics
+        where the phases of every game are timed (default is OFF)
+
+    record : string
+        where the session of table 0 is written as a script (default is None)
+    """
+
+    store = BalanceStore(":memory:")
+    registry = PlayerRegistry(store)
+    start = threading.Barrier(tables + 1)
+    results = [None] * tables
+    errors = []
+
+    def table(index):
+        start.wait()
+        try:
+            results[index] = play_table(index, players, rounds, seed, store, registry,
+                                        metrics, record if index == 0 else None)
+        except Exception as error:  # pylint: disable=broad-except
+            errors.append((index, error))
+
+    threads = [threading.Thread(target=table, args=(index,), name=f"table {index}")
+               for index in range(tables)]
+    for thread in threads:
+        thread.start()
+    began = time.perf_counter()
+    start.wait()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    if errors:
+        index, error = errors[0]
+        raise RuntimeError(f"{len(errors)} tables failed, table {index}: {error!r}") from error
+    samples = Samples()
+    for result in results:
+        samples.merge(result)
+    registry.close()
+    return samples, registry.stats(), elapsed
+
+
+def main():
+    """
+    runs the load generator from the terminal and prints how long every kind of question
+    took to be asked
+    """
+
+    parser = argparse.ArgumentParser(description="Play many terminal Games at once with bots")
+    parser.add_argument("--tables", type=int, default=200)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--metrics", help="time the phases of every game and write the "
+                        "metrics here, as Prometheus text when it ends in .prom")
+    parser.add_argument("--record", help="write the session of table 0 as a script that "
+                        "blackjackgame.py --script replays")
+    args = parser.parse_args()
+    metrics = Recorder() if args.metrics else OFF
+    samples, registry, elapsed = run(args.tables, args.players, args.rounds, args.seed,
+                                     metrics, args.record)
+    questions = sum(len(timings) for timings in samples.timings.values())
+    print(f"{args.tables} tables, {questions} questions in {elapsed:.2f} s, "
+          f"{questions / elapsed:.0f} questions/s")
+    print(f"{'question':<16}{'count':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}"
+          f"{'max ms':>10}")
+    for name in sorted(samples.timings):
+        line = f"{name:<16}{len(samples.timings[name]):>8}"
+        for fraction in (0.5, 0.9, 0.99, 1.0):
+            line += f"{samples.percentile(name, fraction) / 1e6:>10.3f}"
+        print(line)
+    print("registry: " + ", ".join(f"{key} {value}" for key, value in registry.items()))
+    if args.metrics:
+        metrics.dump(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
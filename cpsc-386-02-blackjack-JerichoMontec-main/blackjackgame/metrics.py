@@ -0,0 +1,255 @@
+"""
+Instrumentation for the phases of a table, how often each one ran and how long it took, kept
+in counters and histograms that can be dumped as JSON or as Prometheus text
+
+Nothing is timed unless a Recorder is given. The default Metrics hands every function back
+unchanged from instrument(), so a table without a Recorder runs the very same methods it
+would run without this module and pays nothing for it.
+
+module bisect allows a timing to find its histogram bucket
+
+module threading allows a Recorder to be shared by the table and the ledger's writer thread
+
+module time allows for use of perf_counter_ns, a monotonic clock with the finest resolution
+"""
+
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter_ns
+
+# Upper bounds of the histogram buckets in nanoseconds, from 1 microsecond to 10 seconds
+BUCKETS = tuple(int(mantissa * 10 ** exponent) for exponent in range(3, 10)
+                for mantissa in (1, 2.5, 5)) + (10 ** 10,)
+
+
+class Metrics:
+    """
+    A class used to represent instrumentation that is turned off, every method does nothing
+    and instrument() returns the function it is given
+
+    Attributes
+    ----------
+    enabled : bool
+        False when nothing is recorded, so callers can skip instrumenting at all
+
+    Methods
+    -------
+    instrument(name, function)
+        returns the function, timed under the name when recording
+
+    count(name, amount)
+        adds to a counter
+
+    observe(name, nanoseconds)
+        adds one timing to a histogram
+    """
+
+    enabled = False
+
+    def instrument(self, name, function):
+        """
+        returns the function unchanged
+
+        Parameters
+        ----------
+        name : string
+            the histogram the function would be timed in
+
+        function : callable
+            what would be timed
+        """
+
+        return function
+
+    def count(self, name, amount=1):
+        """
+        adds to a counter, does nothing here
+
+        Parameters
+        ----------
+        name : string
+            the counter
+
+        amount : int
+            how much to add (default is 1)
+        """
+
+    def observe(self, name, nanoseconds):
+        """
+        adds one timing to a histogram, does nothing here
+
+        Parameters
+        ----------
+        name : string
+            the histogram
+
+        nanoseconds : int
+            how long it took
+        """
+
+
+class Recorder(Metrics):
+    """
+    Metrics that record, every instrumented call is timed on the monotonic clock and counted
+    in a histogram of its name
+
+    Attributes
+    ----------
+    counters : dict
+        maps a counter name to its total
+
+    histograms : dict
+        maps a histogram name to its bucket counts, one for every bound in BUCKETS and one
+        for longer timings, followed by how many timings there were and their sum in
+        nanoseconds
+
+    Methods
+    -------
+    snapshot()
+        returns the counters and histograms as plain data, in seconds
+
+    to_json()
+        returns the snapshot as JSON text
+
+    to_prometheus(prefix)
+        returns the counters and histograms in the Prometheus text format
+
+    dump(path)
+        writes the metrics to a file, as Prometheus text when the name ends in .prom
+    """
+
+    enabled = True
+
+    def __init__(self):
+        """
+        Parameters
+        ----------
+        No Parameters
+        """
+
+        self.counters = {}
+        self.histograms = {}
+        self.lock = Lock()
+
+    def instrument(self, name, function):
+        """
+        returns a function that calls the given one and times it under the name
+
+        Parameters
+        ----------
+        name : string
+            the histogram the calls are timed in
+
+        function : callable
+            what is timed
+        """
+
+        observe = self.observe
+
+        def timed(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                observe(name, perf_counter_ns() - start)
+
+        timed.__wrapped__ = function
+        return timed
+
+    def count(self, name, amount=1):
+        """
+        adds to a counter, starting it at 0 the first time
+        """
+
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, nanoseconds):
+        """
+        adds one timing to the histogram of the name
+        """
+
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = [0] * (len(BUCKETS) + 3)
+            histogram[bisect_left(BUCKETS, nanoseconds)] += 1
+            histogram[-2] += 1
+            histogram[-1] += nanoseconds
+
+    def snapshot(self):
+        """
+        returns the counters and histograms as plain data, every histogram has its count,
+        its sum in seconds and how many timings fell at or under every bucket bound
+
+        Returns
+        -------
+        dict
+            {"counters": {name: total}, "histograms": {name: {"count", "sum", "buckets"}}}
+        """
+
+        with self.lock:
+            counters = dict(self.counters)
+            histograms = {name: list(values) for name, values in self.histograms.items()}
+        phases = {}
+        for name, values in sorted(histograms.items()):
+            buckets = {}
+            total = 0
+            for bound, hits in zip(BUCKETS, values):
+                total += hits
+                buckets[f"{bound / 1e9:g}"] = total
+            buckets["+Inf"] = values[-2]
+            phases[name] = {"count": values[-2], "sum": values[-1] / 1e9, "buckets": buckets}
+        return {"counters": dict(sorted(counters.items())), "histograms": phases}
+
+    def to_json(self):
+        """
+        returns the snapshot as JSON text
+        """
+
+        import json  # pylint: disable=import-outside-toplevel
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix="blackjack"):
+        """
+        returns the counters and histograms in the Prometheus text format, every counter
+        is its own metric and every histogram is one phase of {prefix}_phase_seconds
+
+        Parameters
+        ----------
+        prefix : string
+            what every metric name starts with (default is "blackjack")
+        """
+
+        snapshot = self.snapshot()
+        lines = []
+        for name, total in snapshot["counters"].items():
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {total}")
+        if snapshot["histograms"]:
+            lines.append(f"# TYPE {prefix}_phase_seconds histogram")
+        for name, histogram in snapshot["histograms"].items():
+            for bound, total in histogram["buckets"].items():
+                lines.append(f'{prefix}_phase_seconds_bucket{{phase="{name}",le="{bound}"}} '
+                             f"{total}")
+            lines.append(f'{prefix}_phase_seconds_sum{{phase="{name}"}} {histogram["sum"]:.9f}')
+            lines.append(f'{prefix}_phase_seconds_count{{phase="{name}"}} {histogram["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """
+        writes the metrics to a file, as Prometheus text when the name ends in .prom and as
+        JSON otherwise
+
+        Parameters
+        ----------
+        path : string
+            where the metrics are written, the file is replaced
+        """
+
+        text = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        with open(path, "w", encoding="utf-8") as metrics:
+            metrics.write(text)
+
+
+OFF = Metrics()
@@ -1,11 +1,16 @@
 """
-module dictionary allows to use Dict function to map values
+module deck allows for use of the tables which turn a card code into its value, rank and suit
+symbol
 
-module time allows for delaying the terminal output
+module hand allows for use of the Hand class which holds the cards and bet of one hand, and
+the lookup tables that keep its value
+
+module render allows for use of the terminal Renderer which every Player starts with
 """
 
-from time import sleep
-from .dictionary import Dict
+from .deck import CODE_VALUES, CODE_RANKS, CODE_GLYPHS, show
+from .hand import Hand, NEXT, TOTAL, EMPTY
+from .render import TERMINAL
 
 
 class Player:
@@ -20,11 +25,21 @@ class Player:
     balance : int
         Player's balance
 
+    hands : list
+        every Hand the Player holds this round, more than one after a split or when the
+        Player bets on more than one spot
+
+    hand : Hand
+        the Hand being played, draw_card, check_value and the bets work on it
+
     current_bet : int
-        How much the Player is betting at any current time (default is 0)
+        How much the Player is betting on the Hand being played (default is 0)
 
-    current_hand : list
-        Player's current cards
+    current_hand : bytearray
+        the cards of the Hand being played, one card code per byte
+
+    state : int
+        the state of the Hand being played in the hand lookup tables (default is EMPTY)
 
     is_turn : bool
         True when it's the Player's turn (default is False)
@@ -33,12 +48,25 @@ class Player:
         Always False for Player classes
 
     doubled_down : bool
-        True when the Player has doubled down (default is False)
+        True when the Player has doubled down on the Hand being played (default is False)
+
+    renderer : Renderer
+        where the Player's messages go and how long to pause after them (default is the
+        terminal), headless tables give every Player a silent Renderer
 
     Methods
     -------
+    announce(message, delay)
+        shows a message through the Player's renderer
+
     empty_hand()
-        clears the Player's hand
+        clears the Player's hands and keeps only the first one
+
+    add_hand(bet)
+        bets on one more spot, the Player plays one more Hand
+
+    split()
+        splits the pair in the Hand being played into two Hands
 
     add_balance(winnings)
         adds money to the Players balance
@@ -59,7 +87,7 @@ class Player:
         outputs the Player's cards on the terminal
 
     check_value()
-        adds up the values of all the cards in a hand
+        returns the value of the hand
 
     start_turn()
         starts a Player's turn
@@ -70,16 +98,22 @@ class Player:
     stand()
         the Player is standing and will draw no more cards
 
-    win_hand()
+    win_hand(winnings)
         adds money to the Player's balance and displays win message in terminal
 
     lose_hand()
         displays lose message in terminal
 
+    rebuy()
+        gives the Player a donation once they have lost everything
+
     tie_hand()
         adds bet amount to Player's balance and displays tie message
     """
 
+    __slots__ = ("name", "balance", "hands", "hand", "spares", "is_turn", "is_dealer",
+                 "renderer")
+
     def __init__(self, name, balance):
         """
         Parameters
@@ -92,18 +126,140 @@ class Player:
 
         self.name = name
         self.balance = balance
-        self.current_bet = 0
-        self.current_hand = []
+        self.hand = Hand()
+        self.hands = [self.hand]
+        self.spares = []
         self.is_turn = False
         self.is_dealer = False
-        self.doubled_down = False
+        self.renderer = TERMINAL
+
+    @property
+    def current_hand(self):
+        """
+        the cards of the Hand being played
+        """
+
+        return self.hand.cards
+
+    @property
+    def state(self):
+        """
+        the state of the Hand being played
+        """
+
+        return self.hand.state
+
+    @property
+    def current_bet(self):
+        """
+        how much is bet on the Hand being played
+        """
+
+        return self.hand.bet
+
+    @current_bet.setter
+    def current_bet(self, bet):
+        self.hand.bet = bet
+
+    @property
+    def doubled_down(self):
+        """
+        True when the Hand being played has been doubled down
+        """
+
+        return self.hand.doubled_down
+
+    @doubled_down.setter
+    def doubled_down(self, doubled):
+        self.hand.doubled_down = doubled
+
+    def __setstate__(self, state):
+        """
+        restores a pickled Player, including the ones pickled before Player had slots
+
+        Parameters
+        ----------
+        state : dict or tuple
+            the attributes of the pickled Player
+        """
+
+        if isinstance(state, tuple):
+            state = state[1]
+        type(self).__init__(self, state["name"], state["balance"])
+        if "hands" in state:
+            self.hands = state["hands"]
+            self.hand = state["hand"]
+        for key, value in state.items():
+            if key in ("current_hand", "state", "hands", "hand", "spares", "renderer") \
+                    or not hasattr(type(self), key):
+                continue
+            setattr(self, key, value)
+
+    def announce(self, message, delay=1.000):
+        """
+        shows a message through the Player's renderer
+
+        Parameters
+        ----------
+        message : string
+            what to print
+
+        delay : float
+            how long to pause after printing
+        """
+
+        self.renderer.show(message, delay)
 
     def empty_hand(self):
         """
-        empties the list current_hand
+        empties every Hand and keeps only the first one, the others are kept aside to be
+        used again
+        """
+
+        hands = self.hands
+        if len(hands) > 1:
+            self.spares.extend(hands[1:])
+            del hands[1:]
+        hand = self.hand = hands[0]
+        hand.cards.clear()
+        hand.decisions.clear()
+        hand.state = EMPTY
+        hand.is_split = False
+
+    def add_hand(self, bet):
+        """
+        bets on one more spot if the Player has enough money, returns True when the Hand
+        was added
+
+        Parameters
+        ----------
+        bet : int
+            how much money the Player is betting on the new spot
+        """
+
+        if bet <= 0 or bet > self.balance:
+            return False
+        hand = self.spares.pop() if self.spares else Hand()
+        hand.clear()
+        hand.bet = bet
+        hand.doubled_down = False
+        self.subtract_balance(bet)
+        self.hands.append(hand)
+        return True
+
+    def split(self):
+        """
+        splits the pair in the Hand being played if the Player has enough money to bet the
+        same again, the new Hand is played right after it, returns True when it was split
         """
 
-        self.current_hand = []
+        hand = self.hand
+        if not hand.can_split() or hand.bet > self.balance:
+            return False
+        self.subtract_balance(hand.bet)
+        other = hand.split(self.spares.pop() if self.spares else None)
+        self.hands.insert(self.hands.index(hand) + 1, other)
+        return True
 
     def add_balance(self, winnings):
         """
@@ -140,19 +296,17 @@ class Player:
         """
 
         if bet < 0:  # Negative Bet
-            print("Bet amount out of range.")
-            sleep(1.000)
+            self.announce("Bet amount out of range.")
             self.is_turn = True
         elif bet > self.balance:  # Bet too high
-            print("Not enough funds.")
-            sleep(1.000)
+            self.announce("Not enough funds.")
             self.is_turn = True
         elif bet == 0:  # Stop playing
-            print("Leaving Table...")
-            sleep(1.000)
+            self.announce("Leaving Table...")
+            self.hand.bet = 0
             self.is_turn = False
         else:
-            self.current_bet = bet
+            self.hand.bet = bet
             self.subtract_balance(bet)
             self.is_turn = False
 
@@ -161,54 +315,52 @@ class Player:
         changes value of current_bet if the player has enough money to double down
         """
 
-        if self.current_bet <= self.balance:
-            self.subtract_balance(self.current_bet)
-            self.current_bet = self.current_bet * 2
-            self.doubled_down = True
+        hand = self.hand
+        if hand.bet <= self.balance:
+            self.subtract_balance(hand.bet)
+            hand.bet = hand.bet * 2
+            hand.doubled_down = True
         else:
-            self.doubled_down = False
+            hand.doubled_down = False
 
     def draw_card(self, deck):
         """
-        adds a card to the Player's current_hand
+        adds a card to the Hand being played
 
         Parameters
         ----------
-        deck : Deck
-            takes a Card from the Deck made in runtime
+        deck : Deck or Shoe
+            takes a Card from the Deck or Shoe made in runtime
         """
 
-        self.current_hand.append(deck.cards[0])
-        deck.discards.append(deck.cards[0])
-        deck.cards.pop(0)
+        hand = self.hand
+        code = deck.draw_code()
+        hand.cards.append(code)
+        hand.state = NEXT[hand.state * 11 + CODE_VALUES[code]]
 
     def print_cards(self):
         """
-        prints cards from current_hand onto the terminal
+        prints the cards of the Hand being played onto the terminal
         """
 
-        print(f"{self.name}'s cards: ")
-        for _, card in enumerate(self.current_hand):
-            print(card.rank, Dict.get(card.suit))
-            sleep(0.500)
+        renderer = self.renderer
+        if not renderer.enabled:
+            return
+        if len(self.hands) > 1:
+            number = self.hands.index(self.hand) + 1
+            renderer.show(f"{self.name}'s cards, hand {number}: ", 0)
+        else:
+            renderer.show(f"{self.name}'s cards: ", 0)
+        for _, code in enumerate(self.hand.cards):
+            renderer.show(f"{CODE_RANKS[code]} {CODE_GLYPHS[code]}", 0.500)
 
     def check_value(self):
         """
-        adds values of all the cards in current_hand and returns the total
+        returns the value of the Hand being played, aces count as 11 unless that busts the
+        hand and any hand over 21 is 22
         """
 
-        value = 0
-        number_of_aces = 0
-        for _, card in enumerate(self.current_hand):
-            if card.rank == "Ace":
-                value = value + 10
-                number_of_aces = number_of_aces + 1
-            value = value + Dict.get(card.rank)
-            for _ in range(number_of_aces):
-                if value > 21:
-                    value = value - 10
-                    number_of_aces = number_of_aces - 1
-        return value
+        return TOTAL[self.hand.state]
 
     def start_turn(self):
         """
@@ -216,8 +368,7 @@ class Player:
         """
 
         self.is_turn = True
-        print(f"It is {self.name}'s turn")
-        sleep(1.000)
+        self.announce(f"It is {self.name}'s turn")
 
     def end_turn(self):
         """
@@ -231,42 +382,59 @@ class Player:
         prints that the Player is standing and ends their turn
         """
 
-        print(f"{self.name} stands and ends their turn")
-        sleep(1.000)
+        self.announce(f"{self.name} stands and ends their turn")
         self.end_turn()
 
-    def win_hand(self):
+    def win_hand(self, winnings=None):
         """
-        adds money to Player's balance and prints winning message
+        gives back the bet of the Hand being played with the winnings and prints winning
+        message
+
+        Parameters
+        ----------
+        winnings : int
+            how much the Hand wins on top of its bet (default is the bet, 1:1)
         """
 
-        self.add_balance(2 * self.current_bet)
-        print(f"{self.name} wins with their hand and wins {self.current_bet}.")
-        sleep(1.000)
+        bet = self.hand.bet
+        if winnings is None:
+            winnings = bet
+        self.add_balance(bet + winnings)
+        self.announce(f"{self.name} wins with their hand and wins {winnings}.")
 
     def lose_hand(self):
         """
-        prints losing message and gives donation if negative
+        prints losing message, the bet was already taken from the balance
+        """
+
+        self.announce(f"{self.name} loses with their hand and loses {self.hand.bet}.")
+
+    def rebuy(self):
         """
+        gives donation if the balance is gone, called once every hand of the round is
+        settled so a win on a later hand counts first, returns how much was donated
 
-        print(f"{self.name} loses with their hand and loses {self.current_bet}.")
-        sleep(1.000)
+        Returns
+        -------
+        int
+            the donation, 0 when the Player still has money
+        """
 
         if self.balance <= 0:
+            donation = 10000 - self.balance
             self.balance = 10000
-            print("Uh oh, looks like we took all your money!")
-            sleep(1.000)
-            print("But it seems like someone donated $10000 to you :D")
-            sleep(1.000)
+            self.announce("Uh oh, looks like we took all your money!")
+            self.announce("But it seems like someone donated $10000 to you :D")
+            return donation
+        return 0
 
     def tie_hand(self):
         """
         adds money to Player's balance equal to how much they bet and prints winning message
         """
 
-        self.add_balance(self.current_bet)
-        print(f"{self.name} ties with the dealer.")
-        sleep(1.000)
+        self.add_balance(self.hand.bet)
+        self.announce(f"{self.name} ties with the dealer.")
 
 
 class Dealer(Player):
@@ -284,7 +452,7 @@ class Dealer(Player):
     current_bet : int
         always 0
 
-    current_hand : list
+    current_hand : bytearray
         Dealer's current cards
 
     is_turn : bool
@@ -305,6 +473,8 @@ class Dealer(Player):
         prints the Dealer's cards
     """
 
+    __slots__ = ("is_hidden",)
+
     def __init__(self, name, balance):
         """
         Parameters
@@ -325,14 +495,13 @@ class Dealer(Player):
         prints Dealer's cards into the terminal, and hides the second card if is_hidden is True
         """
 
+        renderer = self.renderer
+        if not renderer.enabled:
+            return
         if self.is_hidden:
-            print(
-                f"Dealer's cards: {self.current_hand[0].rank}"
-                f"{Dict.get(self.current_hand[0].suit)} **")
-            sleep(1.000)
+            renderer.show(f"Dealer's cards: {show(self.current_hand[0])} **")
 
         else:
-            print("Dealer's cards: ")
-            for _, card in enumerate(self.current_hand):
-                print(card.rank, Dict.get(card.suit))
-                sleep(0.200)
+            renderer.show("Dealer's cards: ", 0)
+            for _, code in enumerate(self.current_hand):
+                renderer.show(f"{CODE_RANKS[code]} {CODE_GLYPHS[code]}", 0.200)
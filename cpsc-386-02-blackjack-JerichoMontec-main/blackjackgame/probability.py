@@ -0,0 +1,301 @@
+"""
+Exact probabilities for the Dealer's final hand and the expected value of standing, hitting
+and doubling down, for whatever cards are left in the shoe
+
+What is left in the shoe is a count of cards for every value, Ace first and the 10 valued
+cards last. Inside the recursion the ten counts are packed into one integer, nine bits per
+value so the 256 ten valued cards of 16 decks fit, and a subproblem is keyed by two integers
+and kept in a bounded LRU cache. A Dealer hand that has finished is added up where it is drawn
+instead of being looked up, so only the hands the Dealer still draws on take up the cache.
+
+The Dealer's hole card is not known to the Player and the Dealer never peeks, so it is drawn
+from what is left the same as any later card.
+
+module functools allows for use of lru_cache which remembers the subproblems
+
+module deck allows for use of the Deck ranks which say how many cards of every value a deck
+has
+
+module dictionary allows use for Dict which maps ranks to values
+
+module engine allows for use of DEALER_STANDS, the total the Dealer draws to
+
+module hand allows for use of the hand states and their tables
+"""
+
+from functools import lru_cache
+from .deck import Deck
+from .dictionary import Dict
+from .engine import DEALER_STANDS
+from .hand import NEXT, TOTAL, BUST, EMPTY
+
+CACHE_SIZE = 1 << 18
+
+# The Dealer's subproblems are shared by every up card, the 8 deck table has about 540000
+DEALER_CACHE_SIZE = 1 << 20
+
+# Bits of every count in a packed integer, enough for the ten valued cards of 16 decks
+BITS = 9
+MASK = (1 << BITS) - 1
+OUTCOMES = (17, 18, 19, 20, 21, "bust")
+
+# Cards of every value in one deck, Ace first
+DECK_COUNTS = tuple(sum(len(Deck.suits) for rank in Deck.ranks if Dict[rank] == value)
+                    for value in range(1, 11))
+
+
+def pack(counts):
+    """
+    returns the ten counts packed into one integer, BITS bits per value, raises
+    ValueError for a count that does not fit
+
+    Parameters
+    ----------
+    counts : tuple
+        how many cards of every value are left, Ace first
+    """
+
+    packed = 0
+    for index, count in enumerate(counts):
+        if not 0 <= count <= MASK:
+            raise ValueError(f"every count must be from 0 to {MASK}, not {count!r}")
+        packed |= count << (BITS * index)
+    return packed
+
+
+def unpack(packed):
+    """
+    returns the ten counts of a packed integer
+    """
+
+    return tuple((packed >> (BITS * index)) & MASK for index in range(10))
+
+
+def full_shoe(decks=8):
+    """
+    returns the counts of a shoe of the given number of decks
+
+    Parameters
+    ----------
+    decks : int
+        how many decks make up the shoe (default is 8)
+    """
+
+    if not 1 <= decks <= 16:
+        raise ValueError(f"decks must be from 1 to 16, not {decks!r}")
+    return tuple(count * decks for count in DECK_COUNTS)
+
+
+def remaining(shoe):
+    """
+    returns the counts of every card a Shoe has not dealt yet, read from the rank counts
+    the Shoe keeps up to date
+
+    Parameters
+    ----------
+    shoe : Shoe
+        the Shoe, every card from its cursor on is left
+    """
+
+    ranks = shoe.rank_counts
+    return tuple(ranks[:9]) + (sum(ranks[9:]),)
+
+
+def remove(counts, *values):
+    """
+    returns the counts after the cards of the given values have been taken out
+
+    Parameters
+    ----------
+    counts : tuple
+        how many cards of every value are left, Ace first
+
+    values : int
+        the values of the cards taken out, 1 for an Ace
+    """
+
+    counts = list(counts)
+    for value in values:
+        counts[value - 1] -= 1
+    return tuple(counts)
+
+
+def _outcome(state):
+    """
+    returns the index in OUTCOMES of a final Dealer hand
+    """
+
+    return TOTAL[state] - 17
+
+
+@lru_cache(maxsize=DEALER_CACHE_SIZE)
+def _dealer(state, packed):
+    """
+    returns the probability of every OUTCOME for a Dealer hand in the given state drawing
+    from the packed counts
+    """
+
+    if TOTAL[state] >= DEALER_STANDS:
+        result = [0.0] * 6
+        result[_outcome(state)] = 1.0
+        return tuple(result)
+    counts = unpack(packed)
+    left = sum(counts)
+    result = [0.0] * 6
+    for index, count in enumerate(counts):
+        if count == 0:
+            continue
+        chance = count / left
+        after = NEXT[state * 11 + index + 1]
+        if TOTAL[after] >= DEALER_STANDS:  # Finished, nothing to look up
+            result[_outcome(after)] += chance
+            continue
+        after = _dealer(after, packed - (1 << (BITS * index)))
+        for outcome in range(6):
+            result[outcome] += chance * after[outcome]
+    return tuple(result)
+
+
+def dealer_probabilities(up_value, counts):
+    """
+    returns the probability of every final Dealer hand as a dictionary keyed by OUTCOMES
+
+    Parameters
+    ----------
+    up_value : int
+        the value of the Dealer's up card, 1 for an Ace
+
+    counts : tuple
+        how many cards of every value are left, not counting the up card
+    """
+
+    state = NEXT[EMPTY * 11 + up_value]
+    return dict(zip(OUTCOMES, _dealer(state, pack(counts))))
+
+
+def _stand(total, dealer):
+    """
+    returns the expected value of standing on a total against the Dealer's outcomes
+    """
+
+    if total > 21:
+        return -1.0
+    value = dealer[5]
+    for index in range(5):
+        if 17 + index < total:
+            value += dealer[index]
+        elif 17 + index > total:
+            value -= dealer[index]
+    return value
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _stand_ev(state, up_state, packed):
+    """
+    returns the expected value of standing with a hand in the given state
+    """
+
+    if state == BUST:
+        return -1.0
+    return _stand(TOTAL[state], _dealer(up_state, packed))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _hit_ev(state, up_state, packed):
+    """
+    returns the expected value of taking one card and then playing the best of hitting
+    and standing
+    """
+
+    counts = unpack(packed)
+    left = sum(counts)
+    value = 0.0
+    for index, count in enumerate(counts):
+        if count == 0:
+            continue
+        after = NEXT[state * 11 + index + 1]
+        rest = packed - (1 << (BITS * index))
+        if after == BUST:
+            value -= count / left
+        elif TOTAL[after] == 21:
+            value += count / left * _stand_ev(after, up_state, rest)
+        else:
+            value += count / left * max(_stand_ev(after, up_state, rest),
+                                        _hit_ev(after, up_state, rest))
+    return value
+
+
+def _double_ev(state, up_state, packed):
+    """
+    returns the expected value of doubling down, one card and twice the bet
+    """
+
+    counts = unpack(packed)
+    left = sum(counts)
+    value = 0.0
+    for index, count in enumerate(counts):
+        if count:
+            after = NEXT[state * 11 + index + 1]
+            value += count / left * _stand_ev(after, up_state, packed - (1 << (BITS * index)))
+    return 2 * value
+
+
+def hand_ev(values, up_value, counts):
+    """
+    returns the expected value in bets of standing, hitting and doubling down with a hand
+    against the Dealer's up card, hitting plays on as well as it can without doubling
+
+    Parameters
+    ----------
+    values : list
+        the values of the Player's cards, 1 for an Ace
+
+    up_value : int
+        the value of the Dealer's up card, 1 for an Ace
+
+    counts : tuple
+        how many cards of every value are left, not counting the Player's cards or the
+        up card
+
+    Returns
+    -------
+    dict
+        the expected value of "stand", "hit" and "double"
+    """
+
+    state = EMPTY
+    for value in values:
+        state = NEXT[state * 11 + value]
+    up_state = NEXT[EMPTY * 11 + up_value]
+    packed = pack(counts)
+    return {
+        "stand": _stand_ev(state, up_state, packed),
+        "hit": _hit_ev(state, up_state, packed),
+        "double": _double_ev(state, up_state, packed),
+    }
+
+
+def cache_info():
+    """
+    returns the lru_cache statistics of the Dealer, stand and hit subproblems
+    """
+
+    return {"dealer": _dealer.cache_info(), "stand": _stand_ev.cache_info(),
+            "hit": _hit_ev.cache_info()}
+
+
+def clear_cache(dealer=True):
+    """
+    empties every cache of subproblems
+
+    Parameters
+    ----------
+    dealer : bool
+        False keeps the Dealer's subproblems, they do not depend on the up card so the
+        next up card asks for many of them again (default is True)
+    """
+
+    if dealer:
+        _dealer.cache_clear()
+    _stand_ev.cache_clear()
+    _hit_ev.cache_clear()
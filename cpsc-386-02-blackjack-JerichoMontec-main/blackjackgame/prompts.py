@@ -0,0 +1,285 @@
+"""
+Prompters answer the questions the terminal game asks, so the same Game can be played from
+the keyboard, replayed from a script or driven by a load generator
+
+Every question has a kind, so a script or a bot knows what it is answering and the time the
+game took to get to every question can be measured per kind. A session recorded together
+with its seed replays exactly, the shoe is shuffled by the same generator and every question
+gets the same answer.
+
+A script is a text file with one answer per line. Lines starting with "#" are not answers,
+"# seed <seed>" gives the seed the session was shuffled with and "# balance <name>
+<balance>" the balance a returning Player sat down with. A Player without a balance line was
+new and sits down new again when the script is replayed.
+
+module time allows for use of perf_counter_ns which times how long the game took to ask
+"""
+
+from time import perf_counter_ns
+
+# Kinds of questions the game asks
+PLAYERS = "players"
+NAME = "name"
+BET = "bet"
+SAME_BET = "same_bet"
+SPLIT = "split"
+DOUBLE = "double"
+HIT = "hit"
+AGAIN = "again"
+
+
+class Prompter:
+    """
+    A class used to represent whoever answers the game's questions, this one asks the
+    person sitting at the terminal
+
+    Methods
+    -------
+    ask(kind, text)
+        returns the answer to one question
+
+    joined(player, found)
+        told about every Player that sits down
+    """
+
+    def ask(self, kind, text):
+        """
+        returns the answer typed at the terminal
+
+        Parameters
+        ----------
+        kind : string
+            what the question is, one of the kinds above
+
+        text : string
+            the question as it is shown
+        """
+
+        return input(text)
+
+    def joined(self, player, found):
+        """
+        told about every Player that sits down with the balance they sit down with, does
+        nothing here
+
+        Parameters
+        ----------
+        player : Player
+            the Player sitting down
+
+        found : bool
+            True when the name had a balance before, False for a new Player
+        """
+
+
+class ScriptedPrompter(Prompter):
+    """
+    A Prompter that answers from a list, a file or a generator of answers in order
+
+    Attributes
+    ----------
+    answers : iterator
+        the answers left
+
+    echo : bool
+        True to print every question with its answer, the way the terminal shows them
+
+    seed : int
+        the seed the session was shuffled with, None when the script does not say
+
+    balances : dict
+        maps a name to the balance it sat down with, for the returning Players the script
+        gives
+
+    asked : int
+        how many questions have been answered
+    """
+
+    def __init__(self, answers, echo=False, seed=None, balances=None):
+        """
+        Parameters
+        ----------
+        answers : iterable
+            the answers in the order the questions are asked
+
+        echo : bool
+            True to print every question with its answer (default is False)
+
+        seed : int
+            the seed the session was shuffled with (default is None)
+
+        balances : dict
+            the balances the Players sat down with (default is None, none given)
+        """
+
+        self.answers = iter(answers)
+        self.echo = echo
+        self.seed = seed
+        self.balances = balances if balances is not None else {}
+        self.asked = 0
+
+    def ask(self, kind, text):
+        """
+        returns the next answer, raises EOFError once the script has run out the way
+        input does at the end of the terminal's input
+        """
+
+        answer = next(self.answers, None)
+        if answer is None:
+            raise EOFError(f"the script ran out after {self.asked} answers, at: {text}")
+        self.asked += 1
+        if self.echo:
+            print(text + answer)
+        return answer
+
+
+def load_script(path, echo=False):
+    """
+    returns a ScriptedPrompter that answers from a script file, with the seed and the
+    balances the script gives
+
+    Parameters
+    ----------
+    path : string
+        the script, one answer per line
+
+    echo : bool
+        True to print every question with its answer (default is False)
+    """
+
+    answers = []
+    seed = None
+    balances = {}
+    with open(path, encoding="utf-8") as script:
+        for line in script:
+            line = line.rstrip("\n")
+            if not line.startswith("#"):
+                answers.append(line)
+                continue
+            words = line[1:].split()
+            if len(words) == 2 and words[0] == "seed":
+                seed = int(words[1])
+            elif len(words) >= 3 and words[0] == "balance":
+                balances[" ".join(words[1:-1])] = int(words[-1])
+    return ScriptedPrompter(answers, echo, seed, balances)
+
+
+class RecordingPrompter(Prompter):
+    """
+    A Prompter that writes every answer another Prompter gives to a script, so the session
+    can be replayed with load_script
+
+    Attributes
+    ----------
+    prompter : Prompter
+        who answers the questions
+
+    script : file
+        where the answers are written, every line is written out as soon as it is answered
+        so a session that crashes can still be replayed
+
+    Methods
+    -------
+    close()
+        closes the script
+    """
+
+    def __init__(self, prompter, path, seed):
+        """
+        Parameters
+        ----------
+        prompter : Prompter
+            who answers the questions
+
+        path : string
+            where the script is written, it is replaced
+
+        seed : int
+            the seed the session is shuffled with, written at the top of the script
+        """
+
+        self.prompter = prompter
+        self.script = open(path, "w", encoding="utf-8")  # pylint: disable=consider-using-with
+        self.script.write(f"# seed {seed}\n")
+        self.script.flush()
+
+    def ask(self, kind, text):
+        """
+        returns the other Prompter's answer and writes it to the script
+        """
+
+        answer = self.prompter.ask(kind, text)
+        self.script.write(answer + "\n")
+        self.script.flush()
+        return answer
+
+    def joined(self, player, found):
+        """
+        writes the balance a returning Player sat down with to the script, nothing is
+        written for a new Player so it is new again when the script is replayed
+        """
+
+        self.prompter.joined(player, found)
+        if found:
+            self.script.write(f"# balance {player.name} {player.balance}\n")
+            self.script.flush()
+
+    def close(self):
+        """
+        closes the script
+        """
+
+        self.script.close()
+
+
+class TimedPrompter(Prompter):
+    """
+    A Prompter that times how long the game took to get to every question since the last
+    answer and adds it to Metrics as prompt_<kind>
+
+    Attributes
+    ----------
+    prompter : Prompter
+        who answers the questions
+
+    metrics : Metrics
+        where the timings go
+
+    answered_at : int
+        perf_counter_ns when the last question was answered
+    """
+
+    def __init__(self, prompter, metrics):
+        """
+        Parameters
+        ----------
+        prompter : Prompter
+            who answers the questions
+
+        metrics : Metrics
+            where the timings go, the first question is timed from here
+        """
+
+        self.prompter = prompter
+        self.metrics = metrics
+        self.answered_at = perf_counter_ns()
+
+    def ask(self, kind, text):
+        """
+        times the game since the last answer and returns the other Prompter's answer
+        """
+
+        self.metrics.observe("prompt_" + kind, perf_counter_ns() - self.answered_at)
+        answer = self.prompter.ask(kind, text)
+        self.answered_at = perf_counter_ns()
+        return answer
+
+    def joined(self, player, found):
+        """
+        tells the other Prompter about the Player
+        """
+
+        self.prompter.joined(player, found)
+
+
+KEYBOARD = Prompter()
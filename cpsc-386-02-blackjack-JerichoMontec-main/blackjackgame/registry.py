@@ -0,0 +1,269 @@
+"""
+A registry of Players in front of the BalanceStore, the Players seen last are kept in memory
+so a returning Player is found without reading the store
+
+The registry holds at most capacity Players that are not sitting at a table. When it is
+full the one used longest ago is let go, and its balance is written to the store then if it
+changed while it was held. A Player sitting at a table is never let go, so a seat always
+plays the one Player object of its name.
+
+Joins of the same name from different threads at the same time read the store once, every
+other join waits for that read and gets the same Player.
+
+module collections allows for use of OrderedDict which keeps the Players in the order they
+were used
+
+module threading allows the registry to be shared by threads, the store is read without
+holding up joins of Players already in memory
+
+module player allows for use of Player class which the registry holds
+"""
+
+from collections import OrderedDict
+from threading import Lock, Event
+from .player import Player
+
+# The balance a name that has never been saved starts with
+STARTING_BALANCE = 10000
+
+
+class PlayerRegistry:
+    """
+    A class used to represent the Players held in memory in front of the BalanceStore,
+    the least recently used one that is not seated is let go when it is full
+
+    Attributes
+    ----------
+    store : BalanceStore
+        where the balances are read from and written back to
+
+    capacity : int
+        how many Players are held, seated Players can take it over the capacity
+
+    players : OrderedDict
+        maps a name to its Player, the least recently used first
+
+    seats : dict
+        maps a name to how many seats are holding its Player
+
+    dirty : set
+        the names whose balance may have changed since it was written
+
+    hits : int
+        how many joins found the Player in memory
+
+    misses : int
+        how many joins read the store
+
+    coalesced : int
+        how many joins waited for another join of the same name to read the store
+
+    evictions : int
+        how many Players have been let go
+
+    writes : int
+        how many balances have been written back
+
+    Methods
+    -------
+    join(name, balance)
+        returns the Player of a name and whether it had been saved, and seats it
+
+    leave(players)
+        gives Players back once they stand up, their balances are written back later
+
+    flush()
+        writes back every balance that may have changed
+
+    close()
+        flushes the registry
+
+    stats()
+        returns the counters as a dictionary
+    """
+
+    def __init__(self, store, capacity=1024):
+        """
+        Parameters
+        ----------
+        store : BalanceStore
+            where the balances are read from and written back to
+
+        capacity : int
+            how many Players are held in memory (default is 1024)
+        """
+
+        self.store = store
+        self.capacity = capacity
+        self.players = OrderedDict()
+        self.seats = {}
+        self.dirty = set()
+        self.loading = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.writes = 0
+        self.lock = Lock()
+        self.store_lock = Lock()
+
+    def __len__(self):
+        """
+        returns how many Players are held
+        """
+
+        return len(self.players)
+
+    def __contains__(self, name):
+        """
+        returns True when the Player of the name is held
+        """
+
+        return name in self.players
+
+    def is_seated(self, name):
+        """
+        returns True when a seat is holding the Player of the name
+        """
+
+        return name in self.seats
+
+    def join(self, name, balance=STARTING_BALANCE):
+        """
+        returns the Player of a name and seats it, from memory when it is held and from the
+        store otherwise, a name that has never been saved gets a new Player
+
+        Parameters
+        ----------
+        name : string
+            the Player's name
+
+        balance : int
+            the balance of a new Player (default is 10000)
+
+        Returns
+        -------
+        tuple
+            the Player and True when the name had a balance before this join, saved or
+            held in memory
+        """
+
+        while True:
+            with self.lock:
+                player = self.players.get(name)
+                if player is not None:
+                    self.players.move_to_end(name)
+                    self.seats[name] = self.seats.get(name, 0) + 1
+                    self.hits += 1
+                    return player, True
+                loading = self.loading.get(name)
+                if loading is None:
+                    loading = self.loading[name] = Event()
+                    self.misses += 1
+                    break
+                self.coalesced += 1
+            loading.wait()
+
+        try:
+            with self.store_lock:
+                saved = self.store.get(name)
+        except BaseException:
+            with self.lock:
+                del self.loading[name]
+            loading.set()
+            raise
+        player = Player(name, saved if saved is not None else balance)
+        with self.lock:
+            self.players[name] = player
+            self.seats[name] = self.seats.get(name, 0) + 1
+            if saved is None:
+                self.dirty.add(name)
+            del self.loading[name]
+            self._evict()
+        loading.set()
+        return player, saved is not None
+
+    def leave(self, players):
+        """
+        gives Players back once they stand up, they can be let go from now on and their
+        balances are written when they are or when the registry is flushed
+
+        Parameters
+        ----------
+        players : list
+            the Players standing up
+        """
+
+        with self.lock:
+            for player in players:
+                name = player.name
+                seats = self.seats.get(name, 0) - 1
+                if seats > 0:
+                    self.seats[name] = seats
+                else:
+                    self.seats.pop(name, None)
+                self.dirty.add(name)
+            self._evict()
+
+    def _evict(self):
+        """
+        lets go of the least recently used Players that are not seated until no more than
+        capacity are held and writes back the ones that changed, called holding the lock
+        """
+
+        players = self.players
+        written = []
+        while len(players) > self.capacity:
+            for name in players:
+                if name not in self.seats:
+                    break
+            else:
+                break  # Every Player held is seated
+            player = players.pop(name)
+            self.evictions += 1
+            if name in self.dirty:
+                self.dirty.discard(name)
+                written.append(player)
+        if written:
+            with self.store_lock:
+                self.store.put_many(written)
+            self.writes += len(written)
+
+    def flush(self):
+        """
+        writes back the balance of every Player that changed or is still seated, in one
+        transaction
+        """
+
+        with self.lock:
+            names = self.dirty | set(self.seats)
+            written = [self.players[name] for name in names if name in self.players]
+            self.dirty.clear()
+            if written:
+                with self.store_lock:
+                    self.store.put_many(written)
+                self.writes += len(written)
+
+    def close(self):
+        """
+        writes back every balance that may have changed
+        """
+
+        self.flush()
+
+    def stats(self):
+        """
+        returns the counters and how many Players are held as a dictionary
+        """
+
+        with self.lock:
+            return {
+                "players": len(self.players),
+                "seated": len(self.seats),
+                "dirty": len(self.dirty),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "writes": self.writes,
+            }
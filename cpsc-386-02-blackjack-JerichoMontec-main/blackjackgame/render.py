@@ -0,0 +1,119 @@
+"""
+Renderers decide where the messages of the game go and how long the game pauses after each
+one, so the same table can print slowly to a terminal or run without waiting at all
+
+module time allows the terminal renderer to pause after a message
+"""
+
+from time import sleep
+
+
+class Renderer:
+    """
+    A class used to represent where messages go, this one drops them
+
+    Attributes
+    ----------
+    enabled : bool
+        False when messages are dropped, so callers can skip building them
+
+    Methods
+    -------
+    show(message, delay)
+        shows one message and pauses for the delay scaled by the renderer's pace
+    """
+
+    enabled = False
+
+    def show(self, message, delay=1.000):
+        """
+        shows one message, does nothing here
+
+        Parameters
+        ----------
+        message : string
+            what to show
+
+        delay : float
+            how long the terminal would pause after it
+        """
+
+
+class TerminalRenderer(Renderer):
+    """
+    A Renderer that prints every message and pauses so the players can read it
+
+    Attributes
+    ----------
+    pace : float
+        how much of every delay is slept, 1.0 sleeps all of it and 0 never sleeps
+    """
+
+    enabled = True
+
+    def __init__(self, pace=1.0):
+        """
+        Parameters
+        ----------
+        pace : float
+            how much of every delay is slept (default is 1.0)
+        """
+
+        self.pace = pace
+
+    def show(self, message, delay=1.000):
+        """
+        prints the message and sleeps for the delay times the pace
+        """
+
+        print(message)
+        if self.pace and delay:
+            sleep(delay * self.pace)
+
+
+class BufferedRenderer(Renderer):
+    """
+    A Renderer that keeps every message in a list without pausing, for tests, bots and
+    servers that send the messages on later
+
+    Attributes
+    ----------
+    events : list
+        every (message, delay) shown since the last drain
+
+    Methods
+    -------
+    drain()
+        returns the events and empties the list
+    """
+
+    enabled = True
+
+    def __init__(self):
+        """
+        Parameters
+        ----------
+        No Parameters
+        """
+
+        self.events = []
+
+    def show(self, message, delay=1.000):
+        """
+        keeps the message and its delay
+        """
+
+        self.events.append((message, delay))
+
+    def drain(self):
+        """
+        returns every event kept so far and empties the list
+        """
+
+        events = self.events
+        self.events = []
+        return events
+
+
+SILENT = Renderer()
+TERMINAL = TerminalRenderer()
@@ -0,0 +1,283 @@
+"""
+A ring of shuffled shoes in shared memory, one process writes the shoes and every worker
+reads its shoes where they were written, nothing is pickled or copied on the way
+
+The ring has one lane for every worker and every lane holds a few slots. A lane has two
+counters, how many shoes were written to it and how many were read from it, and each one is
+only ever written by one side: the writer moves the first once a slot is filled and the
+reader moves the second once it is done with a slot. Each counter is one aligned 8 byte word
+written in one store after the slot it hands over, so no lock is needed and neither side ever
+waits on the other while it holds anything. The two counters of a lane sit on their own cache
+lines so the writer and the reader do not fight over one line.
+
+A reader never writes to a slot, the Shoe it deals from a slot is played to its cut card
+and anything that has to reshuffle it copies the cards out first, so the slot can be handed
+back as it was written.
+
+Whoever waits on the other side also checks that it is still alive, so a worker that crashes
+stops the writer instead of hanging it, and a writer that is gone stops the workers. The
+block is unlinked by the process that made it, the resource tracker of multiprocessing
+removes it if that process dies first.
+
+module multiprocessing allows for use of shared_memory which the ring lives in
+
+module time allows the side that waits to sleep between looks at the counters
+"""
+
+from multiprocessing import shared_memory
+from time import sleep
+
+# Words of the header, before the lanes
+STOP = 0
+LANES = 1
+SLOTS = 2
+STRIDE = 3
+
+# Every counter gets a cache line of its own
+LINE_WORDS = 8
+
+# A slot starts with the index of its shoe and its cut card location, then the codes
+SLOT_HEADER = 16
+
+
+class ShoeRing:
+    """
+    A class used to represent the ring of shoes in shared memory, made by the writer and
+    attached to by name in every worker
+
+    Attributes
+    ----------
+    memory : SharedMemory
+        the block the ring lives in
+
+    name : string
+        the name of the block, workers attach to it with this
+
+    lanes : int
+        how many lanes the ring has, one for every worker
+
+    slots : int
+        how many shoes fit in every lane
+
+    stride : int
+        how many codes make up one shoe, every deck plus the random cut card
+
+    words : memoryview
+        the block as 8 byte words, the header and the counters are read and written here
+
+    rows : dict
+        maps a lane to the view of the shoe its reader holds
+
+    Methods
+    -------
+    attach(name)
+        returns the ring of a block made by another process
+
+    put(lane, index, codes, cut_card_location, alive)
+        writes a shoe to a lane, waiting while the lane is full
+
+    get(lane, alive)
+        returns the next shoe of a lane without copying it, waiting while the lane is empty
+
+    release(lane)
+        hands the slot of the last shoe read back to the writer
+
+    stop()
+        tells every reader no more shoes are coming
+
+    close()
+        lets go of the block in this process
+
+    unlink()
+        removes the block, called by the process that made it
+    """
+
+    def __init__(self, lanes, slots=4, decks=8, memory=None):
+        """
+        Parameters
+        ----------
+        lanes : int
+            how many lanes the ring has, one for every worker
+
+        slots : int
+            how many shoes fit in every lane (default is 4)
+
+        decks : int
+            how many decks make up every shoe (default is 8)
+
+        memory : SharedMemory
+            a block made by another process, a new block is made when not given
+        """
+
+        if memory is None:
+            stride = 52 * decks + 1
+            slot_bytes = SLOT_HEADER + -(-stride // 8) * 8
+            size = (1 + 2 * lanes) * LINE_WORDS * 8 + lanes * slots * slot_bytes
+            memory = shared_memory.SharedMemory(create=True, size=size)
+            words = memory.buf.cast("Q")
+            words[STOP] = 0
+            words[LANES] = lanes
+            words[SLOTS] = slots
+            words[STRIDE] = stride
+            for lane in range(lanes):
+                words[self._written(lane)] = 0
+                words[self._read(lane)] = 0
+        else:
+            words = memory.buf.cast("Q")
+        self.memory = memory
+        self.name = memory.name
+        self.words = words
+        self.lanes = words[LANES]
+        self.slots = words[SLOTS]
+        self.stride = words[STRIDE]
+        self.slot_bytes = SLOT_HEADER + -(-self.stride // 8) * 8
+        self.first_slot = (1 + 2 * self.lanes) * LINE_WORDS * 8
+        self.rows = {}
+
+    @classmethod
+    def attach(cls, name):
+        """
+        returns the ring of a block another process made
+
+        Parameters
+        ----------
+        name : string
+            the name of the block
+        """
+
+        return cls(0, memory=shared_memory.SharedMemory(name=name))
+
+    @staticmethod
+    def _written(lane):
+        """
+        returns the word that counts the shoes written to a lane
+        """
+
+        return (1 + 2 * lane) * LINE_WORDS
+
+    @staticmethod
+    def _read(lane):
+        """
+        returns the word that counts the shoes read from a lane
+        """
+
+        return (2 + 2 * lane) * LINE_WORDS
+
+    def _slot(self, lane, count):
+        """
+        returns the byte offset of the slot the count-th shoe of a lane goes in
+        """
+
+        return self.first_slot + (lane * self.slots + count % self.slots) * self.slot_bytes
+
+    def put(self, lane, index, codes, cut_card_location, alive=None):
+        """
+        writes a shoe to the next slot of a lane and hands it to the lane's reader, waiting
+        while the reader has not released any slot
+
+        Parameters
+        ----------
+        lane : int
+            which lane
+
+        index : int
+            which shoe of the run it is
+
+        codes : array
+            the code of every card of the shoe, the way shuffled_codes returns them
+
+        cut_card_location : int
+            the cut card location of the shoe
+
+        alive : callable
+            returns False once the reader is gone, RuntimeError is raised then (default is
+            None, the reader is not checked)
+        """
+
+        words = self.words
+        written = words[self._written(lane)]
+        read = self._read(lane)
+        pause = 0.0001
+        while written - words[read] >= self.slots:
+            if alive is not None and not alive():
+                raise RuntimeError(f"the reader of lane {lane} is gone")
+            sleep(pause)
+            pause = min(pause * 2, 0.01)
+        offset = self._slot(lane, written)
+        words[offset // 8] = index
+        words[offset // 8 + 1] = cut_card_location
+        self.memory.buf[offset + SLOT_HEADER:offset + SLOT_HEADER + self.stride] = codes
+        words[self._written(lane)] = written + 1  # Hands the slot over
+
+    def get(self, lane, alive=None):
+        """
+        returns the next shoe of a lane, its codes are a view of the shared memory that is
+        valid until release is called, waits while the lane is empty
+
+        Parameters
+        ----------
+        lane : int
+            which lane
+
+        alive : callable
+            returns False once the writer is gone, RuntimeError is raised then (default is
+            None, the writer is not checked)
+
+        Returns
+        -------
+        tuple
+            the index of the shoe, its codes and its cut card location, None once the
+            writer has stopped and every shoe of the lane has been read
+        """
+
+        words = self.words
+        written = self._written(lane)
+        read = words[self._read(lane)]
+        pause = 0.0001
+        while words[written] == read:
+            if words[STOP] and words[written] == read:
+                return None
+            if alive is not None and not alive():
+                raise RuntimeError(f"the writer of lane {lane} is gone")
+            sleep(pause)
+            pause = min(pause * 2, 0.01)
+        offset = self._slot(lane, read)
+        row = self.memory.buf[offset + SLOT_HEADER:offset + SLOT_HEADER + self.stride]
+        self.rows[lane] = row
+        return words[offset // 8], row, words[offset // 8 + 1]
+
+    def release(self, lane):
+        """
+        hands the slot of the last shoe read from a lane back to the writer, the view of
+        its codes can not be used after this
+        """
+
+        self.rows.pop(lane).release()
+        read = self._read(lane)
+        self.words[read] += 1
+
+    def stop(self):
+        """
+        tells every reader that no more shoes are coming, the shoes already written are
+        still read
+        """
+
+        self.words[STOP] = 1
+
+    def close(self):
+        """
+        lets go of every view of the block and closes it in this process
+        """
+
+        for row in self.rows.values():
+            row.release()
+        self.rows.clear()
+        self.words.release()
+        self.memory.close()
+
+    def unlink(self):
+        """
+        removes the block, once every process has closed it the memory is freed
+        """
+
+        self.memory.unlink()
@@ -0,0 +1,174 @@
+"""
+Rule sets for variant tables, a rule set is read from a JSON or TOML file, checked once and
+compiled into an immutable Rules namedtuple that the Engine reads without looking anything up
+while a hand is played
+
+    {
+        "decks": 6,
+        "penetration": [0.75, 0.8],
+        "dealer": "H17",
+        "blackjack_pays": "3:2",
+        "splits": true
+    }
+
+Every key can be left out, the defaults are the rules of this table, 8 decks, the cut card
+between the 335th and the 355th card, the Dealer stands on every 17, a blackjack pays 1:1 like
+every other win and no splits. When a blackjack pays 1:1 a natural is an ordinary 21, with any
+other payout a natural beats every other hand of 21. A payout is kept in lowest terms, so 2:2
+is the same as 1:1.
+
+The cut card always leaves ROUND_CARDS cards behind it, so a round that starts before the cut
+card comes up can be dealt out of the shoe. A penetration that leaves fewer is refused, and
+the default cut card of a shoe with fewer decks is moved up until it leaves enough.
+
+module json allows a rule set to be read from a JSON file, it is only imported when a rule
+set is loaded
+
+module tomllib allows a rule set to be read from a TOML file, it comes with python 3.11 and
+only TOML files import it
+
+module collections allows for use of namedtuples which hold the compiled rules
+
+module math allows for use of gcd which puts a payout in lowest terms
+
+module deck allows for use of CUT_CARD, the cut card range of the default shoe
+
+module hand allows for use of the hand states and their tables, the Dealer's draws are
+compiled into one byte per state
+"""
+
+from collections import namedtuple
+from math import gcd
+from .deck import CUT_CARD
+from .hand import STATES, TOTAL, SOFT
+
+KEYS = ("decks", "penetration", "dealer", "blackjack_pays", "splits")
+
+# Cards left behind the cut card for the last round of a shoe, four seats and the Dealer
+# took at most 24 in 300000 rounds of basic strategy
+ROUND_CARDS = 30
+
+Rules = namedtuple("Rules", ["decks", "cut_card", "dealer_hits_soft_17", "blackjack_pays",
+                             "splits", "dealer_hits"])
+
+
+def _dealer_hits(soft_17):
+    """
+    returns one byte for every hand state, 1 when the Dealer draws on it
+    """
+
+    return bytes(int(TOTAL[state] < 17 or (soft_17 and TOTAL[state] == 17 and SOFT[state]))
+                 for state in range(STATES))
+
+
+def _payout(text):
+    """
+    returns a payout written as "3:2" as the pair (3, 2), in lowest terms so "6:4" is
+    (3, 2) as well and "2:2" is (1, 1)
+    """
+
+    try:
+        numerator, denominator = (int(part) for part in str(text).split(":"))
+    except ValueError:
+        raise ValueError(f"blackjack_pays must look like 3:2, not {text!r}") from None
+    if numerator <= 0 or denominator <= 0:
+        raise ValueError(f"blackjack_pays must be positive, not {text!r}")
+    divisor = gcd(numerator, denominator)
+    return numerator // divisor, denominator // divisor
+
+
+def _cut_card(penetration, cards):
+    """
+    returns the lowest and highest cut card location of a shoe from a penetration, either
+    one fraction of the shoe or a [low, high] pair of fractions, the highest must leave
+    ROUND_CARDS behind it
+    """
+
+    pair = penetration
+    if isinstance(pair, (int, float)) and not isinstance(pair, bool):
+        pair = (pair, pair)
+    try:
+        low, high = (float(part) for part in pair)
+    except (TypeError, ValueError):
+        raise ValueError(f"penetration must be a fraction or [low, high], not "
+                         f"{penetration!r}") from None
+    if not 0.25 <= low <= high <= 0.95:
+        raise ValueError(f"penetration must be between 0.25 and 0.95, not {penetration!r}")
+    if round(high * cards) > cards - ROUND_CARDS:
+        raise ValueError(f"penetration {penetration!r} leaves fewer than {ROUND_CARDS} cards "
+                         f"behind the cut card of {cards} cards, it can be at most "
+                         f"{(cards - ROUND_CARDS) / cards:.2f}")
+    return round(low * cards), round(high * cards)
+
+
+def compile_rules(settings):
+    """
+    checks a rule set and returns it compiled into Rules
+
+    Parameters
+    ----------
+    settings : dict
+        the rule set, every key that is left out keeps the rule of this table
+
+    Returns
+    -------
+    Rules
+        the compiled rules
+    """
+
+    unknown = set(settings) - set(KEYS)
+    if unknown:
+        raise ValueError(f"unknown rules: {', '.join(sorted(unknown))}")
+
+    decks = settings.get("decks", 8)
+    if isinstance(decks, bool) or not isinstance(decks, int) or not 1 <= decks <= 16:
+        raise ValueError(f"decks must be a whole number from 1 to 16, not {decks!r}")
+
+    if "penetration" in settings:
+        cut_card = _cut_card(settings["penetration"], 52 * decks)
+    elif decks == 8:
+        cut_card = CUT_CARD
+    else:
+        most = 52 * decks - ROUND_CARDS
+        cut_card = (min(round(CUT_CARD[0] / 416 * 52 * decks), most),
+                    min(round(CUT_CARD[1] / 416 * 52 * decks), most))
+
+    dealer = str(settings.get("dealer", "S17")).upper()
+    if dealer not in ("S17", "H17"):
+        raise ValueError(f"dealer must be S17 or H17, not {dealer!r}")
+
+    splits = settings.get("splits", False)
+    if not isinstance(splits, bool):
+        raise ValueError(f"splits must be true or false, not {splits!r}")
+
+    return Rules(decks=decks, cut_card=cut_card, dealer_hits_soft_17=dealer == "H17",
+                 blackjack_pays=_payout(settings.get("blackjack_pays", "1:1")),
+                 splits=splits, dealer_hits=_dealer_hits(dealer == "H17"))
+
+
+def load_rules(path):
+    """
+    reads a rule set from a JSON file, or a TOML file when the name ends in .toml, and
+    returns it compiled into Rules
+
+    Parameters
+    ----------
+    path : string
+        where the rule set is saved
+    """
+
+    # The parsers are imported here so a table on the default rules never loads them
+    # pylint: disable=import-outside-toplevel
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:  # python older than 3.11
+            raise ValueError("reading a TOML rule set needs python 3.11 or newer") from None
+        with open(path, "rb") as config:
+            return compile_rules(tomllib.load(config))
+    import json
+    with open(path, encoding="utf-8") as config:
+        return compile_rules(json.load(config))
+
+
+DEFAULT_RULES = compile_rules({})
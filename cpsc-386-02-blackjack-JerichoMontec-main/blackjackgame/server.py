@@ -0,0 +1,608 @@
+"""
+A table server that hosts many tables in one process, every table is a coroutine and every
+seat is a connection that talks in lines of text
+
+The server sends one line for every message and a line ending in "?" when it waits for an
+answer:
+
+    NAME?                     the client answers with its name
+    BUSY                      the name is already sitting at a table, the connection closes
+    BALANCE <balance>
+    BET <balance>?            the client answers with a bet, 0 leaves the table
+    DEALER <card>             the Dealer's face up card
+    HAND <cards> <value>      the cards of the Hand being played after every change
+    SPLIT?                    the client answers y or n, the Hands of a split pair are
+                              played one after the other
+    DOUBLE?                   the client answers y or n
+    HIT?                      the client answers y or n
+    DEALER <cards> <value>    the Dealer's whole hand once the Dealer has played
+    RESULT WIN|PUSH|LOSE <balance>
+    BYE <balance>
+
+module argparse allows the server to be started from the terminal
+
+module asyncio allows every table and every seat to wait on the network without a thread
+
+module deck allows for use of show which turns a card code into text
+
+module engine allows for use of the Engine whose turn generator the tables answer over the
+network, and WIN, PUSH and LOSE which name the results
+
+module ledger allows for use of the Ledger which saves the balances while the tables play
+
+module metrics allows the phases of every table to be timed, and dumped when the server gets
+SIGUSR1 and when it stops
+
+module signal allows the metrics to be dumped on demand
+
+module shuffler allows the next shoes of every table to be shuffled on a thread ahead of time
+
+module rules allows the tables to play a variant rule set
+
+module registry allows for use of the PlayerRegistry which keeps the Players that played
+last in memory in front of the BalanceStore
+
+module render allows for use of the silent Renderer, seats get structured lines instead
+
+module store allows for use of the BalanceStore which remembers the seats' balances
+"""
+
+import argparse
+import asyncio
+import signal
+from .deck import show
+from .engine import Engine, SPLIT, DOUBLE, HIT, WIN, PUSH
+from .ledger import Ledger
+from .metrics import OFF, Recorder
+from .player import Player
+from .registry import PlayerRegistry
+from .render import SILENT
+from .rules import DEFAULT_RULES, load_rules
+from .shuffler import Shuffler
+from .store import BalanceStore
+
+RESULTS = {WIN: "WIN", PUSH: "PUSH"}
+
+QUESTIONS = {SPLIT: "SPLIT", DOUBLE: "DOUBLE", HIT: "HIT"}
+
+# Seconds a seat of serve has to answer, so one idle connection can not hold up its table
+ANSWER_TIMEOUT = 60
+
+
+def show_cards(cards):
+    """
+    returns the card codes as text, one rank and suit symbol per card
+    """
+
+    return " ".join(show(code) for code in cards)
+
+
+class Seat:
+    """
+    A class used to represent one connection sitting at a table
+
+    Attributes
+    ----------
+    player : Player
+        the Player playing from this connection
+
+    reader : StreamReader
+        lines coming from the client
+
+    writer : StreamWriter
+        lines going to the client
+
+    timeout : float
+        how long to wait for an answer before the seat is closed, None waits forever
+
+    closed : bool
+        True once the client has gone or stopped answering
+
+    left : Future
+        done when the seat leaves its table
+
+    Methods
+    -------
+    send(line)
+        sends a line to the client
+
+    ask(question)
+        sends a question and waits for the answer
+    """
+
+    def __init__(self, player, reader, writer, timeout=None):
+        """
+        Parameters
+        ----------
+        player : Player
+            the Player playing from this connection
+
+        reader : StreamReader
+            lines coming from the client
+
+        writer : StreamWriter
+            lines going to the client
+
+        timeout : float
+            how long to wait for an answer (default is None)
+        """
+
+        self.player = player
+        self.reader = reader
+        self.writer = writer
+        self.timeout = timeout
+        self.closed = False
+        self.left = asyncio.get_running_loop().create_future()
+
+    def send(self, line):
+        """
+        sends a line to the client, nothing is sent once the seat is closed
+        """
+
+        if not self.closed:
+            self.writer.write(line.encode() + b"\n")
+
+    async def ask(self, question):
+        """
+        sends a question and returns the answer in lower case, an empty answer when the
+        client has gone or took too long
+
+        Parameters
+        ----------
+        question : string
+            the question, without the "?"
+        """
+
+        if self.closed:
+            return ""
+        self.send(f"{question}?")
+        try:
+            await self.writer.drain()
+            line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+        except (asyncio.TimeoutError, ConnectionError):
+            line = b""
+        if not line:
+            self.closed = True
+            return ""
+        return line.decode(errors="replace").strip().lower()
+
+
+class Table:
+    """
+    A class used to represent one table of the server, the table plays rounds for as long
+    as somebody is sitting at it
+
+    Attributes
+    ----------
+    engine : Engine
+        the rules of the table, engine.seats are the Players sitting down
+
+    seats : list
+        the Seats playing this round
+
+    waiting : list
+        Seats that join at the start of the next round
+
+    size : int
+        how many Seats fit at the table
+
+    is_open : bool
+        False once the table has stopped playing
+
+    ledger : Ledger
+        where the bets and settlements of the table are recorded, None to keep no ledger
+
+    metrics : Metrics
+        where the phases of the table's rounds are timed
+
+    shuffler : Shuffler
+        where the table takes its shoes from, None to shuffle when the cut card comes up
+
+    rules : Rules
+        the rules the table plays by
+
+    Methods
+    -------
+    has_room()
+        returns True when another Seat fits at the table
+
+    join(seat)
+        sits a Seat down at the start of the next round
+
+    leave(seat)
+        takes a Seat away from the table
+
+    run()
+        plays rounds until the table is empty
+
+    play_round()
+        takes bets, deals, plays every turn and the Dealer and settles the round
+    """
+
+    def __init__(self, size=4, ledger=None, metrics=OFF, shuffler=None, rules=DEFAULT_RULES):
+        """
+        Parameters
+        ----------
+        size : int
+            how many Seats fit at the table (default is 4)
+
+        ledger : Ledger
+            where the bets and settlements are recorded (default is None)
+
+        metrics : Metrics
+            where the phases of the rounds are timed (default is OFF)
+
+        shuffler : Shuffler
+            where the shoes are taken from (default is None)
+
+        rules : Rules
+            the rules the table plays by (default is DEFAULT_RULES)
+        """
+
+        self.engine = Engine([], rules=rules, ledger=ledger, metrics=metrics,
+                             shuffler=shuffler)
+        self.seats = []
+        self.waiting = []
+        self.size = size
+        self.is_open = True
+
+    def has_room(self):
+        """
+        returns True when the table is still playing and another Seat fits at it
+        """
+
+        return self.is_open and len(self.seats) + len(self.waiting) < self.size
+
+    def join(self, seat):
+        """
+        sits a Seat down at the start of the next round
+        """
+
+        seat.player.renderer = SILENT
+        self.waiting.append(seat)
+
+    def leave(self, seat):
+        """
+        takes a Seat away from the table and tells whoever is waiting on it
+        """
+
+        self.seats.remove(seat)
+        self.engine.seats.remove(seat.player)
+        seat.send(f"BYE {seat.player.balance}")
+        if not seat.left.done():
+            seat.left.set_result(seat.player)
+
+    async def take_bet(self, seat):
+        """
+        asks a Seat for a bet until it is valid, a bet of 0 or no answer leaves the table
+        """
+
+        player = seat.player
+        player.is_turn = True
+        while player.is_turn:
+            answer = await seat.ask(f"BET {player.balance}")
+            bet = int(answer) if answer.isdigit() else 0
+            player.add_bet(bet)
+
+    @staticmethod
+    def show_hand(seat, shown):
+        """
+        sends the Hand being played when its cards are not the ones shown last and returns
+        the cards now shown
+        """
+
+        player = seat.player
+        cards = bytes(player.current_hand)
+        if cards != shown:
+            seat.send(f"HAND {show_cards(cards)} {player.check_value()}")
+        return cards
+
+    async def play_turn(self, seat):
+        """
+        answers the questions of a Seat's turn with the answers from the network, every
+        Hand of the Seat is played in turn, a Hand split off right after the one it came from
+        """
+
+        player = seat.player
+        seat.send(f"DEALER {show(self.engine.dealer.current_hand[0])}")
+        for hand in player.hands:
+            player.hand = hand
+            turn = self.engine.turn(player)
+            shown = None
+            try:
+                question = next(turn)
+                while True:
+                    shown = self.show_hand(seat, shown)
+                    answer = await seat.ask(QUESTIONS[question])
+                    question = turn.send(answer == "y")
+            except StopIteration:
+                self.show_hand(seat, shown)
+        player.hand = player.hands[0]
+
+    async def play_round(self):
+        """
+        takes bets, deals, plays every turn and the Dealer and settles the round
+        """
+
+        engine = self.engine
+        for seat in self.waiting:
+            self.seats.append(seat)
+            engine.seats.append(seat.player)
+        self.waiting.clear()
+
+        for seat in self.seats:
+            seat.player.doubled_down = False
+        await asyncio.gather(*(self.take_bet(seat) for seat in self.seats))
+        for seat in list(self.seats):
+            if seat.player.current_bet == 0 or seat.closed:
+                self.leave(seat)
+        if not self.seats:
+            return
+
+        if engine.needs_shuffle():
+            engine.new_shoe()
+        engine.deal()
+        for seat in self.seats:
+            await self.play_turn(seat)
+        engine.play_dealer()
+
+        dealer = engine.dealer
+        dealer_line = f"DEALER {show_cards(dealer.current_hand)} {dealer.check_value()}"
+        for seat, outcome in zip(self.seats, engine.settle_round()):
+            seat.send(dealer_line)
+            seat.send(f"RESULT {RESULTS.get(outcome, 'LOSE')} {seat.player.balance}")
+        engine.discard_hands()
+        for seat in self.seats:
+            seat.player.current_bet = 0
+
+    async def run(self):
+        """
+        plays rounds until nobody is sitting or waiting at the table, if a round fails
+        every Seat still at the table is let go
+        """
+
+        try:
+            while self.seats or self.waiting:
+                await self.play_round()
+        finally:
+            self.is_open = False
+            self.seats.extend(self.waiting)
+            self.engine.seats.extend(seat.player for seat in self.waiting)
+            self.waiting.clear()
+            for seat in list(self.seats):
+                self.leave(seat)
+
+
+class TableServer:
+    """
+    A class used to represent the server, it seats every connection at a table with room
+    and starts a table coroutine when a new table is needed
+
+    Attributes
+    ----------
+    tables : list
+        every table that has somebody sitting at it
+
+    store : BalanceStore
+        remembers the balances, None to start everybody at 10000
+
+    registry : PlayerRegistry
+        holds the Players in front of the store so a returning name is found in memory,
+        None when there is no store, it is joined and left on the loop's executor so a read
+        or write of the store never holds up the tables
+
+    names : set
+        the names of the connections that are playing, kept on the loop so a name is
+        turned away before its Player is read
+
+    table_size : int
+        how many Seats fit at a table
+
+    timeout : float
+        how long a Seat has to answer, None waits forever
+
+    ledger : Ledger
+        shared by every table so balances are saved while they play, None to save them
+        only when a Seat leaves
+
+    metrics : Metrics
+        shared by every table so all their rounds are timed together
+
+    shuffler : Shuffler
+        shuffles the shoes of every table ahead of time, None to shuffle at the cut card
+
+    rules : Rules
+        the rules every table plays by
+
+    Methods
+    -------
+    seat(seat)
+        sits a Seat at a table with room, starting a new table when none has room
+
+    handle(reader, writer)
+        plays one connection from its name until it leaves
+
+    start(host, port)
+        starts listening on a TCP port
+
+    start_unix(path)
+        starts listening on a Unix socket
+
+    close()
+        writes back the balances the registry holds
+    """
+
+    def __init__(self, store=None, table_size=4, timeout=None, ledger=None, metrics=OFF,
+                 shuffler=None, registry_size=1024, rules=DEFAULT_RULES):
+        """
+        Parameters
+        ----------
+        store : BalanceStore
+            remembers the balances (default is None)
+
+        table_size : int
+            how many Seats fit at a table (default is 4)
+
+        timeout : float
+            how long a Seat has to answer (default is None)
+
+        ledger : Ledger
+            where every table records its bets and settlements (default is None)
+
+        metrics : Metrics
+            where every table times its rounds (default is OFF)
+
+        shuffler : Shuffler
+            where every table takes its shoes from (default is None)
+
+        registry_size : int
+            how many Players the registry holds in memory (default is 1024)
+
+        rules : Rules
+            the rules every table plays by (default is DEFAULT_RULES)
+        """
+
+        self.tables = []
+        self.store = store
+        self.registry = PlayerRegistry(store, registry_size) if store is not None else None
+        self.names = set()
+        self.table_size = table_size
+        self.timeout = timeout
+        self.ledger = ledger
+        self.metrics = metrics
+        self.shuffler = shuffler
+        self.rules = rules
+
+    def seat(self, seat):
+        """
+        sits a Seat at the first table with room, starting a new table when none has room
+        """
+
+        for table in self.tables:
+            if table.has_room():
+                table.join(seat)
+                return table
+        table = Table(self.table_size, self.ledger, self.metrics, self.shuffler, self.rules)
+        table.join(seat)
+        self.tables.append(table)
+        task = asyncio.get_running_loop().create_task(table.run())
+        task.add_done_callback(lambda _: self.tables.remove(table))
+        return table
+
+    async def handle(self, reader, writer):
+        """
+        asks a connection for its name, seats it and waits until it leaves its table,
+        then gives its Player back to the registry and closes the connection, a name that
+        is already playing is turned away, the registry reads and writes the store on the
+        loop's executor
+        """
+
+        seat = Seat(None, reader, writer, self.timeout)
+        name = await seat.ask("NAME")
+        registry = self.registry
+        loop = asyncio.get_running_loop()
+        if name in self.names:
+            seat.send("BUSY")
+        elif name:
+            self.names.add(name)
+            try:
+                if registry is not None:
+                    seat.player, _ = await loop.run_in_executor(None, registry.join, name)
+                else:
+                    seat.player = Player(name, 10000)
+                seat.send(f"BALANCE {seat.player.balance}")
+                self.seat(seat)
+                player = await seat.left
+            finally:
+                self.names.discard(name)
+            if registry is not None:
+                await loop.run_in_executor(None, registry.leave, [player])
+        try:
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def start(self, host="127.0.0.1", port=0, backlog=1024):
+        """
+        starts listening on a TCP port and returns the asyncio Server, the backlog is
+        large so a burst of players joining at once is not turned away
+        """
+
+        return await asyncio.start_server(self.handle, host, port, backlog=backlog)
+
+    async def start_unix(self, path, backlog=1024):
+        """
+        starts listening on a Unix socket and returns the asyncio Server
+        """
+
+        return await asyncio.start_unix_server(self.handle, path, backlog=backlog)
+
+    def close(self):
+        """
+        writes back every balance the registry holds that changed
+        """
+
+        if self.registry is not None:
+            self.registry.close()
+
+
+async def serve(host, port, store_path, metrics_path=None, pre_shuffle=False,
+                timeout=ANSWER_TIMEOUT, rules=DEFAULT_RULES):
+    """
+    runs a TableServer on a TCP port until it is stopped, when there is a metrics path the
+    tables are timed and the metrics are written to it on SIGUSR1 and once the server stops,
+    with pre_shuffle the shoes are shuffled on a thread before the tables need them, a seat
+    that does not answer within timeout seconds leaves its table, None waits forever, and
+    every table plays by rules
+    """
+
+    metrics = Recorder() if metrics_path else OFF
+    store = BalanceStore(store_path) if store_path else None
+    ledger = Ledger(store_path, metrics=metrics) if store_path else None
+    shuffler = Shuffler(rules.decks, cut_card=rules.cut_card) if pre_shuffle else None
+    tables = TableServer(store, timeout=timeout, ledger=ledger, metrics=metrics,
+                         shuffler=shuffler, rules=rules)
+    server = await tables.start(host, port)
+    if metrics_path and hasattr(signal, "SIGUSR1"):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, metrics.dump,
+                                                      metrics_path)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if ledger is not None:
+            ledger.close()
+        tables.close()
+        if shuffler is not None:
+            shuffler.close()
+        if metrics_path:
+            metrics.dump(metrics_path)
+
+
+def main():
+    """
+    starts the server from the terminal
+    """
+
+    parser = argparse.ArgumentParser(description="Host blackjack tables over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8386)
+    parser.add_argument("--store", default="blackjackgame/player_balances.db")
+    parser.add_argument("--metrics", help="time the tables and write the metrics here on "
+                        "SIGUSR1 and on exit, as Prometheus text when it ends in .prom")
+    parser.add_argument("--pre-shuffle", action="store_true",
+                        help="shuffle the next shoes on a thread before the cut card comes up")
+    parser.add_argument("--timeout", type=float, default=ANSWER_TIMEOUT,
+                        help="seconds a seat has to answer before it leaves its table, 0 "
+                        "waits forever")
+    parser.add_argument("--rules", help="JSON or TOML rule set the tables play")
+    args = parser.parse_args()
+    rules = load_rules(args.rules) if args.rules else DEFAULT_RULES
+    asyncio.run(serve(args.host, args.port, args.store, args.metrics, args.pre_shuffle,
+                      args.timeout or None, rules))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+A thread that shuffles the next shoes before a table reaches its cut card, so a reshuffle
+only takes a shoe that is ready instead of shuffling while every seat waits
+
+The shoes are shuffled one after another by one generator, so a seeded Shuffler hands out
+the same shoes in the same order no matter how fast the tables take them.
+
+module queue allows the shuffled shoes to be handed from the thread to the tables
+
+module random allows for use of Random which the shoes are shuffled with
+
+module threading allows the shoes to be shuffled while the tables wait on their players
+
+module deck allows for use of shuffled_codes which shuffles a shoe the same way a Shoe does,
+and CUT_CARD, the cut card range of the default shoe
+"""
+
+from queue import Queue, Empty
+from random import Random
+from threading import Thread
+from .deck import shuffled_codes, CUT_CARD
+
+
+class Shuffler:
+    """
+    A class used to represent the thread shuffling the next shoes, it stays a few shoes
+    ahead of the tables taking them
+
+    Attributes
+    ----------
+    decks : int
+        how many decks make up every shoe
+
+    rng : Random
+        the generator every shoe is shuffled with
+
+    cut_card : tuple
+        the lowest and highest cut card location
+
+    ahead : int
+        how many shuffled shoes are kept ready
+
+    Methods
+    -------
+    next()
+        returns the codes and cut card location of the next shoe
+
+    close()
+        stops the thread
+    """
+
+    def __init__(self, decks=8, rng=None, cut_card=CUT_CARD, ahead=2):
+        """
+        Parameters
+        ----------
+        decks : int
+            how many decks make up every shoe (default is 8)
+
+        rng : Random
+            the generator every shoe is shuffled with (default is a new unseeded Random)
+
+        cut_card : tuple
+            the lowest and highest cut card location (default is CUT_CARD)
+
+        ahead : int
+            how many shuffled shoes are kept ready (default is 2)
+        """
+
+        self.decks = decks
+        self.rng = rng if rng is not None else Random()
+        self.cut_card = cut_card
+        self.ahead = ahead
+        self.shoes = Queue(maxsize=ahead)
+        self.stopping = False
+        self.thread = Thread(target=self._shuffle, name="shuffler", daemon=True)
+        self.thread.start()
+
+    def next(self):
+        """
+        returns the next shuffled shoe, it only waits when the tables have taken shoes
+        faster than the thread shuffles them
+
+        Returns
+        -------
+        tuple
+            the array of codes and the cut card location, the way shuffled_codes returns
+            them
+        """
+
+        return self.shoes.get()
+
+    def close(self):
+        """
+        stops the thread, the shoes it had ready are dropped
+        """
+
+        self.stopping = True
+        while self.thread.is_alive():
+            try:
+                self.shoes.get_nowait()
+            except Empty:
+                pass
+            self.thread.join(0.01)
+
+    def _shuffle(self):
+        """
+        runs in the thread, shuffles shoes until it is stopped, waiting whenever enough
+        of them are ready
+        """
+
+        while not self.stopping:
+            self.shoes.put(shuffled_codes(self.decks, self.rng, self.cut_card))
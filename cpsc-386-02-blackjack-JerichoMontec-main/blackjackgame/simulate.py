@@ -0,0 +1,470 @@
+"""
+Monte Carlo simulation of the table, the shoes are split into chunks that are played on a
+pool of processes and the statistics of every chunk are merged at the end
+
+Shoe i of a run is always shuffled by Random(ShoeBatch.stream_seed(seed, i)), so a run gives
+the same numbers no matter how many processes play it, and whether the workers shuffle their
+own shoes or read them from a ShoeRing this process shuffles them into. Every shoe is played
+to its cut card and never reshuffled in place, a round that runs it out shuffles its discards
+into a copy with ShoeBatch.reshuffle_rng(seed, i) on either path.
+
+module argparse allows the simulation to be run from the terminal
+
+module multiprocessing allows the chunks to be played on every core
+
+module os allows for use of cpu_count to pick the number of processes
+
+module queue allows the results of the ring's workers to be waited on while their processes
+are watched
+
+module random allows for use of Random which shuffles the shoes written to the ring
+
+module batch allows for use of ShoeBatch which shuffles the shoes of a chunk
+
+module deck allows for use of shuffled_codes which shuffles the shoes written to the ring, and
+the Shoe class which deals from a shoe in the ring
+
+module engine allows for use of the Engine which plays the rounds with the same rules and the
+same Player.win_hand, lose_hand and tie_hand as the terminal game
+
+module player allows for use of Player class which sits at the simulated table
+
+module ring allows for use of the ShoeRing which hands the shoes to the workers in shared
+memory
+
+module rules allows the simulated table to play a variant rule set
+"""
+
+import argparse
+import multiprocessing
+import os
+from queue import Empty
+from random import Random
+from .batch import ShoeBatch
+from .deck import Shoe, shuffled_codes
+from .engine import Engine, DealerMimic, WIN, PUSH
+from .player import Player
+from .ring import ShoeRing
+from .rules import DEFAULT_RULES, load_rules
+
+# Seats start with a balance that never runs out so rebuy never gives a donation
+BANKROLL = 10 ** 15
+
+
+class Stats:
+    """
+    A class used to represent the results of many hands, two Stats can be merged
+
+    Attributes
+    ----------
+    hands : int
+        how many hands were played
+
+    wins : int
+        how many hands won
+
+    pushes : int
+        how many hands tied with the Dealer
+
+    losses : int
+        how many hands lost
+
+    doubles : int
+        how many hands doubled down
+
+    net : int
+        how many units the Players won, negative when they lost
+
+    net_squares : int
+        sum of the square of every hand's result, used for the variance
+
+    Methods
+    -------
+    add(outcome, net, doubled)
+        records one hand
+
+    merge(other)
+        adds the results of another Stats
+
+    mean()
+        returns the average result of a hand in units
+
+    variance()
+        returns the variance of the result of a hand
+
+    as_dict()
+        returns the results as a dictionary
+    """
+
+    def __init__(self):
+        """
+        Parameters
+        ----------
+        No Parameters
+        """
+
+        self.hands = 0
+        self.wins = 0
+        self.pushes = 0
+        self.losses = 0
+        self.doubles = 0
+        self.net = 0
+        self.net_squares = 0
+
+    def add(self, outcome, net, doubled):
+        """
+        records one hand
+
+        Parameters
+        ----------
+        outcome : int
+            WIN, PUSH or LOSE
+
+        net : int
+            how many units the hand won or lost
+
+        doubled : bool
+            True when the hand doubled down
+        """
+
+        self.hands += 1
+        if outcome == WIN:
+            self.wins += 1
+        elif outcome == PUSH:
+            self.pushes += 1
+        else:
+            self.losses += 1
+        if doubled:
+            self.doubles += 1
+        self.net += net
+        self.net_squares += net * net
+
+    def merge(self, other):
+        """
+        adds the results of another Stats into this one and returns it
+        """
+
+        self.hands += other.hands
+        self.wins += other.wins
+        self.pushes += other.pushes
+        self.losses += other.losses
+        self.doubles += other.doubles
+        self.net += other.net
+        self.net_squares += other.net_squares
+        return self
+
+    def mean(self):
+        """
+        returns the average result of a hand in units, the house edge is the negative
+        """
+
+        if self.hands == 0:
+            return 0.0
+        return self.net / self.hands
+
+    def variance(self):
+        """
+        returns the sample variance of the result of a hand
+        """
+
+        if self.hands < 2:
+            return 0.0
+        mean = self.mean()
+        return (self.net_squares - self.hands * mean * mean) / (self.hands - 1)
+
+    def as_dict(self):
+        """
+        returns the results as a dictionary
+        """
+
+        return {
+            "hands": self.hands,
+            "wins": self.wins,
+            "pushes": self.pushes,
+            "losses": self.losses,
+            "doubles": self.doubles,
+            "net": self.net,
+            "mean": self.mean(),
+            "variance": self.variance(),
+        }
+
+
+class TalliedEngine(Engine):
+    """
+    An Engine that adds every Hand it settles to Stats, so a seat that plays several spots
+    or splits counts every one of its Hands, it keeps no hand history since recording a
+    round judges the Hands a second time
+
+    Attributes
+    ----------
+    stats : Stats
+        where every settled Hand is added
+    """
+
+    def __init__(self, seats, decider, rules, stats):
+        """
+        Parameters
+        ----------
+        seats : list
+            the Players at the table
+
+        decider : Decider
+            makes every choice for the Players
+
+        rules : Rules
+            the rules of the table
+
+        stats : Stats
+            where every settled Hand is added
+        """
+
+        super().__init__(seats, decider, rules=rules)
+        self.stats = stats
+
+    def judge(self, hand, dealer_value, dealer_natural):
+        """
+        settles one Hand the way the Engine does and adds it to the Stats
+        """
+
+        result, winnings = super().judge(hand, dealer_value, dealer_natural)
+        self.stats.add(result, winnings, hand.doubled_down)
+        return result, winnings
+
+
+def play_chunk(task):
+    """
+    plays every shoe of one chunk until its cut card and returns the Stats, runs inside
+    the worker processes
+
+    Parameters
+    ----------
+    task : tuple
+        (seed, first shoe, number of shoes, seats, decider, rules, hands)
+    """
+
+    seed, start, count, seats, decider, rules, hands = task
+    players = [Player(f"Seat {seat + 1}", BANKROLL) for seat in range(seats)]
+    stats = Stats()
+    engine = TalliedEngine(players, decider, rules, stats)
+    batch = ShoeBatch(count, rules.decks, seed, start, rules.cut_card)
+    for index in range(count):
+        engine.deck = batch.shoe(index)
+        while not engine.needs_shuffle():
+            engine.play_round(hands=hands)
+            for player in players:
+                player.balance = BANKROLL
+    return stats
+
+
+def simulate(shoes, seats=1, decider=None, seed=0, workers=None, chunk=64,
+             rules=DEFAULT_RULES, hands=1):
+    """
+    plays the given number of shoes on a pool of processes and returns the merged Stats
+
+    Parameters
+    ----------
+    shoes : int
+        how many shoes to play, each one until its cut card
+
+    seats : int
+        how many Players sit at the table (default is 1)
+
+    decider : Decider
+        makes every choice for the Players, must be picklable (default is DealerMimic)
+
+    seed : int
+        the seed of the run (default is 0)
+
+    workers : int
+        how many processes to use, 1 plays in this process (default is every core)
+
+    chunk : int
+        how many shoes a process plays at a time (default is 64)
+
+    rules : Rules
+        the rules of the table (default is DEFAULT_RULES)
+
+    hands : int
+        how many spots every Player plays, every one is counted (default is 1)
+    """
+
+    decider = decider if decider is not None else DealerMimic()
+    workers = workers if workers is not None else os.cpu_count() or 1
+    tasks = [(seed, start, min(chunk, shoes - start), seats, decider, rules, hands)
+             for start in range(0, shoes, chunk)]
+    total = Stats()
+    if workers == 1:
+        for task in tasks:
+            total.merge(play_chunk(task))
+        return total
+    with multiprocessing.Pool(workers) as pool:
+        for stats in pool.imap_unordered(play_chunk, tasks):
+            total.merge(stats)
+    return total
+
+
+def play_lane(name, lane, seats, decider, rules, results, seed=0, hands=1):
+    """
+    plays every shoe of one lane of a ShoeRing until the writer stops and puts the Stats on
+    the results queue, runs inside the worker processes, every shoe is dealt from the
+    shared memory it was written to until its cut card and its slot is handed back, a
+    round that runs it out reshuffles the discards into a copy and never writes the slot
+
+    Parameters
+    ----------
+    name : string
+        the name of the ring's shared memory
+
+    lane : int
+        which lane of the ring this worker reads
+
+    seats : int
+        how many Players sit at the table
+
+    decider : Decider
+        makes every choice for the Players
+
+    rules : Rules
+        the rules of the table
+
+    results : Queue
+        where (lane, Stats) is put once the lane is done
+
+    seed : int
+        the seed of the run, every shoe reshuffles its discards with a generator of its own
+        (default is 0)
+
+    hands : int
+        how many spots every Player plays (default is 1)
+    """
+
+    ring = ShoeRing.attach(name)
+    parent = multiprocessing.parent_process()
+    alive = parent.is_alive if parent is not None else None
+    players = [Player(f"Seat {seat + 1}", BANKROLL) for seat in range(seats)]
+    stats = Stats()
+    engine = TalliedEngine(players, decider, rules, stats)
+    try:
+        while True:
+            shoe = ring.get(lane, alive)
+            if shoe is None:
+                break
+            index, codes, cut_card_location = shoe
+            engine.deck = Shoe(rules.decks, ShoeBatch.reshuffle_rng(seed, index), codes,
+                               cut_card_location, rules.cut_card)
+            while not engine.needs_shuffle():
+                engine.play_round(hands=hands)
+                for player in players:
+                    player.balance = BANKROLL
+            engine.deck = None
+            ring.release(lane)
+    finally:
+        ring.close()
+    results.put((lane, stats))
+
+
+def simulate_shared(shoes, seats=1, decider=None, seed=0, workers=None, slots=4,
+                    rules=DEFAULT_RULES, hands=1):
+    """
+    shuffles every shoe in this process into a ShoeRing in shared memory and plays them on
+    worker processes that read them where they were written, shoe i goes to worker i %
+    workers, returns the merged Stats, the same as simulate returns for the same seed
+
+    A worker that dies stops the run with a RuntimeError instead of hanging it, the other
+    workers are stopped and the shared memory is removed either way.
+
+    Parameters
+    ----------
+    shoes : int
+        how many shoes to play, each one until its cut card
+
+    seats : int
+        how many Players sit at the table (default is 1)
+
+    decider : Decider
+        makes every choice for the Players, must be picklable (default is DealerMimic)
+
+    seed : int
+        the seed of the run (default is 0)
+
+    workers : int
+        how many processes to use (default is every core)
+
+    slots : int
+        how many shoes every worker can have waiting (default is 4)
+
+    rules : Rules
+        the rules of the table (default is DEFAULT_RULES)
+
+    hands : int
+        how many spots every Player plays (default is 1)
+    """
+
+    decider = decider if decider is not None else DealerMimic()
+    workers = workers if workers is not None else os.cpu_count() or 1
+    ring = ShoeRing(workers, slots, rules.decks)
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=play_lane, name=f"lane {lane}", daemon=True,
+                                         args=(ring.name, lane, seats, decider, rules,
+                                               results, seed, hands))
+                 for lane in range(workers)]
+    try:
+        for process in processes:
+            process.start()
+        for index in range(shoes):
+            codes, cut_card_location = shuffled_codes(
+                rules.decks, Random(ShoeBatch.stream_seed(seed, index)), rules.cut_card)
+            lane = index % workers
+            ring.put(lane, index, codes, cut_card_location, processes[lane].is_alive)
+        ring.stop()
+        total = Stats()
+        waiting = set(range(workers))
+        while waiting:
+            try:
+                lane, stats = results.get(timeout=0.1)
+            except Empty:
+                for lane in waiting:
+                    if not processes[lane].is_alive():
+                        raise RuntimeError(f"worker {lane} exited with "
+                                           f"{processes[lane].exitcode}") from None
+                continue
+            total.merge(stats)
+            waiting.discard(lane)
+        for process in processes:
+            process.join()
+        return total
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        ring.close()
+        ring.unlink()
+
+
+def main():
+    """
+    runs a simulation from the terminal and prints the results
+    """
+
+    parser = argparse.ArgumentParser(description="Simulate the blackjack table")
+    parser.add_argument("--shoes", type=int, default=1000)
+    parser.add_argument("--seats", type=int, default=1)
+    parser.add_argument("--hands", type=int, default=1, help="spots every seat plays")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--rules", help="JSON or TOML rule set to play")
+    parser.add_argument("--shared", action="store_true",
+                        help="shuffle the shoes here and hand them to the workers in shared "
+                             "memory")
+    args = parser.parse_args()
+    rules = load_rules(args.rules) if args.rules else DEFAULT_RULES
+    run = simulate_shared if args.shared else simulate
+    stats = run(args.shoes, args.seats, seed=args.seed, workers=args.workers, rules=rules,
+                hands=args.hands)
+    for key, value in stats.as_dict().items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
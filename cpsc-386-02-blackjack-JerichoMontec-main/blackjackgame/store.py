@@ -0,0 +1,179 @@
+"""
+module sqlite3 allows the balances to be kept in a table indexed by name, so one Player can
+be looked up or saved without reading or writing everyone else
+
+module pickle allows the balances saved by older versions in player_balances.pkl to be
+moved into the store, it is only imported when there is a file to move
+"""
+
+import sqlite3
+
+
+class BalanceStore:
+    """
+    A class used to represent the saved balance of every Player, kept in an sqlite database
+    in WAL mode with the name as the primary key
+
+    Attributes
+    ----------
+    path : string
+        where the database is saved
+
+    connection : Connection
+        the open connection to the database
+
+    Methods
+    -------
+    get(name)
+        returns the saved balance of a name or None
+
+    put(name, balance)
+        saves the balance of one name
+
+    put_many(players)
+        saves the balance of every Player in one transaction
+
+    commit(entries, balances)
+        saves ledger entries and balances in one transaction
+
+    migrate(pickle_path)
+        moves the balances from an old pickle file into the store, only once
+
+    close()
+        closes the database
+    """
+
+    def __init__(self, path):
+        """
+        Parameters
+        ----------
+        path : string
+            where the database is saved, ":memory:" keeps it in memory
+        """
+
+        self.path = path
+        # The PlayerRegistry of a server reads and writes from every table's thread, it
+        # keeps to one of them at a time itself
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS balances "
+                "(name TEXT PRIMARY KEY, balance INTEGER NOT NULL) WITHOUT ROWID")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS migrations (source TEXT PRIMARY KEY)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS ledger (round INTEGER NOT NULL, name TEXT NOT NULL, "
+                "kind TEXT NOT NULL, bet INTEGER NOT NULL, paid INTEGER NOT NULL)")
+
+    def __len__(self):
+        """
+        returns how many names are saved
+        """
+
+        return self.connection.execute("SELECT COUNT(*) FROM balances").fetchone()[0]
+
+    def get(self, name):
+        """
+        returns the saved balance of a name, None when the name has never been saved
+
+        Parameters
+        ----------
+        name : string
+            the Player's name
+        """
+
+        row = self.connection.execute(
+            "SELECT balance FROM balances WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        return row[0]
+
+    def put(self, name, balance):
+        """
+        saves the balance of one name
+
+        Parameters
+        ----------
+        name : string
+            the Player's name
+
+        balance : int
+            the Player's balance
+        """
+
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO balances (name, balance) VALUES (?, ?)",
+                (name, balance))
+
+    def put_many(self, players):
+        """
+        saves the balance of every Player in one transaction
+
+        Parameters
+        ----------
+        players : list
+            the Players to save
+        """
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO balances (name, balance) VALUES (?, ?)",
+                ((player.name, player.balance) for player in players))
+
+    def commit(self, entries, balances):
+        """
+        saves the entries of a Ledger and the balances they left in one transaction
+
+        Parameters
+        ----------
+        entries : list
+            (round, name, kind, bet, paid) for every entry
+
+        balances : iterable
+            (name, balance) for every Player
+        """
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO ledger (round, name, kind, bet, paid) VALUES (?, ?, ?, ?, ?)",
+                entries)
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO balances (name, balance) VALUES (?, ?)", balances)
+
+    def migrate(self, pickle_path):
+        """
+        moves the balances from a pickle file written by add_to_file before the store
+        existed, names already in the store are kept, the file is only read once
+
+        Parameters
+        ----------
+        pickle_path : string
+            where the old pickle file is saved
+        """
+
+        done = self.connection.execute(
+            "SELECT 1 FROM migrations WHERE source = ?", (pickle_path,)).fetchone()
+        if done is not None:
+            return
+        import pickle  # pylint: disable=import-outside-toplevel
+        try:
+            with open(pickle_path, "rb") as client_info:
+                players = pickle.load(client_info)
+        except (FileNotFoundError, EOFError):
+            players = []
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO balances (name, balance) VALUES (?, ?)",
+                ((player.name, player.balance) for player in players))
+            self.connection.execute(
+                "INSERT INTO migrations (source) VALUES (?)", (pickle_path,))
+
+    def close(self):
+        """
+        closes the database
+        """
+
+        self.connection.close()
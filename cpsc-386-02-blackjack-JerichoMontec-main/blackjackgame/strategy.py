@@ -0,0 +1,265 @@
+"""
+Basic strategy for the rules of this table, 8 decks, the Dealer stands on every 17, double
+down on the first two cards only and no splits, surrender or insurance
+
+The charts are read once when the module is imported into one byte per (hand state, Dealer
+up card) pair, index = state * 11 + value of the up card, so every decision is one lookup.
+A Hi-Lo count can move a few decisions away from basic strategy, those are kept in tables of
+the same shape.
+
+module array allows the charts to be stored as one byte per entry
+
+module deck allows for use of CODE_VALUES and CODE_HI_LO which map a card code to its value
+and its Hi-Lo tag, and the true count of a Shoe
+
+module engine allows for use of the Decider which the strategy answers for
+
+module hand allows for use of the hand states and their tables
+"""
+
+from array import array
+from .deck import CODE_VALUES, CODE_HI_LO
+from .deck import true_count as deck_true_count
+from .engine import Decider
+from .hand import STATES, TOTAL, SOFT, BUST
+
+STAND = 0
+HIT = 1
+DOUBLE = 2  # double down, hit when doubling is not allowed
+DOUBLE_STAND = 3  # double down, stand when doubling is not allowed
+
+LETTERS = {"S": STAND, "H": HIT, "D": DOUBLE, "T": DOUBLE_STAND}
+
+# Rows are the total of the hand, columns the Dealer's up card 2 to 10 then Ace
+HARD_CHART = """
+4  HHHHHHHHHH
+5  HHHHHHHHHH
+6  HHHHHHHHHH
+7  HHHHHHHHHH
+8  HHHHHHHHHH
+9  HDDDDHHHHH
+10 DDDDDDDDHH
+11 DDDDDDDDDH
+12 HHSSSHHHHH
+13 SSSSSHHHHH
+14 SSSSSHHHHH
+15 SSSSSHHHHH
+16 SSSSSHHHHH
+17 SSSSSSSSSS
+18 SSSSSSSSSS
+19 SSSSSSSSSS
+20 SSSSSSSSSS
+21 SSSSSSSSSS
+"""
+
+SOFT_CHART = """
+12 HHHHHHHHHH
+13 HHHDDHHHHH
+14 HHHDDHHHHH
+15 HHDDDHHHHH
+16 HHDDDHHHHH
+17 HDDDDHHHHH
+18 STTTTSSHHH
+19 SSSSSSSSSS
+20 SSSSSSSSSS
+21 SSSSSSSSSS
+"""
+
+# Hi-Lo index plays, (total, up card, true count, action below it, action at or above it)
+DEVIATIONS = (
+    (16, 10, 0, HIT, STAND),
+    (15, 10, 4, HIT, STAND),
+    (10, 10, 4, HIT, DOUBLE),
+    (12, 3, 2, HIT, STAND),
+    (12, 2, 3, HIT, STAND),
+    (11, 1, 1, HIT, DOUBLE),
+    (9, 2, 1, HIT, DOUBLE),
+    (10, 1, 4, HIT, DOUBLE),
+    (9, 7, 3, HIT, DOUBLE),
+    (16, 9, 5, HIT, STAND),
+    (13, 2, -1, HIT, STAND),
+    (12, 4, 0, HIT, STAND),
+    (12, 5, -2, HIT, STAND),
+    (12, 6, -1, HIT, STAND),
+    (13, 3, -2, HIT, STAND),
+)
+
+NO_DEVIATION = 127
+
+
+def _read_chart(chart):
+    """
+    returns a dictionary mapping (total, up card value) to an action from a chart
+    """
+
+    actions = {}
+    for line in chart.split("\n"):
+        if not line:
+            continue
+        total, letters = line.split()
+        for column, letter in enumerate(letters):
+            actions[(int(total), column + 2 if column < 9 else 1)] = LETTERS[letter]
+    return actions
+
+
+def _build_tables():
+    """
+    builds the basic strategy table and the three deviation tables for every hand state
+    """
+
+    hard = _read_chart(HARD_CHART)
+    soft = _read_chart(SOFT_CHART)
+    actions = array("B", bytes(STATES * 11))
+    thresholds = array("b", [NO_DEVIATION] * (STATES * 11))
+    below = array("B", bytes(STATES * 11))
+    above = array("B", bytes(STATES * 11))
+    for state in range(STATES):
+        if state == BUST:
+            continue
+        chart = soft if SOFT[state] else hard
+        total = max(TOTAL[state], 12 if SOFT[state] else 4)
+        for up in range(1, 11):
+            actions[state * 11 + up] = chart.get((total, up), STAND)
+        if SOFT[state]:
+            continue
+        for dev_total, up, count, lower, upper in DEVIATIONS:
+            if TOTAL[state] == dev_total:
+                thresholds[state * 11 + up] = count
+                below[state * 11 + up] = lower
+                above[state * 11 + up] = upper
+    return actions, thresholds, below, above
+
+
+ACTIONS, THRESHOLDS, BELOW, ABOVE = _build_tables()
+
+
+def action(state, up_value, true_count=None):
+    """
+    returns STAND, HIT, DOUBLE or DOUBLE_STAND for a hand against the Dealer's up card
+
+    Parameters
+    ----------
+    state : int
+        the state of the hand
+
+    up_value : int
+        the value of the Dealer's up card, 1 for an Ace
+
+    true_count : float
+        the Hi-Lo true count, None plays basic strategy (default is None)
+    """
+
+    index = state * 11 + up_value
+    if true_count is None or THRESHOLDS[index] == NO_DEVIATION:
+        return ACTIONS[index]
+    if true_count >= THRESHOLDS[index]:
+        return ABOVE[index]
+    return BELOW[index]
+
+
+def running_count(shoe):
+    """
+    returns the Hi-Lo running count of every card dealt from a Shoe, the Shoe keeps it up
+    to date on every draw
+
+    Parameters
+    ----------
+    shoe : Shoe
+        the Shoe being counted
+    """
+
+    return shoe.running_count
+
+
+def true_count(shoe, running=None):
+    """
+    returns the running count divided by the number of decks left in the Shoe
+
+    Parameters
+    ----------
+    shoe : Shoe
+        the Shoe being counted
+
+    running : int
+        the running count, counted from the Shoe when not given
+    """
+
+    if running is None:
+        running = shoe.running_count
+    return deck_true_count(running, len(shoe.codes) - shoe.cursor)
+
+
+class BasicStrategy(Decider):
+    """
+    A Decider that plays basic strategy, and the Hi-Lo index plays when it counts
+
+    Attributes
+    ----------
+    counting : bool
+        True to move away from basic strategy with the true count of the Shoe
+
+    shoe : Shoe
+        the Shoe being dealt from, given by the Engine at the start of every round
+
+    Methods
+    -------
+    new_round(shoe)
+        remembers the Shoe so the count can be taken
+
+    decide(player, dealer)
+        returns the action for the Player's hand
+
+    double_down(player, dealer)
+        returns True when the action is DOUBLE or DOUBLE_STAND
+
+    hit(player, dealer)
+        returns True when the action is HIT, or DOUBLE when doubling is no longer allowed
+    """
+
+    def __init__(self, counting=False):
+        """
+        Parameters
+        ----------
+        counting : bool
+            True to use the Hi-Lo index plays (default is False)
+        """
+
+        self.counting = counting
+        self.shoe = None
+
+    def new_round(self, shoe):
+        """
+        remembers the Shoe so the count can be taken when a decision is made
+        """
+
+        self.shoe = shoe
+
+    def decide(self, player, dealer):
+        """
+        returns the action for the Player's hand against the Dealer's up card, the hidden
+        card is left out of the count
+        """
+
+        dealer_cards = dealer.hand.cards
+        up_value = CODE_VALUES[dealer_cards[0]]
+        count = None
+        if self.counting and self.shoe is not None:
+            hidden = CODE_HI_LO[dealer_cards[1]]
+            count = true_count(self.shoe, self.shoe.running_count - hidden)
+        return action(player.hand.state, up_value, count)
+
+    def double_down(self, player, dealer):
+        """
+        returns True when the action is DOUBLE or DOUBLE_STAND
+        """
+
+        return self.decide(player, dealer) >= DOUBLE
+
+    def hit(self, player, dealer):
+        """
+        returns True when the action is HIT, a DOUBLE becomes a hit once doubling is not
+        allowed and a DOUBLE_STAND becomes a stand
+        """
+
+        decision = self.decide(player, dealer)
+        return decision in (HIT, DOUBLE)
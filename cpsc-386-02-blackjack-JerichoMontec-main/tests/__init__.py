@@ -0,0 +1,3 @@
+"""
+Tests of the blackjackgame package, run with python -m unittest from the top of the project
+"""
@@ -0,0 +1,95 @@
+"""
+Smoke tests of the benchmarks, every benchmark runs for a moment and the results are written
+and compared the way two runs would be
+
+module contextlib and io allow what the benchmarks print to be read back
+
+module importlib allows the benchmark script to be loaded from its file
+
+module json, os, sys and tempfile allow the results to be written to a throwaway file and
+read back
+
+module unittest allows for use of TestCase
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks", "run.py")
+SPEC = importlib.util.spec_from_file_location("benchmarks_run", PATH)
+run = importlib.util.module_from_spec(SPEC)
+SPEC.loader.exec_module(run)
+
+
+class TestBenchmarks(unittest.TestCase):
+    """
+    Tests that every benchmark gives positive numbers
+    """
+
+    def check(self, numbers):
+        """
+        asserts every number a benchmark gave is positive
+        """
+
+        self.assertTrue(numbers)
+        for key, value in numbers.items():
+            self.assertGreater(value, 0, key)
+
+    def test_throughput(self):
+        for bench in (run.bench_hands, run.bench_draws, run.bench_reshuffles,
+                      run.bench_handoffs, run.bench_evaluations):
+            with self.subTest(bench=bench.__name__):
+                self.check(bench(0.01))
+        self.check(run.bench_hands(0.01, run.compile_rules(run.VARIANT)))
+
+    def test_store(self):
+        self.check(run.bench_store(100, 10))
+
+    def test_cold_start(self):
+        self.check(run.bench_cold_start(1))
+
+
+class TestMain(unittest.TestCase):
+    """
+    Tests of writing the results and comparing them with a baseline
+    """
+
+    def test_out_and_baseline(self):
+        with tempfile.TemporaryDirectory() as directory:
+            before = os.path.join(directory, "before.json")
+            after = os.path.join(directory, "after.json")
+            arguments = ["run.py", "--seconds", "0.01", "--players", "100", "--lookups", "10",
+                         "--starts", "1"]
+            printed = io.StringIO()
+            old_argv = sys.argv
+            try:
+                sys.argv = arguments + ["--out", before]
+                run.main()
+                sys.argv = arguments + ["--out", after, "--baseline", before]
+                with contextlib.redirect_stdout(printed):
+                    run.main()
+            finally:
+                sys.argv = old_argv
+            with open(after, encoding="utf-8") as results:
+                benchmarks = json.load(results)["benchmarks"]
+        self.assertEqual(set(benchmarks), {"hands", "hands_variant", "draws", "reshuffles",
+                                           "handoffs", "evaluations", "cold_start",
+                                           "store_100"})
+        self.assertIn("hands.hands_per_sec: ", printed.getvalue())
+
+    def test_compare_skips_missing(self):
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            run.compare({"benchmarks": {"draws": {"draws_per_sec": 30.0, "peak_kib": 1.0}}},
+                        {"benchmarks": {"draws": {"draws_per_sec": 20.0, "peak_kib": 0}}})
+        self.assertEqual(printed.getvalue(), "draws.draws_per_sec: 1.500x\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
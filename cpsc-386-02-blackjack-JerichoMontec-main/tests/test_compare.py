@@ -0,0 +1,70 @@
+"""
+Tests of comparing strategies on the same shoes, every strategy starts every round on the
+same cards and a strategy compared with itself makes no difference at all
+
+module unittest allows for use of TestCase
+
+module blackjackgame allows for use of the comparison, the Deciders and the rules
+"""
+
+import unittest
+from blackjackgame.compare import compare
+from blackjackgame.engine import DealerMimic
+from blackjackgame.rules import compile_rules
+from blackjackgame.strategy import BasicStrategy
+
+
+class Starts(DealerMimic):
+    """
+    A DealerMimic that keeps the cards every round starts on, and splits every pair and hits
+    until 21 or a bust when it is greedy
+
+    Attributes
+    ----------
+    greedy : bool
+        True to split every pair and hit every hand
+
+    starts : list
+        the first cards left in the shoe at the start of every round
+    """
+
+    def __init__(self, greedy):
+        self.greedy = greedy
+        self.starts = []
+
+    def new_round(self, shoe):
+        self.starts.append(bytes(shoe.codes[shoe.cursor:shoe.cursor + 12]))
+
+    def split(self, player, dealer):
+        return self.greedy
+
+    def hit(self, player, dealer):
+        return self.greedy or super().hit(player, dealer)
+
+
+class TestCompare(unittest.TestCase):
+    """
+    Tests of the pairing of the strategies
+    """
+
+    def test_same_strategy_has_no_difference(self):
+        comparison = compare([BasicStrategy(), BasicStrategy()], 40, seats=2, seed=2,
+                             workers=2, chunk=7)
+        difference = comparison.difference(1)
+        self.assertEqual(difference.difference, 0.0)
+        self.assertEqual((difference.low, difference.high), (0.0, 0.0))
+        self.assertEqual(list(comparison.nets[0]), list(comparison.nets[1]))
+
+    def test_rounds_start_on_the_same_cards(self):
+        # A cut card deeper than compile_rules allows lets four greedy seats run a one deck
+        # shoe out while the others are still short of the cut card
+        rules = compile_rules({"decks": 1, "splits": True})._replace(cut_card=(36, 40))
+        mimic, greedy = Starts(False), Starts(True)
+        comparison = compare([mimic, greedy], 20, seats=4, seed=0, workers=1, rules=rules)
+        self.assertEqual(len(mimic.starts), len(greedy.starts))
+        self.assertEqual(mimic.starts, greedy.starts)
+        self.assertGreater(sum(comparison.hands[1]), sum(comparison.hands[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,312 @@
+"""
+Tests of the Deck and of the shoe the Engine deals from, no card is lost or made up however
+many times they are shuffled and no round runs out of cards
+
+module random allows every shoe to be shuffled by a seeded generator
+
+module unittest allows for use of TestCase
+
+module blackjackgame allows for use of the Deck, the Shoe, the ShoeBatch and the ShoeRing
+whose views a Shoe can deal from, the Engine, the Player, the rules and the true count the
+strategy reads
+"""
+
+import unittest
+from random import Random
+from blackjackgame.batch import ShoeBatch
+from blackjackgame.deck import Deck, Shoe, CODE_HI_LO, count_ranks, shoe_codes, \
+    shuffled_codes
+from blackjackgame.engine import Engine
+from blackjackgame.player import Player
+from blackjackgame.ring import ShoeRing
+from blackjackgame.rules import compile_rules
+from blackjackgame.strategy import true_count
+
+
+def play(rules, seats, rounds, seed=0):
+    """
+    plays rounds at a table of the given rules and returns its Engine
+    """
+
+    players = [Player(f"Seat {seat + 1}", 10 ** 12) for seat in range(seats)]
+    engine = Engine(players, rules=rules, rng=Random(seed))
+    for _ in range(rounds):
+        engine.play_round()
+    return engine
+
+
+def soak_deck(seed, rounds=20000):
+    """
+    deals rounds of two to four cards to two Players from one Deck, shuffling it once
+    fewer than 15 cards are left, and returns the Deck and how many times it was shuffled
+    """
+
+    rng = Random(seed)
+    deck = Deck(rng)
+    deck.deck_shuffle()
+    players = [Player("al", 10000), Player("bo", 10000)]
+    shuffles = 0
+    for _ in range(rounds):
+        if len(deck.cards) < 15:
+            deck.deck_shuffle()
+            shuffles += 1
+            assert sorted(deck.cards) == sorted(Deck.template), "the deck changed"
+            assert deck.rank_counts == [4] * 13, "the rank counts are off"
+        for player in players:
+            for _ in range(rng.randint(2, 4)):
+                player.draw_card(deck)
+        for player in players:
+            deck.discard_hands(player)
+        assert len(deck.cards) + len(deck.discards) == 52, "a card was lost or added"
+    return deck, shuffles
+
+
+def soak_shoe(seed, rounds=20000):
+    """
+    plays rounds with two seats at an Engine, checking the shoe every time it is shuffled,
+    and returns the Engine
+    """
+
+    engine = Engine([Player("al", 10 ** 12), Player("bo", 10 ** 12)], rng=Random(seed))
+    full = sorted(shoe_codes(8))
+    shoes = 0
+    for _ in range(rounds):
+        engine.play_round()
+        if engine.shoe_number != shoes:
+            shoes = engine.shoe_number
+            deck = engine.deck
+            codes = list(deck.codes)
+            del codes[deck.cut_card_location]
+            assert sorted(codes) == full, "the shoe changed"
+    return engine
+
+
+class TestDeck(unittest.TestCase):
+    """
+    Tests of drawing from a Deck, discarding the hands and shuffling the discards back in
+    """
+
+    def test_shuffle_after_a_round(self):
+        deck = Deck(Random(0))
+        player = Player("al", 10000)
+        for _ in range(3):
+            player.draw_card(deck)
+        deck.discard_hands(player)
+        self.assertEqual(len(deck.discards), 3)
+        deck.deck_shuffle()
+        self.assertEqual(len(deck.cards), 52)
+        self.assertEqual(deck.rank_counts, [4] * 13)
+
+    def test_soak(self):
+        deck, shuffles = soak_deck(5)
+        self.assertGreater(shuffles, 1000)
+        again, _ = soak_deck(5)
+        self.assertEqual(deck.cards, again.cards)
+
+
+class TestShoeDraw(unittest.TestCase):
+    """
+    Tests of dealing from the Shoe by moving its cursor, no card is moved or copied
+    """
+
+    def test_draws_in_order(self):
+        shoe = Shoe(8, Random(0))
+        codes = bytes(shoe.codes)
+        player = Player("al", 10000)
+        for index in range(5):
+            player.draw_card(shoe)
+            self.assertEqual(shoe.cursor, index + 1)
+        self.assertEqual(bytes(player.current_hand), codes[:5])
+        self.assertIs(shoe.draw(), Deck.by_code[codes[5]])
+        self.assertEqual(bytes(shoe.codes), codes)
+
+    def test_discards_stay_behind_the_cursor(self):
+        shoe = Shoe(1, Random(0))
+        player = Player("al", 10000)
+        for _ in range(3):
+            player.draw_card(shoe)
+        shoe.discard_hands(player)
+        self.assertEqual(len(player.current_hand), 0)
+        self.assertEqual(shoe.cursor, 3)
+        self.assertEqual(len(shoe.codes), 53)
+
+    def test_cut_card(self):
+        shoe = Shoe(1, Random(0), cut_card=compile_rules({"decks": 1}).cut_card)
+        while shoe.cursor <= shoe.cut_card_location:
+            self.assertFalse(shoe.needs_shuffle())
+            shoe.draw_code()
+        self.assertTrue(shoe.needs_shuffle())
+        shoe.shuffle()
+        self.assertEqual(shoe.cursor, 0)
+        self.assertFalse(shoe.needs_shuffle())
+        codes = list(shoe.codes)
+        del codes[shoe.cut_card_location]
+        self.assertEqual(sorted(codes), sorted(shoe_codes(1)))
+
+
+class TestShoeSoak(unittest.TestCase):
+    """
+    20000 rounds over hundreds of reshuffles of the Engine's shoe
+    """
+
+    def test_soak(self):
+        engine = soak_shoe(5)
+        self.assertGreater(engine.shoe_number, 300)
+        again = soak_shoe(5)
+        self.assertEqual(engine.deck.codes, again.deck.codes)
+        self.assertEqual(engine.seats[0].balance, again.seats[0].balance)
+
+
+class TestShoe(unittest.TestCase):
+    """
+    Tests of the cut card of small shoes and of a shoe that runs out in the middle of a
+    round
+    """
+
+    def test_single_deck_full_table(self):
+        engine = play(compile_rules({"decks": 1}), 5, 5000)
+        self.assertEqual(engine.round_number, 5000)
+
+    def test_single_deck_one_seat(self):
+        engine = play(compile_rules({"decks": 1}), 1, 50000)
+        self.assertEqual(engine.round_number, 50000)
+
+    def test_penetration_too_deep(self):
+        with self.assertRaises(ValueError):
+            compile_rules({"decks": 1, "penetration": 0.95})
+        with self.assertRaises(ValueError):
+            compile_rules({"decks": 8, "penetration": [0.5, 0.95]})
+
+    def test_reshuffle_discards(self):
+        shoe = Shoe(1, Random(1), cut_card=(52, 52))
+        cards = sorted(shoe.codes)
+        for _ in range(40):
+            shoe.draw_code()
+        shoe.round_start = shoe.cursor
+        drawn = [shoe.draw_code() for _ in range(30)]
+        self.assertEqual(shoe.cursor, 30)
+        self.assertTrue(shoe.needs_shuffle())
+        self.assertEqual(sorted(shoe.codes), cards)
+        self.assertEqual(list(shoe.codes[:30]), drawn)
+        self.assertEqual(shoe.rank_counts, count_ranks(shoe.codes[30:]))
+        shoe.shuffle()
+        codes = list(shoe.codes)
+        del codes[shoe.cut_card_location]
+        self.assertEqual(sorted(codes), sorted(shoe_codes(1)))
+
+    def check_reshuffle(self, shoe, row):
+        """
+        deals a Shoe over a view past its cut card, shuffles it and checks the Shoe holds
+        every card again and the view was left as it was
+        """
+
+        before = bytes(row)
+        while not shoe.needs_shuffle():
+            shoe.draw_code()
+        shoe.shuffle()
+        codes = list(shoe.codes)
+        del codes[shoe.cut_card_location]
+        self.assertEqual(sorted(codes), sorted(shoe_codes(8)))
+        self.assertEqual(bytes(row), before)
+        self.assertEqual(shoe.cursor, 0)
+
+    def test_reshuffle_batch_shoe(self):
+        batch = ShoeBatch(2, seed=1)
+        self.check_reshuffle(batch.shoe(0), batch.row(0))
+
+    def test_reshuffle_ring_shoe(self):
+        ring = ShoeRing(1, slots=2)
+        try:
+            codes, cut_card_location = shuffled_codes(8, Random(1))
+            ring.put(0, 0, codes, cut_card_location)
+            _, row, cut_card_location = ring.get(0)
+            self.check_reshuffle(Shoe(codes=row, cut_card_location=cut_card_location), row)
+            ring.release(0)
+        finally:
+            ring.close()
+            ring.unlink()
+
+    def test_whole_shoe_on_the_table(self):
+        shoe = Shoe(1, Random(1), cut_card=(52, 52))
+        for _ in range(53):
+            shoe.draw_code()
+        with self.assertRaises(RuntimeError):
+            shoe.draw_code()
+
+
+class TestCount(unittest.TestCase):
+    """
+    Tests of the rank counts and the Hi-Lo count kept on every draw, against counting the
+    shoe again from the start
+    """
+
+    def check(self, shoe):
+        """
+        asserts the counts of a Shoe are the ones of the cards from its cursor on and of the
+        cards behind it
+        """
+
+        left = shoe.codes[shoe.cursor:]
+        running = sum(CODE_HI_LO[code] for code in shoe.codes[:shoe.cursor])
+        count = shoe.snapshot()
+        self.assertEqual(shoe.rank_counts, count_ranks(left))
+        self.assertEqual(count, (tuple(shoe.rank_counts), len(left), running,
+                                 running / (max(len(left), 26) / 52)))
+        self.assertEqual(true_count(shoe), count.true_count)
+
+    def test_draws(self):
+        shoe = Shoe(2, Random(3))
+        self.check(shoe)
+        self.assertEqual(shoe.snapshot().true_count, 0)
+        for _ in range(80):
+            shoe.draw_code()
+            self.check(shoe)
+
+    def test_few_cards_left(self):
+        shoe = Shoe(1, Random(3), cut_card=(52, 52))
+        for _ in range(45):
+            shoe.draw_code()
+        count = shoe.snapshot()
+        self.assertEqual(count.cards_left, 8)
+        self.assertEqual(count.true_count, count.running_count * 2)
+
+    def test_after_reshuffle_discards(self):
+        shoe = Shoe(1, Random(1), cut_card=(52, 52))
+        for _ in range(40):
+            shoe.draw_code()
+        shoe.round_start = shoe.cursor
+        for _ in range(30):
+            shoe.draw_code()
+            self.check(shoe)
+        self.assertEqual(shoe.cursor, 30)
+
+    def test_after_shuffle(self):
+        shoe = Shoe(1, Random(2), cut_card=compile_rules({"decks": 1}).cut_card)
+        while not shoe.needs_shuffle():
+            shoe.draw_code()
+        shoe.shuffle()
+        self.check(shoe)
+        self.assertEqual(shoe.running_count, 0)
+        for _ in range(10):
+            shoe.draw_code()
+        self.check(shoe)
+
+    def test_deck(self):
+        deck = Deck(Random(0))
+        deck.deck_shuffle()
+        player = Player("al", 10000)
+        for _ in range(30):
+            player.draw_card(deck)
+        running = sum(CODE_HI_LO[Deck.codes[card]] for card in deck.discards)
+        count = deck.snapshot()
+        self.assertEqual(count.rank_counts,
+                         tuple(count_ranks(Deck.codes[card] for card in deck.cards)))
+        self.assertEqual(count.running_count, running)
+        self.assertEqual(count.true_count, running * 2)
+        deck.discard_hands(player)
+        deck.deck_shuffle()
+        self.assertEqual(deck.snapshot(), ((4,) * 13, 52, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
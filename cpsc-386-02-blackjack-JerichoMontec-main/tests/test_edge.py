@@ -0,0 +1,45 @@
+"""
+Tests of the exact house edge, against the edge of this table's rules with an infinite deck
+and with the Dealer's subproblems kept from one up card to the next
+
+module unittest allows for use of TestCase
+
+module blackjackgame allows for use of the house edge, one up card of it and the caches of
+the probabilities
+"""
+
+import unittest
+from blackjackgame.edge import house_edge, up_card_ev
+from blackjackgame.probability import cache_info, clear_cache
+
+# The expected value of a hand of this table with an infinite deck, S17, no peek, 1:1
+# blackjacks, double on any two cards and no splits
+INFINITE_EV = -0.0340
+
+
+class TestHouseEdge(unittest.TestCase):
+    """
+    Tests of the house edge of an infinite deck and of a single deck shoe
+    """
+
+    def test_infinite_deck(self):
+        edge = house_edge(None, workers=1)
+        self.assertAlmostEqual(edge.ev, INFINITE_EV, delta=0.0005)
+        self.assertEqual(edge.house_edge, -edge.ev)
+        self.assertEqual([up_card.up_value for up_card in edge.up_cards], list(range(1, 11)))
+        self.assertAlmostEqual(sum(up_card.chance for up_card in edge.up_cards), 1.0)
+
+    def test_dealer_cache_is_kept(self):
+        clear_cache()
+        cold = up_card_ev((3, 1))
+        cold_misses = cache_info()["dealer"].misses
+        clear_cache()
+        up_card_ev((2, 1))
+        self.assertEqual(cache_info()["stand"].currsize, 0)
+        misses = cache_info()["dealer"].misses
+        warm = up_card_ev((3, 1))
+        self.assertLess(cache_info()["dealer"].misses - misses, cold_misses / 2)
+        self.assertEqual(warm.ev, cold.ev)
+
+if __name__ == "__main__":
+    unittest.main()
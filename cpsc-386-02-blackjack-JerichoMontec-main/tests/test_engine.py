@@ -0,0 +1,91 @@
+"""
+Tests of settling a round, every Hand of a seat is paid before a Player that lost everything
+is given a donation
+
+module unittest allows for use of TestCase
+
+module blackjackgame allows for use of the Engine, the Player, the Hand and the Ledger
+"""
+
+import unittest
+from blackjackgame.deck import CODE_VALUES
+from blackjackgame.engine import Engine, WIN, PUSH, LOSE
+from blackjackgame.hand import Hand
+from blackjackgame.player import Player
+
+
+def code(value):
+    """
+    returns the code of a card with the given value
+    """
+
+    return CODE_VALUES.index(value)
+
+
+class RecordingLedger:
+    """
+    A class used to stand in for the Ledger, it keeps every entry it is given
+    """
+
+    def __init__(self):
+        self.entries = []
+
+    def record(self, number, name, bet, result, winnings):
+        self.entries.append(("hand", name, bet, result, winnings))
+
+    def donate(self, number, name, donation):
+        self.entries.append(("donation", name, donation))
+
+
+class TestSettle(unittest.TestCase):
+    """
+    Tests of Engine.settle for a seat holding two Hands of 100 with a balance of 0 left
+    """
+
+    def settle(self, first, second):
+        """
+        settles two Hands with the given values of their last cards against a Dealer's 18
+        and returns the Player and the ledger entries
+        """
+
+        player = Player("al", 200)
+        ledger = RecordingLedger()
+        engine = Engine([player], ledger=ledger)
+        player.add_bet(100)
+        player.hand.add(code(10))
+        player.hand.add(code(first))
+        other = Hand(100)
+        other.add(code(10))
+        other.add(code(second))
+        player.subtract_balance(100)
+        player.hands.append(other)
+        engine.dealer.hand.add(code(10))
+        engine.dealer.hand.add(code(8))
+        return player, engine.settle(player), ledger.entries
+
+    def test_loss_then_win(self):
+        player, result, entries = self.settle(6, 10)
+        self.assertEqual(player.balance, 200)
+        self.assertEqual(result, PUSH)
+        self.assertEqual([entry[0] for entry in entries], ["hand", "hand"])
+
+    def test_win_then_loss(self):
+        player, _, _ = self.settle(10, 6)
+        self.assertEqual(player.balance, 200)
+
+    def test_both_lose(self):
+        player, result, entries = self.settle(6, 7)
+        self.assertEqual(result, LOSE)
+        self.assertEqual(player.balance, 10000)
+        self.assertEqual(entries[-1], ("donation", "al", 10000))
+        self.assertEqual([entry[0] for entry in entries].count("donation"), 1)
+
+    def test_both_win(self):
+        player, result, entries = self.settle(10, 10)
+        self.assertEqual(result, WIN)
+        self.assertEqual(player.balance, 400)
+        self.assertEqual(len(entries), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
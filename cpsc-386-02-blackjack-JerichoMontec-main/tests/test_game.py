@@ -0,0 +1,100 @@
+"""
+Tests of the terminal Game played by a Prompter instead of the keyboard
+
+module os allows the Game to keep no hand history
+
+module random allows the Game to be shuffled by a seeded generator
+
+module unittest allows for use of TestCase
+
+module blackjackgame allows for use of the Game, the BalanceStore, the HandLog, the
+BufferedRenderer and the Prompter with its kinds of questions
+"""
+
+import os
+import unittest
+from random import Random
+from blackjackgame.game import Game
+from blackjackgame.history import HandLog
+from blackjackgame.prompts import Prompter, PLAYERS, NAME, BET, AGAIN
+from blackjackgame.render import BufferedRenderer
+from blackjackgame.store import BalanceStore
+
+
+class Answers(Prompter):
+    """
+    A Prompter that gives the names it is handed in order, bets 10, gives the answers it
+    is handed to going again and says no to everything else
+
+    Attributes
+    ----------
+    players : int
+        how many Players sit down
+
+    names : list
+        the names left to give
+
+    again : list
+        the answers left to give when asked to go again, no once they run out
+
+    asked : list
+        the kind of every question
+    """
+
+    def __init__(self, players, names, again=()):
+        self.players = players
+        self.names = list(names)
+        self.again = list(again)
+        self.asked = []
+
+    def ask(self, kind, text):
+        self.asked.append(kind)
+        if kind == PLAYERS:
+            return str(self.players)
+        if kind == NAME:
+            return self.names.pop(0)
+        if kind == BET:
+            return "10"
+        if kind == AGAIN and self.again:
+            return self.again.pop(0)
+        return "n"
+
+
+class TestGame(unittest.TestCase):
+    """
+    Tests of seating the Players of a Game
+    """
+
+    def play(self, prompter):
+        """
+        plays a Game with the Prompter and returns the Game and what it showed
+        """
+
+        renderer = BufferedRenderer()
+        game = Game(BalanceStore(":memory:"), renderer, HandLog(os.devnull),
+                    prompter=prompter, rng=Random(0))
+        game.run()
+        return game, [message for message, _ in renderer.drain()]
+
+    def test_same_name_is_asked_again(self):
+        prompter = Answers(2, ["al", "al", "bo"])
+        game, shown = self.play(prompter)
+        self.assertEqual(prompter.asked.count(NAME), 3)
+        self.assertIn("al is already playing, please pick another name.", shown)
+        self.assertEqual(prompter.asked.count(BET), 2)
+        store = game.open_store()
+        self.assertIsNotNone(store.get("al"))
+        self.assertIsNotNone(store.get("bo"))
+        self.assertFalse(game.registry.is_seated("al"))
+
+    def test_play_again_is_asked_until_y_or_n(self):
+        prompter = Answers(1, ["al"], ["maybe", ""])
+        _, shown = self.play(prompter)
+        self.assertEqual(prompter.asked.count(AGAIN), 3)
+        self.assertEqual(prompter.asked.count(BET), 1)
+        rounds = [message for message in shown if message.startswith("al has $")]
+        self.assertEqual(len(rounds), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Tests of the hand state tables against the way a hand used to be added up card by card,
+an ace counting as 11 until that busts the hand
+
+module unittest allows for use of TestCase
+
+module array allows a batch of hands to be held the way advance takes them
+
+module blackjackgame allows for use of the hand state tables, the Hand and the card codes
+"""
+
+import unittest
+from array import array
+from blackjackgame.deck import CODE_VALUES
+from blackjackgame.hand import NEXT, TOTAL, SOFT, BUST, EMPTY, Hand, advance, totals, \
+    is_blackjack
+
+
+def check_value(values):
+    """
+    returns the total of a hand the way Player.check_value did before the tables, every ace
+    is 11 and one is taken back down to 1 every time the hand goes over 21
+    """
+
+    value = 0
+    number_of_aces = 0
+    for card in values:
+        if card == 1:
+            value = value + 10
+            number_of_aces = number_of_aces + 1
+        value = value + card
+        for _ in range(number_of_aces):
+            if value > 21:
+                value = value - 10
+                number_of_aces = number_of_aces - 1
+    return value
+
+
+def code(value):
+    """
+    returns the code of a card with the given value
+    """
+
+    return CODE_VALUES.index(value)
+
+
+class TestTables(unittest.TestCase):
+    """
+    Tests of NEXT, TOTAL and SOFT for every hand of up to six cards
+    """
+
+    def check(self, values, state):
+        """
+        checks one hand and every hand that can be made from it by drawing another card
+        """
+
+        value = check_value(values)
+        if value > 21:
+            self.assertEqual(state, BUST, values)
+            self.assertEqual(TOTAL[state], 22)
+            return
+        self.assertEqual(TOTAL[state], value, values)
+        self.assertEqual(SOFT[state], int(value != sum(values)), values)
+        if len(values) < 6:
+            for card in range(1, 11):
+                self.check(values + [card], NEXT[state * 11 + card])
+
+    def test_every_hand(self):
+        self.check([], EMPTY)
+
+    def test_soft_aces(self):
+        for values, total, soft in (([1, 6], 17, 1), ([1, 6, 10], 17, 0), ([1, 1], 12, 1),
+                                    ([1, 1, 9], 21, 1), ([1, 5, 1, 4], 21, 1),
+                                    ([1, 10], 21, 1), ([1, 1, 10, 10], 22, 0)):
+            state = EMPTY
+            for value in values:
+                state = NEXT[state * 11 + value]
+            self.assertEqual((TOTAL[state], SOFT[state]), (total, soft), values)
+
+    def test_hand(self):
+        hand = Hand()
+        for value in (1, 10):
+            hand.add(code(value))
+        self.assertEqual(hand.value(), 21)
+        self.assertTrue(is_blackjack(hand.state, len(hand.cards)))
+        hand.add(code(5))
+        self.assertEqual(hand.value(), 16)
+        self.assertFalse(is_blackjack(hand.state, len(hand.cards)))
+
+    def test_batch(self):
+        hands = [[1, 6], [10, 10], [1, 1], [9, 5]]
+        draws = [10, 2, 9, 8]
+        states = array("B", [EMPTY] * len(hands))
+        for column in range(2):
+            states = advance(states, array("B", (code(hand[column]) for hand in hands)))
+        states = advance(states, array("B", map(code, draws)))
+        expected = [min(check_value(hand + [draw]), 22) for hand, draw in zip(hands, draws)]
+        self.assertEqual(list(totals(states)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+Tests of the hand history, a round is read back the way it was written and the decisions
+of every hand are the ones that were made, so the rounds can be played again from the log
+
+module os allows the log of a replay to be compared with the log it was played from
+
+module tempfile allows every test to write its own log
+
+module unittest allows for use of TestCase
+
+module array allows the cards of a stacked shoe to be laid out
+
+module random allows the shoes and the decisions to be repeated
+
+module blackjackgame allows for use of the Engine, the Player, the hand history, a Shoe
+and the rules
+"""
+
+import os
+import tempfile
+import unittest
+from array import array
+from random import Random
+from blackjackgame.deck import Shoe, CODE_VALUES
+from blackjackgame.engine import Engine, Decider, WIN, LOSE
+from blackjackgame.history import HandLog, HandReader, SeatHand, encode, decode, HIT, \
+    DOUBLE_DOWN
+from blackjackgame.player import Player
+from blackjackgame.rules import compile_rules
+
+
+class RandomDecider(Decider):
+    """
+    A Decider that doubles down and hits at random, from a generator of its own
+    """
+
+    def __init__(self, seed):
+        self.rng = Random(seed)
+
+    def double_down(self, player, dealer):
+        return self.rng.random() < 0.2
+
+    def hit(self, player, dealer):
+        return self.rng.random() < 0.5
+
+
+class ReplayDecider(Decider):
+    """
+    A Decider that gives the answers read back from a hand history, round by round
+    """
+
+    def __init__(self, hands):
+        self.hands = iter(hands)
+        self.answers = []
+
+    def new_round(self, shoe):
+        self.answers = list(b"".join(seat.decisions for seat in next(self.hands).seats))
+
+    def double_down(self, player, dealer):
+        if self.answers[0] == DOUBLE_DOWN:
+            del self.answers[0]
+            return True
+        return False
+
+    def hit(self, player, dealer):
+        return self.answers.pop(0) == HIT
+
+
+class TestEncode(unittest.TestCase):
+    """
+    Tests of encoding one round and decoding it again
+    """
+
+    def test_round_trip(self):
+        seats = [SeatHand("al", 100, WIN, bytes([1, 40]), b"S"),
+                 SeatHand("bo", 200, LOSE, bytes([2, 3, 4]), b"PHS")]
+        dealer = bytes([10, 20, 30])
+        hand = decode(encode(4, 17, dealer, seats))
+        self.assertEqual((hand.shoe, hand.round, hand.dealer), (4, 17, dealer))
+        self.assertEqual(hand.seats, seats)
+
+    def test_long_name_keeps_whole_characters(self):
+        seat = SeatHand("é" * 200, 1, WIN, bytes([1, 2]), b"S")
+        name = decode(encode(1, 1, b"", [seat])).seats[0].name
+        self.assertEqual(name, "é" * 127)
+
+
+class TestReplay(unittest.TestCase):
+    """
+    Tests of rounds recorded by the Engine and played again from the log
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def play(self, name, decider, rounds, rules=None, deck=None):
+        """
+        plays rounds for two seats on a shoe shuffled from seed 5 and returns where the log
+        was written
+        """
+
+        rules = rules if rules is not None else compile_rules({})
+        path = os.path.join(self.directory.name, name)
+        log = HandLog(path)
+        players = [Player("al", 10000), Player("bo", 10000)][:1 if deck else 2]
+        engine = Engine(players, decider, rules=rules, history=log, rng=Random(5))
+        engine.deck = deck
+        for _ in range(rounds):
+            engine.play_round(bet=10)
+        log.close()
+        return path
+
+    def test_replay_matches(self):
+        original = self.play("original.bjh", RandomDecider(1), 200)
+        with HandReader(original) as reader:
+            hands = list(reader)
+        replay = self.play("replay.bjh", ReplayDecider(hands), 200)
+        with open(original, "rb") as first, open(replay, "rb") as second:
+            self.assertEqual(first.read(), second.read())
+
+    def test_split_decisions(self):
+        rules = compile_rules({"decks": 1, "splits": True})
+        codes = list(range(52))
+        # Eights to the seat, 10 and 7 to the Dealer, 2 and 5 for the first split Hand,
+        # 3 and 9 for the second
+        top = [codes.pop([CODE_VALUES[code] for code in codes].index(value))
+               for value in (8, 10, 8, 7, 2, 5, 3, 9)]
+        deck = Shoe(1, Random(0), array("B", top + codes), 40, rules.cut_card)
+
+        class Splitter(Decider):
+            """
+            splits, hits the first Hand once and doubles down on the second
+            """
+
+            def split(self, player, dealer):
+                return True
+
+            def double_down(self, player, dealer):
+                return len(player.hands) == 2 and player.hand is player.hands[1]
+
+            def hit(self, player, dealer):
+                return player.check_value() < 15
+
+        path = self.play("split.bjh", Splitter(), 1, rules, deck)
+        with HandReader(path) as reader:
+            seats = next(iter(reader)).seats
+        self.assertEqual([seat.decisions for seat in seats], [b"PHS", b"PD"])
+        self.assertEqual([len(seat.cards) for seat in seats], [3, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
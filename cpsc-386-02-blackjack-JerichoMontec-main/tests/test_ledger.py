@@ -0,0 +1,102 @@
+"""
+Tests of the Ledger's writer, a batch whose commit fails is kept and written on the next try
+
+module os allows the store to be written to a temporary directory
+
+module sqlite3 allows a commit to fail the way a locked database does
+
+module tempfile allows every test to write its own store
+
+module unittest allows for use of TestCase
+
+module blackjackgame allows for use of the Ledger, the BalanceStore, the Player and Metrics
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from blackjackgame.engine import WIN, LOSE
+from blackjackgame.ledger import Ledger
+from blackjackgame.metrics import Metrics
+from blackjackgame.player import Player
+from blackjackgame.store import BalanceStore
+
+
+class FailingCommits(Metrics):
+    """
+    Metrics that make the first few commits of the Ledger fail
+
+    Attributes
+    ----------
+    failures : int
+        how many commits are left to fail
+    """
+
+    def __init__(self, failures):
+        self.failures = failures
+
+    def instrument(self, name, function):
+        def failing(*args):
+            if self.failures:
+                self.failures -= 1
+                raise sqlite3.OperationalError("database is locked")
+            return function(*args)
+        return failing
+
+
+class TestLedger(unittest.TestCase):
+    """
+    Tests of a commit that fails and is tried again
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "balances.db")
+        BalanceStore(self.path).close()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def rows(self):
+        """
+        returns every entry of the ledger and every balance in the store
+        """
+
+        store = BalanceStore(self.path)
+        entries = store.connection.execute(
+            "SELECT round, name, kind FROM ledger ORDER BY rowid").fetchall()
+        balances = dict(store.connection.execute("SELECT name, balance FROM balances"))
+        store.close()
+        return entries, balances
+
+    def test_failed_batch_is_retried_first(self):
+        ledger = Ledger(self.path, flush_rounds=1000, flush_seconds=60,
+                        metrics=FailingCommits(1))
+        player = Player("al", 10100)
+        ledger.record(1, "al", 100, WIN, 100)
+        ledger.end_round([player])
+        with self.assertRaises(sqlite3.OperationalError):
+            ledger.flush()
+        self.assertEqual(ledger.committed, 0)
+        player.balance = 10000
+        ledger.record(2, "al", 100, LOSE, -100)
+        ledger.end_round([player])
+        ledger.flush()
+        self.assertEqual(ledger.committed, 2)
+        self.assertIsNone(ledger.error)
+        ledger.close()
+        entries, balances = self.rows()
+        self.assertEqual(entries, [(1, "al", "win"), (2, "al", "loss")])
+        self.assertEqual(balances, {"al": 10000})
+
+    def test_close_raises_when_the_last_commit_fails(self):
+        ledger = Ledger(self.path, metrics=FailingCommits(1000))
+        ledger.record(1, "al", 100, WIN, 100)
+        ledger.end_round([Player("al", 10100)])
+        with self.assertRaises(sqlite3.OperationalError):
+            ledger.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
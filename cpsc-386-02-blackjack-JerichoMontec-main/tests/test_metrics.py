@@ -0,0 +1,131 @@
+"""
+Tests of the metrics, a table without a Recorder runs its own methods untouched and a table
+with one counts and times every phase without changing how the rounds are played
+
+module json, os and tempfile allow the metrics to be dumped to a throwaway file and read
+back
+
+module random allows two tables to deal the same shoe
+
+module unittest allows for use of TestCase
+
+module blackjackgame allows for use of the Metrics, the Engine and the Player
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from random import Random
+from blackjackgame.engine import Engine, TimedDecider, PHASES
+from blackjackgame.metrics import Recorder, BUCKETS, OFF
+from blackjackgame.player import Player
+
+
+def play(metrics, rounds=50):
+    """
+    plays rounds for two seats on a shoe shuffled from seed 4 and returns the Engine and the
+    outcomes
+    """
+
+    engine = Engine([Player("al", 10000), Player("bo", 10000)], metrics=metrics,
+                    rng=Random(4))
+    outcomes = [engine.play_round(bet=10) for _ in range(rounds)]
+    return engine, outcomes
+
+
+class TestOff(unittest.TestCase):
+    """
+    Tests of the Metrics that are turned off
+    """
+
+    def test_nothing_recorded(self):
+        def function():
+            return 1
+
+        self.assertIs(OFF.instrument("deal", function), function)
+        self.assertIsNone(OFF.count("hands"))
+        self.assertIsNone(OFF.observe("deal", 10))
+        self.assertEqual(vars(OFF), {})
+
+    def test_engine_untouched(self):
+        engine, _ = play(OFF)
+        for method, _ in PHASES:
+            self.assertNotIn(method, vars(engine))
+            self.assertEqual(getattr(engine, method).__func__, getattr(Engine, method))
+        self.assertNotIsInstance(engine.decider, TimedDecider)
+        self.assertNotIn("draw_code", vars(engine.deck))
+        self.assertIs(engine.metrics, OFF)
+
+
+class TestRecorder(unittest.TestCase):
+    """
+    Tests of recording counters and timings and writing them out
+    """
+
+    def test_counters_and_histograms(self):
+        recorder = Recorder()
+        recorder.count("hands")
+        recorder.count("hands", 2)
+        recorder.observe("deal", 1000)
+        recorder.observe("deal", 3000)
+        recorder.observe("deal", 10 ** 11)
+        snapshot = recorder.snapshot()
+        self.assertEqual(snapshot["counters"], {"hands": 3})
+        deal = snapshot["histograms"]["deal"]
+        self.assertEqual(deal["count"], 3)
+        self.assertAlmostEqual(deal["sum"], 100.000004)
+        self.assertEqual(deal["buckets"]["1e-06"], 1)
+        self.assertEqual(deal["buckets"]["5e-06"], 2)
+        self.assertEqual(deal["buckets"][f"{BUCKETS[-1] / 1e9:g}"], 2)
+        self.assertEqual(deal["buckets"]["+Inf"], 3)
+
+    def test_instrument_times_failures(self):
+        recorder = Recorder()
+
+        def fail():
+            raise ValueError("no")
+
+        timed = recorder.instrument("fail", fail)
+        self.assertIs(timed.__wrapped__, fail)
+        with self.assertRaises(ValueError):
+            timed()
+        self.assertEqual(recorder.snapshot()["histograms"]["fail"]["count"], 1)
+
+    def test_dump(self):
+        recorder = Recorder()
+        recorder.count("ledger_entries", 5)
+        recorder.observe("deal", 2000)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.json")
+            recorder.dump(path)
+            with open(path, encoding="utf-8") as metrics:
+                self.assertEqual(json.load(metrics), recorder.snapshot())
+            path = os.path.join(directory, "metrics.prom")
+            recorder.dump(path)
+            with open(path, encoding="utf-8") as metrics:
+                lines = metrics.read().splitlines()
+        self.assertIn("blackjack_ledger_entries_total 5", lines)
+        self.assertIn('blackjack_phase_seconds_bucket{phase="deal",le="2.5e-06"} 1', lines)
+        self.assertIn('blackjack_phase_seconds_count{phase="deal"} 1', lines)
+
+
+class TestEngine(unittest.TestCase):
+    """
+    Tests of a table timed by a Recorder
+    """
+
+    def test_phases(self):
+        recorder = Recorder()
+        engine, outcomes = play(recorder)
+        histograms = recorder.snapshot()["histograms"]
+        self.assertEqual(histograms["deal"]["count"], 50)
+        self.assertEqual(histograms["play_hand"]["count"], 100)
+        self.assertEqual(histograms["shuffle"]["count"], engine.shoe_number)
+        self.assertGreater(histograms["draw"]["count"], 200)
+        self.assertIsInstance(engine.decider, TimedDecider)
+        self.assertEqual(outcomes, play(OFF)[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
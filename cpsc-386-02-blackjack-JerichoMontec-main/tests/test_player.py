@@ -0,0 +1,95 @@
+"""
+Tests of pickling a Player, the Players pickled before Player had slots and the ones pickled
+since are both read back with their balance and hands
+
+module pickle allows the Players to be pickled and read back
+
+module unittest allows for use of TestCase
+
+module blackjackgame allows for use of the Player, the Dealer, the Hand, the card codes and
+the terminal Renderer
+
+module tests allows for use of OldPlayer, which pickles the way Player did before it had
+slots
+"""
+
+import pickle
+import unittest
+from blackjackgame.deck import CODE_VALUES
+from blackjackgame.hand import Hand, EMPTY
+from blackjackgame.player import Player, Dealer
+from blackjackgame.render import TERMINAL
+from tests.test_store import OldPlayer
+
+
+def code(value):
+    """
+    returns the code of a card with the given value
+    """
+
+    return CODE_VALUES.index(value)
+
+
+def round_trip(thing):
+    """
+    returns a thing pickled and read back
+    """
+
+    return pickle.loads(pickle.dumps(thing))
+
+
+class TestPickle(unittest.TestCase):
+    """
+    Tests of Player.__setstate__ and Hand.__setstate__
+    """
+
+    def test_player(self):
+        player = Player("al", 9000)
+        player.hand.bet = 500
+        for value in (8, 8):
+            player.hand.add(code(value))
+        self.assertTrue(player.split())
+        player.hand.add(code(3))
+        player.hand.decisions.extend(b"PH")
+        player.is_turn = True
+        copy = round_trip(player)
+        self.assertEqual((copy.name, copy.balance, copy.is_turn), ("al", 8500, True))
+        self.assertEqual([bytes(hand.cards) for hand in copy.hands],
+                         [bytes([code(8), code(3)]), bytes([player.hands[1].cards[0]])])
+        self.assertIs(copy.hand, copy.hands[0])
+        self.assertEqual((copy.current_bet, copy.check_value()), (500, 11))
+        self.assertEqual(bytes(copy.hand.decisions), b"PH")
+        self.assertEqual(copy.spares, [])
+        self.assertIs(copy.renderer, TERMINAL)
+
+    def test_dealer(self):
+        dealer = Dealer("Dealer", 0)
+        dealer.is_hidden = False
+        copy = round_trip(dealer)
+        self.assertIsInstance(copy, Dealer)
+        self.assertTrue(copy.is_dealer)
+        self.assertFalse(copy.is_hidden)
+
+    def test_old_player(self):
+        copy = round_trip(OldPlayer("bo", 12000))
+        self.assertIsInstance(copy, Player)
+        self.assertEqual((copy.name, copy.balance, copy.is_dealer), ("bo", 12000, False))
+        self.assertEqual((copy.current_bet, copy.state, len(copy.hands)), (0, EMPTY, 1))
+        self.assertEqual(copy.current_hand, bytearray())
+        self.assertIs(copy.hand, copy.hands[0])
+        copy.hand.add(code(10))
+        self.assertEqual(copy.check_value(), 10)
+
+    def test_old_hand(self):
+        hand = Hand(100)
+        hand.add(code(1))
+        del hand.decisions
+        copy = round_trip(hand)
+        self.assertEqual(copy.decisions, bytearray())
+        self.assertEqual((copy.bet, bytes(copy.cards)), (100, bytes([code(1)])))
+        copy.clear()
+        self.assertEqual(copy.state, EMPTY)
+
+
+if __name__ == "__main__":
+    unittest.main()
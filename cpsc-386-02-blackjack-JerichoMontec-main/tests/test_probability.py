@@ -0,0 +1,61 @@
+"""
+Tests of the exact Dealer probabilities and expected values, against the published table of
+an infinite deck and against shoes small enough to work out by hand
+
+module unittest allows for use of TestCase
+
+module blackjackgame allows for use of the probabilities of a shoe and of an infinite deck
+"""
+
+import unittest
+from blackjackgame.edge import infinite_hand_ev, _dealer_infinite
+from blackjackgame.hand import NEXT, EMPTY
+from blackjackgame.probability import OUTCOMES, pack, unpack, full_shoe, remove, \
+    dealer_probabilities, hand_ev
+
+# The Dealer standing on every 17 with a 6 up and an infinite deck, 17 to 21 and bust
+DEALER_SIX = (0.165438, 0.106267, 0.106267, 0.101715, 0.097163, 0.423151)
+
+
+class TestProbability(unittest.TestCase):
+    """
+    Tests of packing the counts, the Dealer's final hands and the expected value of a hand
+    """
+
+    def test_pack_every_shoe(self):
+        for decks in range(1, 17):
+            self.assertEqual(unpack(pack(full_shoe(decks))), full_shoe(decks))
+        with self.assertRaises(ValueError):
+            full_shoe(17)
+        with self.assertRaises(ValueError):
+            pack((0,) * 9 + (512,))
+
+    def test_dealer_infinite_deck(self):
+        for chance, published in zip(_dealer_infinite(NEXT[EMPTY * 11 + 6]), DEALER_SIX):
+            self.assertAlmostEqual(chance, published, delta=1e-6)
+
+    def test_dealer_big_shoe_near_infinite(self):
+        dealer = dealer_probabilities(6, remove(full_shoe(16), 6))
+        for outcome, published in zip(OUTCOMES, DEALER_SIX):
+            self.assertAlmostEqual(dealer[outcome], published, delta=0.001)
+
+    def test_only_tens_left(self):
+        counts = (0,) * 9 + (20,)
+        self.assertEqual(dealer_probabilities(10, counts)[20], 1.0)
+        evs = hand_ev([10, 10], 10, counts)
+        self.assertEqual(evs["stand"], 0.0)
+        self.assertEqual(evs["hit"], -1.0)
+        self.assertEqual(evs["double"], -2.0)
+        self.assertEqual(hand_ev([10, 1], 10, counts)["stand"], 1.0)
+
+    def test_sixteen_against_ten(self):
+        shoe = remove(full_shoe(16), 10, 6, 10)
+        evs = hand_ev([10, 6], 10, shoe)
+        infinite = infinite_hand_ev([10, 6], 10)
+        for play in ("stand", "hit", "double"):
+            self.assertAlmostEqual(evs[play], infinite[play], delta=0.01)
+        self.assertGreater(evs["hit"], evs["stand"])
+
+
+if __name__ == "__main__":
+    unittest.main()
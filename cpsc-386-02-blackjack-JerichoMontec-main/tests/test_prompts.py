@@ -0,0 +1,72 @@
+"""
+Tests of recording a session with its seed and replaying the script, the replay shows
+exactly what the session showed
+
+module os allows the script to be written to a temporary directory and the Game to keep no
+hand history
+
+module random allows the session to be shuffled by a seeded generator
+
+module tempfile allows every test to write its own script
+
+module unittest allows for use of TestCase
+
+module blackjackgame allows for use of the Game, the recording and scripted Prompters, the
+load generator's Bot, the BalanceStore and the BufferedRenderer
+"""
+
+import os
+import tempfile
+import unittest
+from random import Random
+from blackjackgame.game import Game
+from blackjackgame.history import HandLog
+from blackjackgame.loadgen import Bot
+from blackjackgame.player import Player
+from blackjackgame.prompts import RecordingPrompter, load_script
+from blackjackgame.render import BufferedRenderer
+from blackjackgame.store import BalanceStore
+
+
+def play(prompter, store, seed):
+    """
+    plays a Game answered by the Prompter and returns every message it showed
+    """
+
+    renderer = BufferedRenderer()
+    game = Game(store, renderer, HandLog(os.devnull), prompter=prompter, rng=Random(seed))
+    game.run()
+    return [message for message, _ in renderer.drain()]
+
+
+class TestReplay(unittest.TestCase):
+    """
+    Tests of a script recorded from a returning Player and a new one
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.txt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_replay_shows_the_same(self):
+        store = BalanceStore(":memory:")
+        store.put_many([Player("al", 5000)])
+        prompter = RecordingPrompter(Bot(Random(3), ["al", "bo"], 8), self.path, 11)
+        recorded = play(prompter, store, 11)
+        prompter.close()
+
+        script = load_script(self.path)
+        self.assertEqual(script.seed, 11)
+        self.assertEqual(script.balances, {"al": 5000})
+        store = BalanceStore(":memory:")
+        store.put_many([Player(name, balance) for name, balance in script.balances.items()])
+        replayed = play(script, store, script.seed)
+        self.assertEqual(replayed, recorded)
+        self.assertEqual(recorded.count("Looks like you have a balance here."), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
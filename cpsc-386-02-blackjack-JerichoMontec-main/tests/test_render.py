@@ -0,0 +1,82 @@
+"""
+Tests of the renderers, the terminal pauses for its pace, the buffer keeps every message
+and a silent table neither prints nor pauses
+
+module contextlib and io allow what a renderer prints to be read back
+
+module random allows two tables to deal the same shoe
+
+module unittest allows for use of TestCase and for sleep to be replaced by one that only
+counts
+
+module blackjackgame allows for use of the renderers, the Engine and the Player
+"""
+
+import contextlib
+import io
+import unittest
+from random import Random
+from unittest import mock
+from blackjackgame.engine import Engine
+from blackjackgame.player import Player
+from blackjackgame.render import TerminalRenderer, BufferedRenderer, SILENT
+
+
+class TestRenderers(unittest.TestCase):
+    """
+    Tests of every renderer on its own
+    """
+
+    def test_terminal_pace(self):
+        printed = io.StringIO()
+        with mock.patch("blackjackgame.render.sleep") as sleep, \
+                contextlib.redirect_stdout(printed):
+            TerminalRenderer(0.5).show("hi", 2)
+            TerminalRenderer(0.5).show("no pause", 0)
+            TerminalRenderer(0).show("never", 2)
+        self.assertEqual(printed.getvalue(), "hi\nno pause\nnever\n")
+        sleep.assert_called_once_with(1.0)
+
+    def test_buffer_drains(self):
+        renderer = BufferedRenderer()
+        renderer.show("one")
+        renderer.show("two", 0)
+        self.assertEqual(renderer.drain(), [("one", 1.0), ("two", 0)])
+        self.assertEqual(renderer.drain(), [])
+
+
+class TestTable(unittest.TestCase):
+    """
+    Tests of whole rounds played through a renderer
+    """
+
+    def play(self, renderer):
+        """
+        plays 20 rounds for one seat on a shoe shuffled from seed 3 and returns the outcomes
+        and what was printed
+        """
+
+        printed = io.StringIO()
+        engine = Engine([Player("al", 10000)], renderer=renderer, rng=Random(3))
+        with contextlib.redirect_stdout(printed):
+            outcomes = [engine.play_round(bet=10) for _ in range(20)]
+        return outcomes, printed.getvalue()
+
+    def test_silent(self):
+        with mock.patch("blackjackgame.render.sleep") as sleep:
+            outcomes, printed = self.play(SILENT)
+        self.assertEqual(printed, "")
+        sleep.assert_not_called()
+        renderer = BufferedRenderer()
+        self.assertEqual(self.play(renderer), (outcomes, ""))
+        self.assertIn(("It is al's turn", 1.0), renderer.events)
+
+    def test_terminal_without_pauses(self):
+        with mock.patch("blackjackgame.render.sleep") as sleep:
+            _, printed = self.play(TerminalRenderer(0))
+        self.assertIn("It is al's turn\n", printed)
+        sleep.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+"""
+Tests of compiling a rule set, a payout is kept in lowest terms so naturals are only paid
+extra when a blackjack really pays more than 1:1
+
+module unittest allows for use of TestCase
+
+module blackjackgame allows for use of the Engine and the rules
+"""
+
+import unittest
+from blackjackgame.engine import Engine
+from blackjackgame.rules import compile_rules, DEFAULT_RULES
+
+
+class TestPayout(unittest.TestCase):
+    """
+    Tests of the blackjack payout and whether it turns naturals on
+    """
+
+    def test_default_is_even_money(self):
+        self.assertEqual(DEFAULT_RULES.blackjack_pays, (1, 1))
+        self.assertFalse(Engine([], rules=DEFAULT_RULES).naturals)
+
+    def test_equal_terms_are_even_money(self):
+        rules = compile_rules({"blackjack_pays": "2:2"})
+        self.assertEqual(rules.blackjack_pays, (1, 1))
+        self.assertFalse(Engine([], rules=rules).naturals)
+
+    def test_lowest_terms(self):
+        rules = compile_rules({"blackjack_pays": "6:4"})
+        self.assertEqual(rules.blackjack_pays, (3, 2))
+        self.assertTrue(Engine([], rules=rules).naturals)
+
+    def test_bad_payouts(self):
+        for text in ("3", "a:b", "0:1", "3:-2"):
+            with self.assertRaises(ValueError):
+                compile_rules({"blackjack_pays": text})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,275 @@
+"""
+Tests of the table server, every test talks to a TableServer over a real socket the way a
+client does
+
+module asyncio allows the clients to talk to the server without a thread
+
+module threading allows the test to see which thread reads the store
+
+module unittest allows for use of IsolatedAsyncioTestCase which runs every test on its own
+event loop
+
+module array allows the cards of the stacked shoe to be laid out
+
+module random allows the stacked shoe to be given a generator
+
+module blackjackgame allows for use of the TableServer, the BalanceStore, the rules and a
+stacked Shoe
+"""
+
+import asyncio
+import threading
+import unittest
+from array import array
+from random import Random
+from blackjackgame.deck import Shoe, CODE_VALUES
+from blackjackgame.rules import compile_rules
+from blackjackgame.server import TableServer
+from blackjackgame.store import BalanceStore
+
+
+class Client:
+    """
+    A class used to represent one connection to the server, it reads lines until the
+    server asks a question
+
+    Attributes
+    ----------
+    reader : StreamReader
+        lines coming from the server
+
+    writer : StreamWriter
+        lines going to the server
+    """
+
+    def __init__(self, reader, writer):
+        """
+        Parameters
+        ----------
+        reader : StreamReader
+            lines coming from the server
+
+        writer : StreamWriter
+            lines going to the server
+        """
+
+        self.reader = reader
+        self.writer = writer
+
+    async def until_question(self):
+        """
+        returns the lines before the next question and the question, the question is None
+        once the server has closed the connection
+        """
+
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), 5)
+            if not line:
+                return lines, None
+            line = line.decode().strip()
+            if line.endswith("?"):
+                return lines, line[:-1]
+            lines.append(line)
+
+    def answer(self, text):
+        """
+        sends an answer to the server
+        """
+
+        self.writer.write(text.encode() + b"\n")
+
+    async def close(self):
+        """
+        closes the connection
+        """
+
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+class ThreadedStore(BalanceStore):
+    """
+    A BalanceStore that remembers the thread every read was made on
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = []
+
+    def get(self, name):
+        self.threads.append(threading.current_thread())
+        return super().get(name)
+
+
+class ServerTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Starts a TableServer with a store kept in memory on a free port for every test
+    """
+
+    timeout = 5
+    rules = compile_rules({})
+
+    async def asyncSetUp(self):
+        self.store = ThreadedStore(":memory:")
+        self.tables = TableServer(self.store, timeout=self.timeout, rules=self.rules)
+        self.server = await self.tables.start("127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.clients = []
+
+    async def asyncTearDown(self):
+        for client in self.clients:
+            await client.close()
+        self.server.close()
+        await self.server.wait_closed()
+        self.tables.close()
+        self.store.close()
+
+    async def connect(self):
+        """
+        returns a new Client that has been asked its name
+        """
+
+        client = Client(*await asyncio.open_connection("127.0.0.1", self.port))
+        self.clients.append(client)
+        lines, question = await client.until_question()
+        self.assertEqual(lines, [])
+        self.assertEqual(question, "NAME")
+        return client
+
+    async def join(self, name):
+        """
+        returns a new Client sitting at a table and asked for its first bet
+        """
+
+        client = await self.connect()
+        client.answer(name)
+        lines, question = await client.until_question()
+        self.assertEqual(lines, ["BALANCE 10000"])
+        self.assertEqual(question, "BET 10000")
+        return client
+
+    async def stood_up(self, name):
+        """
+        waits for the registry to be given back the Player of a name that left
+        """
+
+        for _ in range(100):
+            if not self.tables.registry.is_seated(name):
+                return
+            await asyncio.sleep(0.01)
+        self.fail(f"{name} is still seated")
+
+
+class TestTableServer(ServerTestCase):
+    """
+    Tests of joining, betting, playing a turn, leaving and a name that is already sitting
+    """
+
+    async def test_join(self):
+        await self.join("al")
+        self.assertTrue(self.tables.registry.is_seated("al"))
+        self.assertEqual(len(self.tables.tables), 1)
+        self.assertEqual(len(self.store.threads), 1)
+        self.assertIsNot(self.store.threads[0], threading.main_thread())
+
+    async def test_bet_and_turn(self):
+        client = await self.join("al")
+        client.answer("100")
+        lines, question = await client.until_question()
+        self.assertTrue(lines[0].startswith("DEALER "))
+        self.assertTrue(lines[1].startswith("HAND "))
+        seen = lines
+        while not question.startswith("BET "):
+            self.assertIn(question, ("DOUBLE", "HIT"))
+            client.answer("n")
+            lines, question = await client.until_question()
+            seen += lines
+        result = seen[-1].split()
+        self.assertEqual(result[0], "RESULT")
+        self.assertIn(result[1], ("WIN", "PUSH", "LOSE"))
+        balance = {"WIN": 10100, "PUSH": 10000, "LOSE": 9900}[result[1]]
+        self.assertEqual(int(result[2]), balance)
+        self.assertEqual(question, f"BET {balance}")
+
+    async def test_leave(self):
+        client = await self.join("al")
+        client.answer("0")
+        lines, question = await client.until_question()
+        self.assertEqual(lines, ["BYE 10000"])
+        self.assertIsNone(question)
+        await self.stood_up("al")
+
+    async def test_busy(self):
+        seated = await self.join("al")
+        client = await self.connect()
+        client.answer("al")
+        lines, question = await client.until_question()
+        self.assertEqual(lines, ["BUSY"])
+        self.assertIsNone(question)
+        seated.answer("0")
+        lines, question = await seated.until_question()
+        self.assertEqual(lines, ["BYE 10000"])
+        await self.stood_up("al")
+        await self.join("al")
+
+
+class TestSplit(ServerTestCase):
+    """
+    Tests of a seat that splits a pair, both of its Hands are played over the network
+    """
+
+    rules = compile_rules({"decks": 1, "splits": True})
+
+    def stack(self, values):
+        """
+        returns a one deck Shoe whose first cards have the given values, in order
+        """
+
+        codes = list(range(52))
+        top = [codes.pop([CODE_VALUES[code] for code in codes].index(value))
+               for value in values]
+        return Shoe(1, Random(0), array("B", top + codes), 40, self.rules.cut_card)
+
+    async def test_split_pair(self):
+        client = await self.join("al")
+        # Eights to the seat, 10 and 7 to the Dealer, then a 2 and a 3 for the split Hands
+        self.tables.tables[0].engine.deck = self.stack([8, 10, 8, 7, 2, 3])
+        client.answer("100")
+        lines, question = await client.until_question()
+        self.assertEqual(lines[1].split()[-1], "16")
+        self.assertEqual(question, "SPLIT")
+        questions = []
+        hands = []
+        for answer in ("y", "n", "n", "n", "n"):
+            client.answer(answer)
+            lines, question = await client.until_question()
+            questions.append(question)
+            hands += [line for line in lines if line.startswith("HAND ")]
+        self.assertEqual(questions, ["DOUBLE", "HIT", "DOUBLE", "HIT", "BET 9800"])
+        self.assertEqual([hand.split()[-1] for hand in hands], ["10", "11"])
+        self.assertEqual(lines[-1], "RESULT LOSE 9800")
+
+
+class TestTimeout(ServerTestCase):
+    """
+    Tests of a seat that stops answering, it leaves its table instead of holding it up
+    """
+
+    timeout = 0.2
+
+    async def test_idle_seat_leaves(self):
+        idle = await self.join("al")
+        other = await self.join("bo")
+        other.answer("0")
+        lines, question = await other.until_question()
+        self.assertEqual(lines, ["BYE 10000"])
+        lines, question = await idle.until_question()
+        self.assertEqual(lines, [])
+        self.assertIsNone(question)
+        await self.stood_up("al")
+        self.assertEqual(self.tables.tables, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Tests of the Monte Carlo simulation, a run gives the same numbers however many processes
+play it and whether the shoes are shuffled by the workers or handed to them in shared memory
+
+module unittest allows for use of TestCase
+
+module blackjackgame allows for use of the simulations, the Engine, the shoes and the rules
+"""
+
+import unittest
+from blackjackgame.batch import ShoeBatch
+from blackjackgame.engine import Engine, Decider, WIN, PUSH, LOSE
+from blackjackgame.player import Player
+from blackjackgame.rules import compile_rules
+from blackjackgame.simulate import simulate, simulate_shared, BANKROLL
+
+
+class AlwaysHit(Decider):
+    """
+    A Decider that splits every pair and hits until 21 or a bust, so rounds at a full table
+    of one deck run the shoe out
+    """
+
+    def split(self, player, dealer):
+        return True
+
+    def hit(self, player, dealer):
+        return True
+
+
+class Tally:
+    """
+    A class used to stand in for the Ledger, it counts every Hand the Engine settles
+    """
+
+    def __init__(self):
+        self.results = {WIN: 0, PUSH: 0, LOSE: 0}
+        self.hands = 0
+        self.net = 0
+
+    def record(self, number, name, bet, result, winnings):
+        self.hands += 1
+        self.results[result] += 1
+        self.net += winnings
+
+    def donate(self, number, name, donation):
+        pass
+
+    def end_round(self, seats):
+        pass
+
+
+class TestTally(unittest.TestCase):
+    """
+    Tests that every Hand of a seat is counted, whether it plays several spots or splits
+    """
+
+    def reference(self, shoes, seats, hands, rules):
+        """
+        plays the shoes of seed 3 in this process and counts the Hands the Engine settles
+        """
+
+        tally = Tally()
+        players = [Player(f"Seat {seat + 1}", BANKROLL) for seat in range(seats)]
+        engine = Engine(players, AlwaysHit(), rules=rules, ledger=tally)
+        batch = ShoeBatch(shoes, rules.decks, 3, 0, rules.cut_card)
+        for index in range(shoes):
+            engine.deck = batch.shoe(index)
+            while not engine.needs_shuffle():
+                engine.play_round(hands=hands)
+        return tally
+
+    def test_spots_and_splits(self):
+        rules = compile_rules({"splits": True})
+        tally = self.reference(12, 2, 2, rules)
+        stats = simulate(12, 2, AlwaysHit(), seed=3, workers=2, chunk=5, rules=rules, hands=2)
+        self.assertEqual(stats.hands, tally.hands)
+        self.assertEqual(stats.wins, tally.results[WIN])
+        self.assertEqual(stats.pushes, tally.results[PUSH])
+        self.assertEqual(stats.losses, tally.results[LOSE])
+        self.assertEqual(stats.net, tally.net)
+        self.assertEqual(stats.wins + stats.pushes + stats.losses, stats.hands)
+        self.assertAlmostEqual(stats.mean(), tally.net / tally.hands)
+
+
+class TestParity(unittest.TestCase):
+    """
+    Tests of simulate_shared against simulate for the same seed
+    """
+
+    def check(self, shoes, seats, decider=None, rules=None):
+        """
+        runs both simulations on two workers and one and checks they give the same Stats
+        """
+
+        rules = rules if rules is not None else compile_rules({})
+        alone = simulate(shoes, seats, decider, seed=3, workers=1, chunk=7, rules=rules)
+        pooled = simulate(shoes, seats, decider, seed=3, workers=2, chunk=7, rules=rules)
+        shared = simulate_shared(shoes, seats, decider, seed=3, workers=2, rules=rules)
+        self.assertEqual(pooled.as_dict(), alone.as_dict())
+        self.assertEqual(shared.as_dict(), alone.as_dict())
+        return alone
+
+    def test_default_table(self):
+        stats = self.check(40, 2)
+        self.assertGreater(stats.hands, 2000)
+
+    def test_shoes_that_run_out(self):
+        rules = compile_rules({"decks": 1, "splits": True})
+        stats = self.check(40, 5, AlwaysHit(), rules)
+        self.assertGreater(stats.losses, stats.wins)
+
+
+if __name__ == "__main__":
+    unittest.main()
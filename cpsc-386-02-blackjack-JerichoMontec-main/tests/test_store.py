@@ -0,0 +1,105 @@
+"""
+Tests of the BalanceStore, balances saved by the old pickle file are moved into it once and
+names already in the store keep their balance
+
+module copyreg allows a Player to be pickled the way it was before Player had slots
+
+module os allows the pickle file to be found and written in a temporary directory
+
+module pickle allows the old balance file to be written
+
+module tempfile allows every test to write its own files
+
+module unittest allows for use of TestCase
+
+module blackjackgame allows for use of the BalanceStore and the Player class
+"""
+
+import copyreg
+import os
+import pickle
+import tempfile
+import unittest
+from blackjackgame.player import Player
+from blackjackgame.store import BalanceStore
+
+
+class OldPlayer:
+    """
+    A class used to stand in for a Player the way add_to_file pickled it before Player had
+    slots, every attribute in a dictionary
+
+    Attributes
+    ----------
+    state : dict
+        the attributes the old Player held
+    """
+
+    def __init__(self, name, balance):
+        self.state = {"name": name, "balance": balance, "current_bet": 0,
+                      "current_hand": [], "is_turn": False, "is_dealer": False,
+                      "doubled_down": False}
+
+    def __reduce__(self):
+        return copyreg._reconstructor, (Player, object, None), self.state
+
+
+def write_old_pickle(path, players):
+    """
+    writes a list of (name, balance) to a file the way add_to_file used to
+    """
+
+    with open(path, "wb") as client_info:
+        pickle.dump([OldPlayer(name, balance) for name, balance in players], client_info)
+
+
+class TestMigrate(unittest.TestCase):
+    """
+    Tests of moving the old pickle file into the store
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.pickle_path = os.path.join(self.directory.name, "player_balances.pkl")
+        self.store = BalanceStore(os.path.join(self.directory.name, "balances.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_old_pickle(self):
+        write_old_pickle(self.pickle_path, [("al", 12000), ("bo", 500)])
+        self.store.put("bo", 9000)
+        self.store.migrate(self.pickle_path)
+        self.assertEqual(self.store.get("al"), 12000)
+        self.assertEqual(self.store.get("bo"), 9000)
+        self.assertEqual(len(self.store), 2)
+
+    def test_twice(self):
+        write_old_pickle(self.pickle_path, [("al", 12000)])
+        self.store.migrate(self.pickle_path)
+        self.store.put("al", 100)
+        write_old_pickle(self.pickle_path, [("al", 12000), ("cy", 7000)])
+        self.store.migrate(self.pickle_path)
+        self.assertEqual(self.store.get("al"), 100)
+        self.assertIsNone(self.store.get("cy"))
+
+    def test_missing_file(self):
+        self.store.migrate(self.pickle_path)
+        self.assertEqual(len(self.store), 0)
+        write_old_pickle(self.pickle_path, [("al", 12000)])
+        self.store.migrate(self.pickle_path)
+        self.assertIsNone(self.store.get("al"))
+
+    def test_survives_reopening(self):
+        write_old_pickle(self.pickle_path, [("al", 12000)])
+        self.store.migrate(self.pickle_path)
+        self.store.close()
+        self.store = BalanceStore(os.path.join(self.directory.name, "balances.db"))
+        self.store.put("al", 100)
+        self.store.migrate(self.pickle_path)
+        self.assertEqual(self.store.get("al"), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
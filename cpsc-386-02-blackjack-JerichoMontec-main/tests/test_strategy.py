@@ -0,0 +1,138 @@
+"""
+Tests of the basic strategy tables against the charts they are read from and of the Hi-Lo
+index plays that move a decision away from them
+
+module types allows for use of SimpleNamespace which stands in for a Shoe with a given count
+
+module unittest allows for use of TestCase
+
+module blackjackgame allows for use of the strategy, the hand states, the card codes and the
+Player class
+"""
+
+import unittest
+from types import SimpleNamespace
+from blackjackgame.deck import CODE_VALUES
+from blackjackgame.hand import NEXT, EMPTY
+from blackjackgame.player import Player
+from blackjackgame.strategy import BasicStrategy, HARD_CHART, SOFT_CHART, LETTERS, STAND, \
+    HIT, DOUBLE, DOUBLE_STAND, action
+
+
+def state_of(*values):
+    """
+    returns the hand state of cards with the given values
+    """
+
+    state = EMPTY
+    for value in values:
+        state = NEXT[state * 11 + value]
+    return state
+
+
+def code(value):
+    """
+    returns the code of a card with the given value
+    """
+
+    return CODE_VALUES.index(value)
+
+
+def chart_rows(chart):
+    """
+    yields the total, the up card and the action of every entry of a chart
+    """
+
+    for line in chart.split("\n"):
+        if line:
+            total, letters = line.split()
+            for column, letter in enumerate(letters):
+                yield int(total), column + 2 if column < 9 else 1, LETTERS[letter]
+
+
+class TestChart(unittest.TestCase):
+    """
+    Tests of the basic strategy lookups without a count
+    """
+
+    def test_hard_chart(self):
+        for total, up, expected in chart_rows(HARD_CHART):
+            # Two cards without an ace, 4 is 2 and 2 and 21 is three cards
+            first = min(total - 2, 10)
+            cards = (first, total - first) if total - first <= 10 else (10, 9, total - 19)
+            self.assertEqual(action(state_of(*cards), up), expected, (total, up))
+
+    def test_soft_chart(self):
+        for total, up, expected in chart_rows(SOFT_CHART):
+            self.assertEqual(action(state_of(1, total - 11), up), expected, (total, up))
+
+    def test_spots(self):
+        self.assertEqual(action(state_of(10, 6), 10), HIT)
+        self.assertEqual(action(state_of(10, 2), 4), STAND)
+        self.assertEqual(action(state_of(6, 5), 6), DOUBLE)
+        self.assertEqual(action(state_of(1, 7), 3), DOUBLE_STAND)
+        self.assertEqual(action(state_of(1, 7), 9), HIT)
+        self.assertEqual(action(state_of(10, 8), 1), STAND)
+
+
+class TestDeviations(unittest.TestCase):
+    """
+    Tests of the Hi-Lo index plays
+    """
+
+    def test_sixteen_against_ten(self):
+        state = state_of(10, 6)
+        self.assertEqual(action(state, 10, -0.5), HIT)
+        self.assertEqual(action(state, 10, 0), STAND)
+        self.assertEqual(action(state, 10, 3), STAND)
+
+    def test_eleven_against_ace(self):
+        state = state_of(6, 5)
+        self.assertEqual(action(state, 1), HIT)
+        self.assertEqual(action(state, 1, 0.9), HIT)
+        self.assertEqual(action(state, 1, 1), DOUBLE)
+
+    def test_twelve_against_four(self):
+        state = state_of(10, 2)
+        self.assertEqual(action(state, 4, -1), HIT)
+        self.assertEqual(action(state, 4, 0), STAND)
+
+    def test_no_index_play(self):
+        self.assertEqual(action(state_of(10, 7), 10, -10), STAND)
+        self.assertEqual(action(state_of(1, 5), 10, 10), HIT)
+
+
+class TestBasicStrategy(unittest.TestCase):
+    """
+    Tests of the Decider, the Dealer's hidden card is left out of the count
+    """
+
+    def decide(self, counting, running_count):
+        """
+        returns whether a 16 hits against a Dealer showing 10 with a hidden 10, from a shoe
+        of one deck left with the given running count
+        """
+
+        player = Player("al", 10000)
+        dealer = Player("Dealer", 0)
+        for value in (10, 6):
+            player.hand.add(code(value))
+        for value in (10, 10):
+            dealer.hand.add(code(value))
+        strategy = BasicStrategy(counting)
+        strategy.new_round(SimpleNamespace(running_count=running_count, codes=bytes(52),
+                                           cursor=0))
+        return strategy.hit(player, dealer)
+
+    def test_basic(self):
+        self.assertTrue(self.decide(False, -1))
+        self.assertTrue(self.decide(False, 5))
+
+    def test_counting(self):
+        # The hidden 10 took 1 off the running count, without it the true count is 0
+        self.assertFalse(self.decide(True, -1))
+        self.assertTrue(self.decide(True, -2))
+
+
+if __name__ == "__main__":
+    unittest.main()